@@ -45,6 +45,8 @@ CREATE INDEX IF NOT EXISTS idx_project_memberships_role ON project_memberships(r
 -- ===============================================================================
 
 CREATE INDEX IF NOT EXISTS idx_resource_policies_resource_id ON resource_policies(resource_id);
+-- Export order and updated_at watermark filter
+CREATE INDEX IF NOT EXISTS idx_resource_policies_updated_at ON resource_policies(updated_at, resource_id);
 
 -- ===============================================================================
 -- USER_POLICIES INDEXES
@@ -55,9 +57,8 @@ CREATE INDEX IF NOT EXISTS idx_user_policies_user_id ON user_policies(user_id);
 -- ===============================================================================
 -- NOTE: GIN indexes for JSONB (PostgreSQL only)
 -- ===============================================================================
--- For PostgreSQL, add these manually:
--- CREATE INDEX idx_resource_policies_document ON resource_policies USING GIN (policy_document);
--- CREATE INDEX idx_user_policies_document ON user_policies USING GIN (policy_document);
+-- PostgreSQL deployments use migrations/postgresql/, which stores policy
+-- documents as JSONB and creates GIN indexes on them.
 
 -- ===============================================================================
 -- MIGRATION COMPLETE
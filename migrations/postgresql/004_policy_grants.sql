@@ -0,0 +1,33 @@
+-- ===============================================================================
+-- Migration 004: Policy Grants (PostgreSQL)
+-- Description: Reverse index from principals to the resources whose policies
+--              grant them permissions, maintained on every policy save
+-- Database: PostgreSQL
+-- ===============================================================================
+
+-- ===============================================================================
+-- 1. POLICY_GRANTS TABLE
+-- ===============================================================================
+-- One row per (resource, principal, effect): the permissions (bitmask, see
+-- src/models/common.py PERMISSION_BITS) of every policy in the resource's
+-- document whose filter names the principal (e.g. user.id == 'user123').
+-- Existing documents are indexed with Repository.rebuild_policy_grants().
+
+CREATE TABLE IF NOT EXISTS policy_grants (
+    resource_id VARCHAR(500) NOT NULL REFERENCES resource_policies(resource_id) ON DELETE CASCADE,
+    principal_kind VARCHAR(50) NOT NULL CHECK (principal_kind IN ('user', 'team', 'project')),
+    principal_id VARCHAR(255) NOT NULL,
+    permission_mask INTEGER NOT NULL,
+    effect VARCHAR(10) NOT NULL CHECK (effect IN ('allow', 'deny')),
+    PRIMARY KEY (resource_id, principal_kind, principal_id, effect)
+);
+
+-- ===============================================================================
+-- 2. POLICY_GRANTS INDEXES
+-- ===============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_policy_grants_principal ON policy_grants(principal_kind, principal_id);
+
+-- ===============================================================================
+-- MIGRATION COMPLETE
+-- ===============================================================================
@@ -0,0 +1,67 @@
+"""Benchmark ways of building entities from database rows.
+
+Compares the validated constructor (what Repository uses), Pydantic's
+model_construct() and model_validate() on a row dict, for a Document row read
+through sqlite3.Row. Prints the best per-call time of each approach.
+
+Usage:
+    python scripts/benchmark_entity_construction.py [--number 100000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.entities import Document  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    row = conn.execute(
+        "SELECT 'doc1' AS id, 'Title' AS title, 'proj1' AS projectId, "
+        "'user1' AS creatorId, NULL AS deletedAt, 0 AS publicLinkEnabled"
+    ).fetchone()
+
+    def constructor():
+        return Document(
+            id=row["id"],
+            title=row["title"],
+            projectId=row["projectId"],
+            creatorId=row["creatorId"],
+            deletedAt=row["deletedAt"],
+            publicLinkEnabled=bool(row["publicLinkEnabled"]),
+        )
+
+    def model_construct():
+        return Document.model_construct(
+            id=row["id"],
+            title=row["title"],
+            projectId=row["projectId"],
+            creatorId=row["creatorId"],
+            deletedAt=row["deletedAt"],
+            publicLinkEnabled=bool(row["publicLinkEnabled"]),
+        )
+
+    def model_validate():
+        return Document.model_validate(dict(row))
+
+    for name, func in (
+        ("constructor", constructor),
+        ("model_construct", model_construct),
+        ("model_validate", model_validate),
+    ):
+        best = min(timeit.repeat(func, number=args.number, repeat=5))
+        print(f"{name:<16}{best / args.number * 1e6:>8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
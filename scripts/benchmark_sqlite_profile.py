@@ -0,0 +1,148 @@
+"""Benchmark SQLite read/write concurrency with and without the performance profile.
+
+Runs reader threads doing permission-check context loads while a writer thread
+keeps saving resource policies, once with SQLite defaults (rollback journal,
+synchronous=FULL) and once with the tuned profile (WAL, synchronous=NORMAL,
+mmap, larger page cache). Prints reader throughput and latency percentiles.
+
+Usage:
+    python scripts/benchmark_sqlite_profile.py [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database.connection import DatabaseConfig, DatabaseConnection  # noqa: E402
+from src.database.repository import Repository  # noqa: E402
+from src.models.common import Effect, Permission  # noqa: E402
+from src.models.policies import (  # noqa: E402
+    ResourceInfo,
+    ResourcePolicy,
+    ResourcePolicyDocument,
+)
+
+PROFILES = {
+    "default": {
+        "sqlite_journal_mode": "DELETE",
+        "sqlite_synchronous": "FULL",
+        "sqlite_cache_size": -2000,
+        "sqlite_mmap_size": 0,
+        "sqlite_temp_store": "DEFAULT",
+    },
+    "tuned": {},  # DatabaseConfig defaults
+}
+
+RESOURCE_URN = "urn:resource:team1:proj1:doc1"
+
+
+def _setup(db: DatabaseConnection):
+    conn = db.get_connection()
+    for migration in (
+        "001_initial_schema.sql",
+        "002_add_indexes.sql",
+        "004_policy_grants.sql",
+    ):
+        with open(os.path.join("migrations", migration)) as f:
+            conn.executescript(f.read())
+    conn.execute("INSERT INTO users (id, email, name) VALUES ('user1', 'a@b.c', 'A')")
+    conn.execute("INSERT INTO teams (id, name, plan) VALUES ('team1', 'T', 'pro')")
+    conn.execute(
+        "INSERT INTO projects (id, name, team_id, visibility) "
+        "VALUES ('proj1', 'P', 'team1', 'private')"
+    )
+    conn.execute(
+        "INSERT INTO documents (id, title, project_id, creator_id, public_link_enabled) "
+        "VALUES ('doc1', 'D', 'proj1', 'user1', 0)"
+    )
+    db.commit()
+
+
+def _policy_doc(index: int) -> ResourcePolicyDocument:
+    return ResourcePolicyDocument(
+        resource=ResourceInfo(resourceId=RESOURCE_URN, creatorId="user1"),
+        policies=[
+            ResourcePolicy(
+                description=f"policy {index}",
+                permissions=[Permission.CAN_VIEW],
+                effect=Effect.ALLOW,
+                filter=[],
+            )
+        ],
+    )
+
+
+def run_profile(name: str, seconds: float, readers: int) -> dict:
+    """Run the mixed read/write workload against one profile."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = DatabaseConfig(
+            db_type="sqlite",
+            sqlite_path=os.path.join(tmp, "bench.db"),
+            pool_max_size=readers + 1,
+            **PROFILES[name],
+        )
+        db = DatabaseConnection(config)
+        db.connect()
+        _setup(db)
+        repository = Repository(db)
+        repository.save_resource_policy(_policy_doc(0))
+        db.release()
+
+        stop = threading.Event()
+        latencies: list[list[float]] = [[] for _ in range(readers)]
+        writes = [0]
+
+        def reader(samples: list[float]):
+            while not stop.is_set():
+                start = time.perf_counter()
+                repository.load_evaluation_context("user1", RESOURCE_URN)
+                samples.append(time.perf_counter() - start)
+            db.release()
+
+        def writer():
+            while not stop.is_set():
+                writes[0] += 1
+                repository.save_resource_policy(_policy_doc(writes[0]))
+            db.release()
+
+        threads = [threading.Thread(target=reader, args=(s,)) for s in latencies]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        db.close()
+
+    samples = sorted(s for reader_samples in latencies for s in reader_samples)
+    return {
+        "reads_per_s": len(samples) / seconds,
+        "writes_per_s": writes[0] / seconds,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p99_ms": samples[int(len(samples) * 0.99)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name in PROFILES:
+        result = run_profile(name, args.seconds, args.readers)
+        print(
+            f"{name:<10}{result['reads_per_s']:>12.0f}{result['writes_per_s']:>12.0f}"
+            f"{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Rebuild the policy_grants reverse index from the stored policy documents.
+
+Saving a document through the API keeps its grants up to date. Documents
+written any other way have no grants until this script runs: rows stored
+before migration 004, rows loaded by migrations/003_sample_data.sql, and
+restored or re-imported databases. Until then get_principal_grants() returns
+nothing for them.
+
+The database is taken from the environment (see .env.example).
+
+Usage:
+    python scripts/rebuild_policy_grants.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.database.connection import close_database, get_database  # noqa: E402
+from src.database.repository import Repository  # noqa: E402
+
+
+def main():
+    db = get_database()
+    try:
+        count = Repository(db).rebuild_policy_grants()
+    finally:
+        close_database()
+    print(f"✓ Rebuilt policy_grants ({count} grants)")
+
+
+if __name__ == "__main__":
+    main()
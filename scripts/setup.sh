@@ -122,6 +122,10 @@ print('Running migration 002_add_indexes.sql...')
 with open('migrations/002_add_indexes.sql', 'r') as f:
     db.get_connection().executescript(f.read())
 
+print('Running migration 004_policy_grants.sql...')
+with open('migrations/004_policy_grants.sql', 'r') as f:
+    db.get_connection().executescript(f.read())
+
 db.commit()
 db.close()
 print('✓ Migrations completed')
@@ -129,6 +133,9 @@ print('✓ Migrations completed')
 
 if [ $? -eq 0 ]; then
     echo -e "${GREEN}✓${NC} Database migrations completed"
+
+    # Index the principals named by documents already in the database
+    SQLITE_PATH=data/permissions.db uv run python scripts/rebuild_policy_grants.py
 else
     echo -e "${YELLOW}⚠️  Database migrations will run on first application start${NC}"
 fi
@@ -3,17 +3,25 @@
 This module implements all HTTP endpoints for the service.
 """
 
+import asyncio
+import json
 import time
+from collections.abc import AsyncIterator
+from datetime import datetime
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
-from src.components.builder import Builder, PolicyOptions
-from src.components.evaluator import Evaluator
+from src.components.builder import Builder, PolicyOptions, get_builder
+from src.components.decision_cache import DecisionCache, get_decision_cache
+from src.components.evaluator import Evaluator, get_evaluator
+from src.database.async_repository import AsyncRepository, get_executor
 from src.database.connection import get_database
-from src.database.repository import Repository
+from src.database.repository import PolicyExportRow, Repository
 from src.models.common import Permission
 from src.models.policies import ResourcePolicyDocument
+from src.models.urn import parse_urn
 
 # -------------------------------------------------------------------------
 # Response models
@@ -37,6 +45,23 @@ class PolicyCreatedResponse(BaseModel):
     version: int = 1
 
 
+class BulkPolicyImportResult(BaseModel):
+    """Result of a single line of a bulk policy import."""
+
+    line: int = Field(..., description="Line number in the request body (1-based)")
+    resourceId: str | None = None
+    version: int | None = None
+    error: str | None = None
+
+
+class BulkPolicyImportResponse(BaseModel):
+    """Response for a bulk policy import."""
+
+    results: list[BulkPolicyImportResult]
+    saved: int
+    failed: int
+
+
 class PermissionCheckResponse(BaseModel):
     """Response for permission check."""
 
@@ -45,6 +70,51 @@ class PermissionCheckResponse(BaseModel):
     evaluation_details: dict | None = None
 
 
+class PermissionsResponse(BaseModel):
+    """Response listing every permission a user has on a resource."""
+
+    resourceId: str
+    userId: str
+    permissions: list[Permission] = Field(
+        ..., description="Allowed permissions (empty if none)"
+    )
+    evaluation_time_ms: int
+
+
+class PermissionCheckItem(BaseModel):
+    """A single check in a batch permission check request."""
+
+    resourceId: str = Field(..., description="Resource URN")
+    userId: str = Field(..., description="User ID")
+    action: Permission = Field(..., description="Permission to check")
+
+
+class BatchPermissionCheckRequest(BaseModel):
+    """Request body for batch permission checks."""
+
+    checks: list[PermissionCheckItem] = Field(
+        ..., min_length=1, max_length=1000, description="Checks to evaluate"
+    )
+
+
+class BatchPermissionCheckResult(BaseModel):
+    """Result of a single check in a batch."""
+
+    resourceId: str
+    userId: str
+    action: Permission
+    allowed: bool
+    message: str
+    error: str | None = None
+
+
+class BatchPermissionCheckResponse(BaseModel):
+    """Response for batch permission checks."""
+
+    results: list[BatchPermissionCheckResult]
+    evaluation_time_ms: int
+
+
 class ErrorResponse(BaseModel):
     """Error response."""
 
@@ -61,6 +131,9 @@ class ErrorResponse(BaseModel):
 def get_repository() -> Repository:
     """Get repository instance.
 
+    The repository shares the global pooled database; each call checks a
+    connection out for its duration and returns it afterwards.
+
     Returns:
         Repository: Data access repository
     """
@@ -68,6 +141,17 @@ def get_repository() -> Repository:
     return Repository(db)
 
 
+def get_async_repository(
+    repository: Repository = Depends(get_repository),
+) -> AsyncRepository:
+    """Get async repository instance.
+
+    Returns:
+        AsyncRepository: Repository whose queries run off the event loop
+    """
+    return AsyncRepository(repository)
+
+
 # -------------------------------------------------------------------------
 # Router
 # -------------------------------------------------------------------------
@@ -94,7 +178,10 @@ async def health_check():
     from datetime import datetime
 
     db = get_database()
-    db_status = "connected" if db.is_connected() else "disconnected"
+    is_connected = await asyncio.get_running_loop().run_in_executor(
+        get_executor(db), db.is_connected
+    )
+    db_status = "connected" if is_connected else "disconnected"
 
     if db_status == "disconnected":
         raise HTTPException(
@@ -137,7 +224,7 @@ async def get_resource_policy(
         description="Resource URN (e.g., urn:resource:team1:proj1:doc1)",
         regex=r"^urn:resource:[a-zA-Z0-9]+:[a-zA-Z0-9]+:[a-zA-Z0-9]+$",
     ),
-    repository: Repository = Depends(get_repository),
+    repository: AsyncRepository = Depends(get_async_repository),
 ):
     """Fetch resource policy document.
 
@@ -153,10 +240,7 @@ async def get_resource_policy(
     """
     try:
         # Validate URN format
-        evaluator = Evaluator()
-        team_id, project_id, doc_id = evaluator.extract_urn_components(resourceId)
-
-        if not all([team_id, project_id, doc_id]):
+        if parse_urn(resourceId) is None:
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -166,7 +250,7 @@ async def get_resource_policy(
             )
 
         # Fetch policy from database
-        policy_doc = repository.get_resource_policy(resourceId)
+        policy_doc = await repository.get_resource_policy(resourceId)
 
         if not policy_doc:
             raise HTTPException(
@@ -212,7 +296,8 @@ async def create_resource_policy(
     policy_input: ResourcePolicyDocument | PolicyOptions = Body(
         ..., description="Either a complete policy document or simple policy options"
     ),
-    repository: Repository = Depends(get_repository),
+    repository: AsyncRepository = Depends(get_async_repository),
+    builder: Builder = Depends(get_builder),
 ):
     """Create or update resource policy.
 
@@ -223,25 +308,25 @@ async def create_resource_policy(
     Args:
         policy_input: Policy document or options
         repository: Repository instance (injected)
+        builder: Policy builder (injected)
 
     Returns:
-        PolicyCreatedResponse: Success message with resourceId
+        PolicyCreatedResponse: Success message with resourceId and stored version
 
     Raises:
         HTTPException: 400 if invalid, 500 on error
     """
     try:
         # Build policy document using Builder
-        builder = Builder()
         policy_doc = builder.build_policy_document(policy_input)
 
         # Save to database
-        repository.save_resource_policy(policy_doc)
+        version = await repository.save_resource_policy(policy_doc)
 
         return PolicyCreatedResponse(
             message="Policy created successfully",
             resourceId=policy_doc.resource.resourceId,
-            version=1,
+            version=version,
         )
 
     except HTTPException:
@@ -259,6 +344,288 @@ async def create_resource_policy(
         )
 
 
+# -------------------------------------------------------------------------
+# Bulk policy import endpoint
+# -------------------------------------------------------------------------
+
+# Number of imported documents saved per transaction
+BULK_IMPORT_BATCH_SIZE = 1000
+
+# Parses one NDJSON line into the same inputs POST /resource/policy accepts
+_policy_input_adapter = TypeAdapter(ResourcePolicyDocument | PolicyOptions)
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield the non-blank lines of a streamed NDJSON body.
+
+    Args:
+        request: Incoming request
+
+    Yields:
+        (line number, line) pairs, line numbers starting at 1
+    """
+    line_no = 0
+    # Pieces of the line still being received; only new chunks are searched
+    # for line breaks, so a long line arriving in many chunks stays linear
+    pending: list[bytes] = []
+    async for chunk in request.stream():
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            pending.append(chunk[start:end])
+            line = b"".join(pending)
+            pending = []
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+            start = end + 1
+        if start < len(chunk):
+            pending.append(chunk[start:])
+
+    line = b"".join(pending)
+    if line.strip():
+        yield line_no + 1, line
+
+
+def _validation_message(exc: ValidationError) -> str:
+    """Summarize a validation error as "location: message" pairs."""
+    return "; ".join(
+        (
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            if error["loc"]
+            else error["msg"]
+        )
+        for error in exc.errors()
+    )
+
+
+async def _save_import_batch(
+    repository: AsyncRepository,
+    batch: list[tuple[BulkPolicyImportResult, ResourcePolicyDocument]],
+):
+    """Save one batch of imported documents and record the outcome per line.
+
+    If the batch transaction fails, its documents are saved again one by one
+    so the error is reported on the line that caused it and the other lines
+    are kept.
+    """
+    try:
+        versions = await repository.save_resource_policies_bulk(
+            [policy_doc for _, policy_doc in batch]
+        )
+    except Exception as e:
+        import logging
+
+        logging.warning(f"Failed to save policy batch, saving line by line: {e}")
+    else:
+        for result, _ in batch:
+            result.version = versions[result.resourceId]
+        return
+
+    for result, policy_doc in batch:
+        try:
+            result.version = await repository.save_resource_policy(policy_doc)
+        except Exception as e:
+            import logging
+
+            logging.error(
+                f"Failed to save policy on line {result.line}: {e}", exc_info=True
+            )
+            result.error = f"Failed to save policy to database: {str(e)}"
+
+
+@router.post(
+    "/resource/policy/bulk",
+    response_model=BulkPolicyImportResponse,
+    summary="Create or update many resource policies",
+    description=(
+        "Import resource policies from an NDJSON body, one policy document or "
+        "set of policy options per line"
+    ),
+    responses={
+        200: {"description": "Import processed, see per-line results"},
+        400: {"description": "Empty request body", "model": ErrorResponse},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_resource_policies(
+    request: Request,
+    repository: AsyncRepository = Depends(get_async_repository),
+    builder: Builder = Depends(get_builder),
+):
+    """Create or update resource policies from an NDJSON stream.
+
+    The body is read incrementally. Each line is validated like a
+    POST /resource/policy body; valid documents are saved in batches of
+    BULK_IMPORT_BATCH_SIZE, one transaction per batch; a batch that fails is
+    retried line by line. Invalid lines and lines that fail to save are
+    reported per line instead of failing the import.
+
+    Args:
+        request: Request with the NDJSON body
+        repository: Repository instance (injected)
+        builder: Policy builder (injected)
+
+    Returns:
+        BulkPolicyImportResponse: One result per non-blank line, in order
+
+    Raises:
+        HTTPException: 400 if the body has no lines
+    """
+    results: list[BulkPolicyImportResult] = []
+    batch: list[tuple[BulkPolicyImportResult, ResourcePolicyDocument]] = []
+
+    async for line_no, line in _iter_ndjson_lines(request):
+        result = BulkPolicyImportResult(line=line_no)
+        results.append(result)
+
+        try:
+            policy_input = _policy_input_adapter.validate_json(line)
+        except ValidationError as e:
+            result.error = _validation_message(e)
+            continue
+
+        policy_doc = builder.build_policy_document(policy_input)
+        result.resourceId = policy_doc.resource.resourceId
+        batch.append((result, policy_doc))
+
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            await _save_import_batch(repository, batch)
+            batch = []
+
+    if batch:
+        await _save_import_batch(repository, batch)
+
+    if not results:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "VALIDATION_ERROR",
+                "message": "Request body contains no policies",
+            },
+        )
+
+    failed = sum(1 for result in results if result.error)
+    return BulkPolicyImportResponse(
+        results=results, saved=len(results) - failed, failed=failed
+    )
+
+
+# -------------------------------------------------------------------------
+# Policy export endpoint
+# -------------------------------------------------------------------------
+
+# Number of exported documents fetched and written per chunk
+EXPORT_BATCH_SIZE = 500
+
+
+def _export_line(row: PolicyExportRow) -> str:
+    """Format an exported policy as one NDJSON line.
+
+    The repository returns the document as compact single-line JSON, so it
+    is embedded without being parsed again.
+    """
+    updated_at = row.updated_at.isoformat() if row.updated_at else None
+    return (
+        f'{{"resourceId": {json.dumps(row.resource_id)}, '
+        f'"version": {row.version}, '
+        f'"updatedAt": {json.dumps(updated_at)}, '
+        f'"policy": {row.policy_document}}}\n'
+    )
+
+
+async def _export_chunks(
+    repository: AsyncRepository,
+    resource_prefix: str | None,
+    updated_since: datetime | None,
+) -> AsyncIterator[str]:
+    """Yield the export body in chunks of up to EXPORT_BATCH_SIZE lines."""
+    lines = []
+    async for row in repository.iter_resource_policies(
+        resource_prefix, updated_since, EXPORT_BATCH_SIZE
+    ):
+        lines.append(_export_line(row))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+@router.get(
+    "/resource/policies/export",
+    summary="Export stored resource policies",
+    description=(
+        "Stream every stored resource policy document as NDJSON, optionally "
+        "limited to a team or project and to documents updated since a time"
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One policy per line, ordered by updatedAt",
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        },
+        400: {"description": "Invalid resourcePattern", "model": ErrorResponse},
+    },
+)
+async def export_resource_policies(
+    resourcePattern: str | None = Query(
+        None,
+        description="Team or project URN pattern",
+        example="urn:resource:team1:*:*",
+    ),
+    updatedSince: datetime | None = Query(
+        None,
+        description="Only export documents updated at or after this time (UTC if no offset)",
+    ),
+    repository: AsyncRepository = Depends(get_async_repository),
+):
+    """Stream resource policy documents as NDJSON.
+
+    Each line holds resourceId, version, updatedAt and the stored policy
+    document. Lines are ordered by updatedAt, so the last updatedAt of an
+    export can be passed as updatedSince to fetch later changes (documents
+    updated in that same second are exported again). Rows are read in
+    batches of EXPORT_BATCH_SIZE, each a separate keyset query continuing
+    after the last (updatedAt, resourceId) sent, so memory use does not grow
+    with the number of policies and no connection is held between batches.
+
+    Args:
+        resourcePattern: Optional wildcard URN (urn:resource:{teamId}:*:* or
+            urn:resource:{teamId}:{projectId}:*)
+        updatedSince: Optional updated_at watermark
+        repository: Repository instance (injected)
+
+    Returns:
+        StreamingResponse: NDJSON body
+
+    Raises:
+        HTTPException: 400 if resourcePattern is not a wildcard URN
+    """
+    resource_prefix = None
+    if resourcePattern is not None:
+        pattern = parse_urn(resourcePattern, allow_wildcard=True)
+        if pattern is None or not pattern.is_wildcard:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "VALIDATION_ERROR",
+                    "message": "Invalid resourcePattern. Expected: "
+                    "urn:resource:{teamId}:*:* or urn:resource:{teamId}:{projectId}:*",
+                },
+            )
+        resource_prefix = pattern.prefix
+
+    return StreamingResponse(
+        _export_chunks(repository, resource_prefix, updatedSince),
+        media_type="application/x-ndjson",
+    )
+
+
 # -------------------------------------------------------------------------
 # Permission check endpoint
 # -------------------------------------------------------------------------
@@ -289,7 +656,13 @@ async def check_permission(
         description="Permission to check (can_view, can_edit, can_delete, can_share)",
         example="can_edit",
     ),
-    repository: Repository = Depends(get_repository),
+    explain: bool = Query(
+        False,
+        description="Report every matching policy instead of only the deciding one",
+    ),
+    repository: AsyncRepository = Depends(get_async_repository),
+    evaluator: Evaluator = Depends(get_evaluator),
+    decision_cache: DecisionCache | None = Depends(get_decision_cache),
 ):
     """Evaluate permission for user on resource.
 
@@ -297,7 +670,10 @@ async def check_permission(
         resourceId: Resource URN
         userId: User ID
         action: Permission being requested
+        explain: Whether to collect all matching policies
         repository: Repository instance (injected)
+        evaluator: Permission evaluator (injected)
+        decision_cache: Optional decision cache (injected, None if disabled)
 
     Returns:
         PermissionCheckResponse: Evaluation result with allow/deny
@@ -308,11 +684,8 @@ async def check_permission(
     start_time = time.time()
 
     try:
-        # Extract URN components
-        evaluator = Evaluator()
-        team_id, project_id, doc_id = evaluator.extract_urn_components(resourceId)
-
-        if not all([team_id, project_id, doc_id]):
+        # Validate URN format
+        if parse_urn(resourceId) is None:
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -321,8 +694,11 @@ async def check_permission(
                 },
             )
 
-        # Fetch required entities from database
-        user = repository.get_user(userId)
+        # Fetch user, document, policies, team/project and memberships
+        # in a single round trip
+        context = await repository.load_evaluation_context(userId, resourceId)
+
+        user = context.user
         if not user:
             raise HTTPException(
                 status_code=404,
@@ -332,7 +708,7 @@ async def check_permission(
                 },
             )
 
-        document = repository.get_document(doc_id)
+        document = context.document
         if not document:
             raise HTTPException(
                 status_code=404,
@@ -342,38 +718,48 @@ async def check_permission(
                 },
             )
 
-        # Fetch policies
-        resource_policy = repository.get_resource_policy(resourceId)
+        resource_policy = context.resource_policy
         if not resource_policy:
             raise HTTPException(
                 status_code=404,
                 detail={"error": "NOT_FOUND", "message": "Resource policy not found"},
             )
 
-        user_policy = repository.get_user_policy(userId)
-
-        # Fetch optional context entities
-        team = repository.get_team(team_id)
-        project = repository.get_project(project_id)
-        team_membership = (
-            repository.get_team_membership(userId, team_id) if team else None
-        )
-        project_membership = (
-            repository.get_project_membership(userId, project_id) if project else None
-        )
+        # Reuse a cached decision if none of the inputs changed since
+        cache_key = None
+        result = None
+        if decision_cache is not None:
+            stamp = evaluator.decision_stamp(
+                user=user,
+                document=document,
+                resource_policy=resource_policy,
+                user_policy=context.user_policy,
+                team=context.team,
+                project=context.project,
+                team_membership=context.team_membership,
+                project_membership=context.project_membership,
+            )
+            cache_key = decision_cache.make_key(
+                userId, resourceId, action, stamp, explain
+            )
+            result = decision_cache.get(cache_key)
 
         # Evaluate permission
-        result = evaluator.evaluate_permission(
-            user=user,
-            document=document,
-            permission=action,
-            resource_policy=resource_policy,
-            user_policy=user_policy,
-            team=team,
-            project=project,
-            team_membership=team_membership,
-            project_membership=project_membership,
-        )
+        if result is None:
+            result = evaluator.evaluate_permission(
+                user=user,
+                document=document,
+                permission=action,
+                resource_policy=resource_policy,
+                user_policy=context.user_policy,
+                team=context.team,
+                project=context.project,
+                team_membership=context.team_membership,
+                project_membership=context.project_membership,
+                explain=explain,
+            )
+            if decision_cache is not None:
+                decision_cache.set(cache_key, result)
 
         # Calculate evaluation time
         eval_time_ms = int((time.time() - start_time) * 1000)
@@ -397,3 +783,237 @@ async def check_permission(
                 "message": "Failed to evaluate permission",
             },
         )
+
+
+# -------------------------------------------------------------------------
+# Effective permissions endpoint
+# -------------------------------------------------------------------------
+
+
+@router.get(
+    "/permissions",
+    response_model=PermissionsResponse,
+    summary="List every permission a user has on a resource",
+    description="Evaluate all permissions for a (user, resource) pair in one call",
+    responses={
+        200: {"description": "Permissions evaluated successfully"},
+        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        404: {"description": "Resource or user not found", "model": ErrorResponse},
+        500: {
+            "description": "Internal error during evaluation",
+            "model": ErrorResponse,
+        },
+    },
+)
+async def get_permissions(
+    resourceId: str = Query(
+        ..., description="Resource URN", example="urn:resource:team1:proj1:doc1"
+    ),
+    userId: str = Query(..., description="User ID", example="user1"),
+    repository: AsyncRepository = Depends(get_async_repository),
+    evaluator: Evaluator = Depends(get_evaluator),
+):
+    """Evaluate every permission for user on resource.
+
+    Loads the context once and evaluates all permissions in a single pass,
+    instead of one /permission-check call (and context load) per action.
+
+    Args:
+        resourceId: Resource URN
+        userId: User ID
+        repository: Repository instance (injected)
+        evaluator: Permission evaluator (injected)
+
+    Returns:
+        PermissionsResponse: The allowed permissions
+
+    Raises:
+        HTTPException: 400/404/500 on errors
+    """
+    start_time = time.time()
+
+    try:
+        if parse_urn(resourceId) is None:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "VALIDATION_ERROR",
+                    "message": "Invalid resourceId format",
+                },
+            )
+
+        context = await repository.load_evaluation_context(userId, resourceId)
+
+        if not context.user:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "NOT_FOUND",
+                    "message": f"User not found for userId: {userId}",
+                },
+            )
+
+        if not context.document:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "NOT_FOUND",
+                    "message": f"Document not found for resourceId: {resourceId}",
+                },
+            )
+
+        if not context.resource_policy:
+            raise HTTPException(
+                status_code=404,
+                detail={"error": "NOT_FOUND", "message": "Resource policy not found"},
+            )
+
+        permissions = evaluator.evaluate_all_permissions(
+            user=context.user,
+            document=context.document,
+            resource_policy=context.resource_policy,
+            user_policy=context.user_policy,
+            team=context.team,
+            project=context.project,
+            team_membership=context.team_membership,
+            project_membership=context.project_membership,
+        )
+
+        return PermissionsResponse(
+            resourceId=resourceId,
+            userId=userId,
+            permissions=permissions,
+            evaluation_time_ms=int((time.time() - start_time) * 1000),
+        )
+
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "INTERNAL_ERROR",
+                "message": "Failed to evaluate permissions",
+            },
+        )
+
+
+# -------------------------------------------------------------------------
+# Batch permission check endpoint
+# -------------------------------------------------------------------------
+
+
+@router.post(
+    "/permission-check/batch",
+    response_model=BatchPermissionCheckResponse,
+    summary="Evaluate many permission checks at once",
+    description="Check many (resource, user, action) triples with shared context loading",
+    responses={
+        200: {"description": "Permissions evaluated successfully"},
+        422: {"description": "Invalid request body", "model": ErrorResponse},
+        500: {
+            "description": "Internal error during evaluation",
+            "model": ErrorResponse,
+        },
+    },
+)
+async def check_permissions_batch(
+    request: BatchPermissionCheckRequest = Body(
+        ..., description="Permission checks to evaluate"
+    ),
+    repository: AsyncRepository = Depends(get_async_repository),
+    evaluator: Evaluator = Depends(get_evaluator),
+):
+    """Evaluate a batch of permission checks.
+
+    Users, documents, teams, projects, memberships and policies are fetched
+    once per batch with set-based queries and shared between checks. Checks
+    that cannot be evaluated (invalid URN, missing user/document/policy) are
+    reported per item instead of failing the whole batch.
+
+    Args:
+        request: Checks to evaluate
+        repository: Repository instance (injected)
+        evaluator: Permission evaluator (injected)
+
+    Returns:
+        BatchPermissionCheckResponse: One result per check, in request order
+
+    Raises:
+        HTTPException: 500 on errors
+    """
+    start_time = time.time()
+
+    try:
+        valid_checks = [
+            (check.userId, check.resourceId)
+            for check in request.checks
+            if parse_urn(check.resourceId) is not None
+        ]
+        contexts = await repository.load_evaluation_contexts(valid_checks)
+
+        results = []
+        for check in request.checks:
+            context = contexts.get((check.userId, check.resourceId))
+
+            error = None
+            if context is None:
+                error = "VALIDATION_ERROR: Invalid resourceId format"
+            elif not context.user:
+                error = f"NOT_FOUND: User not found for userId: {check.userId}"
+            elif not context.document:
+                error = (
+                    f"NOT_FOUND: Document not found for resourceId: {check.resourceId}"
+                )
+            elif not context.resource_policy:
+                error = "NOT_FOUND: Resource policy not found"
+
+            if error:
+                results.append(
+                    BatchPermissionCheckResult(
+                        resourceId=check.resourceId,
+                        userId=check.userId,
+                        action=check.action,
+                        allowed=False,
+                        message="Deny",
+                        error=error,
+                    )
+                )
+                continue
+
+            result = evaluator.evaluate_permission(
+                user=context.user,
+                document=context.document,
+                permission=check.action,
+                resource_policy=context.resource_policy,
+                user_policy=context.user_policy,
+                team=context.team,
+                project=context.project,
+                team_membership=context.team_membership,
+                project_membership=context.project_membership,
+            )
+            results.append(
+                BatchPermissionCheckResult(
+                    resourceId=check.resourceId,
+                    userId=check.userId,
+                    action=check.action,
+                    allowed=result.allowed,
+                    message=result.message,
+                )
+            )
+
+        return BatchPermissionCheckResponse(
+            results=results,
+            evaluation_time_ms=int((time.time() - start_time) * 1000),
+        )
+
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "INTERNAL_ERROR",
+                "message": "Failed to evaluate permissions",
+            },
+        )
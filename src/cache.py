@@ -0,0 +1,137 @@
+"""In-process caches shared by the database and evaluation layers.
+
+This module provides a bounded, thread-safe LRU cache with optional TTL and
+hit/miss counters, and the process-wide cache of compiled policy documents.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with optional time-to-live.
+
+    All operations are guarded by a lock so one instance can be shared by
+    concurrent requests.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float | None = None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        expires_at = (
+            time.monotonic() + self.ttl_seconds
+            if self.ttl_seconds is not None
+            else None
+        )
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with size, max_size, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# -------------------------------------------------------------------------
+# Compiled policy document cache
+# -------------------------------------------------------------------------
+
+# Global compiled policy cache instance
+_policy_cache: LRUCache | None = None
+
+
+def get_policy_cache() -> LRUCache:
+    """Get the process-wide cache of compiled policy documents.
+
+    The evaluator stores the compiled form (CompiledPolicySet) of stored
+    policy documents here rather than the parsed Pydantic documents, which
+    are larger and only needed to read or export a policy. Entries are keyed
+    by (table, owner id, version, content digest), so a saved policy (which
+    bumps its version) or a deleted and re-created one (which restarts at
+    version 1) is never served from a stale entry. The size is read from the
+    POLICY_CACHE_SIZE environment variable (default: 10000).
+
+    Returns:
+        LRUCache: The compiled policy cache
+    """
+    global _policy_cache
+
+    if _policy_cache is None:
+        _policy_cache = LRUCache(max_size=int(os.getenv("POLICY_CACHE_SIZE", "10000")))
+
+    return _policy_cache
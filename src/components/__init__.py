@@ -1,13 +1,20 @@
 """Core components for permission control."""
 
-from .builder import Builder, PolicyOptions
-from .evaluator import EvaluationResult, Evaluator
-from .filter_engine import FilterEngine
+from .builder import Builder, PolicyOptions, get_builder
+from .compiled_policy import CompiledPolicy, CompiledPolicySet, compile_policy_document
+from .evaluator import EvaluationResult, Evaluator, get_evaluator
+from .filter_engine import FilterEngine, get_filter_engine
 
 __all__ = [
     "FilterEngine",
+    "get_filter_engine",
     "Evaluator",
     "EvaluationResult",
+    "get_evaluator",
     "Builder",
     "PolicyOptions",
+    "get_builder",
+    "CompiledPolicy",
+    "CompiledPolicySet",
+    "compile_policy_document",
 ]
@@ -248,3 +248,21 @@ class Builder:
         )
 
         return ResourcePolicyDocument(resource=resource_info, policies=[public_policy])
+
+
+# Global builder instance
+_builder: Builder | None = None
+
+
+def get_builder() -> Builder:
+    """Get the process-wide policy builder.
+
+    Returns:
+        Builder: The shared builder
+    """
+    global _builder
+
+    if _builder is None:
+        _builder = Builder()
+
+    return _builder
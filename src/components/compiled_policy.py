@@ -0,0 +1,142 @@
+"""Compact runtime form of policy documents.
+
+Policy documents are Pydantic models, which is what the API and the database
+layer need. The evaluator only needs, per policy, the permissions it covers,
+whether it denies, its compiled filter and a name for reporting. This module
+builds that form once per document with ``__slots__`` classes, permissions
+encoded as a bitmask and the effect as a bool.
+"""
+
+from typing import Any
+
+from src.components.filter_engine import FilterEngine, InputReader, Predicate
+from src.models.common import PERMISSION_BITS, Effect, Permission, permission_mask
+from src.models.policies import CompiledPolicyDocument
+
+
+class CompiledPolicy:
+    """A single policy reduced to what evaluation needs."""
+
+    __slots__ = ("name", "mask", "deny", "terms")
+
+    def __init__(self, name: str, mask: int, deny: bool, terms: tuple[Predicate, ...]):
+        self.name = name
+        self.mask = mask  # Bitwise OR of the PERMISSION_BITS it covers
+        self.deny = deny
+        # Interned filter term predicates (AND); empty when the policy has no
+        # filter. Identical terms are the same object in every policy.
+        self.terms = terms
+
+    def matches(self, context: dict[str, Any], results: dict[Predicate, bool]) -> bool:
+        """Check the policy's filter, reusing term results of this evaluation.
+
+        Args:
+            context: Evaluation context
+            results: Term results already computed for this context; updated
+                with the terms evaluated here
+
+        Returns:
+            True if every filter term holds
+        """
+        for term in self.terms:
+            result = results.get(term)
+            if result is None:
+                result = results[term] = term(context)
+            if not result:
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        effect = "deny" if self.deny else "allow"
+        return f"CompiledPolicy({self.name!r}, mask={self.mask:#b}, {effect})"
+
+
+class CompiledPolicySet:
+    """Compiled policies of one document, bucketed by permission bit."""
+
+    __slots__ = (
+        "policies",
+        "deny_policies",
+        "allow_policies",
+        "read_inputs",
+        "_buckets",
+    )
+
+    _EMPTY: tuple[tuple[CompiledPolicy, ...], tuple[CompiledPolicy, ...]] = ((), ())
+
+    def __init__(
+        self,
+        policies: tuple[CompiledPolicy, ...],
+        read_inputs: InputReader = lambda _context: (),
+    ):
+        self.policies = policies
+        # Reads every context value the policies' filters depend on
+        self.read_inputs = read_inputs
+        self.deny_policies = tuple(p for p in policies if p.deny)
+        self.allow_policies = tuple(p for p in policies if not p.deny)
+        self._buckets = {
+            bit: (
+                tuple(p for p in policies if p.deny and p.mask & bit),
+                tuple(p for p in policies if not p.deny and p.mask & bit),
+            )
+            for bit in PERMISSION_BITS.values()
+            if any(p.mask & bit for p in policies)
+        }
+
+    def for_permission(
+        self, permission: Permission | str
+    ) -> tuple[tuple[CompiledPolicy, ...], tuple[CompiledPolicy, ...]]:
+        """Get the policies covering a permission.
+
+        Args:
+            permission: Permission being evaluated
+
+        Returns:
+            Tuple of (deny_policies, allow_policies) in document order
+        """
+        return self._buckets.get(PERMISSION_BITS[Permission(permission)], self._EMPTY)
+
+
+def compile_policy_document(
+    policy_doc: CompiledPolicyDocument, prefix: str, filter_engine: FilterEngine
+) -> CompiledPolicySet:
+    """Get the compiled form of a policy document, building it once.
+
+    The result is stored on the document, together with the engine that
+    compiled its filters, and discarded by ``invalidate_compiled()``, so a
+    cached document is compiled once per engine instead of on every
+    evaluation.
+
+    Args:
+        policy_doc: Resource or user policy document
+        prefix: Name prefix for policies without a description
+            (e.g. "resource_policy" gives "resource_policy_0")
+        filter_engine: Engine compiling (and interning) the filter terms
+
+    Returns:
+        CompiledPolicySet: The compiled policies
+    """
+    stored = policy_doc._compiled
+    if stored is not None and stored[0] is filter_engine:
+        return stored[1]
+
+    compiled = CompiledPolicySet(
+        tuple(
+            CompiledPolicy(
+                name=policy.description or f"{prefix}_{idx}",
+                mask=permission_mask(policy.permissions),
+                deny=policy.effect == Effect.DENY,
+                terms=filter_engine.compile_terms(policy.filter),
+            )
+            for idx, policy in enumerate(policy_doc.policies)
+        ),
+        read_inputs=filter_engine.compile_reader(
+            [
+                filter_condition
+                for policy in policy_doc.policies
+                for filter_condition in policy.filter or ()
+            ]
+        ),
+    )
+    policy_doc._compiled = (filter_engine, compiled)
+    return compiled
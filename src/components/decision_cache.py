@@ -0,0 +1,117 @@
+"""Decision cache for permission evaluation results.
+
+This module memoizes EvaluationResult objects for repeated permission checks.
+Entries are keyed on a decision stamp (see Evaluator.decision_stamp()): the
+policy documents' versions and content digests plus the context values their
+filters read, so a changed policy, or a changed value a filter depends on,
+never reuses a stale decision; the TTL only bounds how long unused entries
+are kept.
+
+Building the stamp costs one lookup per distinct filtered property, while
+evaluating costs one check per distinct filter term until a decision is
+reached. The cache pays off when evaluation is the more expensive of the
+two, i.e. for documents with many policies filtering on the same few
+properties (e.g. one ``user.id`` grant per user) whose checks repeat within
+the TTL. For a document of a few policies both cost a few microseconds, so
+the cache saves little next to loading the context, and it is disabled by
+default.
+"""
+
+import os
+from collections.abc import Hashable
+from typing import Any
+
+from src.cache import LRUCache
+from src.components.evaluator import EvaluationResult
+from src.models.common import Permission
+
+
+class DecisionCache:
+    """Size-bounded, TTL-limited cache of permission decisions."""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float | None = 60.0):
+        self._cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def make_key(
+        user_id: str,
+        resource_urn: str,
+        permission: Permission | str,
+        stamp: tuple[Any, ...],
+        explain: bool = False,
+    ) -> Hashable:
+        """Build the cache key of a permission check.
+
+        Args:
+            user_id: User ID
+            resource_urn: Resource URN
+            permission: Permission being checked
+            stamp: Decision stamp (see Evaluator.decision_stamp())
+            explain: Whether the result lists every matching policy
+
+        Returns:
+            Hashable cache key
+        """
+        return (user_id, resource_urn, Permission(permission), explain, stamp)
+
+    def get(self, key: Hashable) -> EvaluationResult | None:
+        """Get a cached decision.
+
+        Args:
+            key: Key built with make_key()
+
+        Returns:
+            The cached EvaluationResult, or None on a miss
+        """
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, result: EvaluationResult) -> None:
+        """Cache a decision.
+
+        Args:
+            key: Key built with make_key()
+            result: Evaluation result to cache
+        """
+        self._cache.set(key, result)
+
+    def clear(self) -> None:
+        """Drop all cached decisions."""
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss/eviction counters.
+
+        Returns:
+            Dictionary of cache counters
+        """
+        return self._cache.stats()
+
+
+# Global decision cache instance
+_decision_cache: DecisionCache | None = None
+
+
+def get_decision_cache() -> DecisionCache | None:
+    """Get the process-wide decision cache, if enabled.
+
+    See the module docstring for when enabling the cache helps.
+
+    Environment variables:
+        DECISION_CACHE_SIZE: Maximum cached decisions (default: 0, disabled)
+        DECISION_CACHE_TTL: Seconds an entry is kept (default: 60)
+
+    Returns:
+        DecisionCache, or None when the cache is disabled
+    """
+    global _decision_cache
+
+    if _decision_cache is None:
+        max_size = int(os.getenv("DECISION_CACHE_SIZE", "0"))
+        if max_size <= 0:
+            return None
+        _decision_cache = DecisionCache(
+            max_size=max_size,
+            ttl_seconds=float(os.getenv("DECISION_CACHE_TTL", "60")),
+        )
+
+    return _decision_cache
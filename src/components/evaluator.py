@@ -4,11 +4,21 @@ This module implements the core permission evaluation logic that determines
 whether a user has a specific permission on a resource.
 """
 
-import re
+import threading
 from typing import Any
 
-from src.components.filter_engine import FilterEngine
-from src.models.common import Effect, Permission
+from src.cache import LRUCache, get_policy_cache
+from src.components.compiled_policy import (
+    CompiledPolicy,
+    CompiledPolicySet,
+    compile_policy_document,
+)
+from src.components.filter_engine import FilterEngine, get_filter_engine
+from src.models.common import (
+    ALL_PERMISSIONS_MASK,
+    Permission,
+    permissions_from_mask,
+)
 from src.models.entities import (
     Document,
     Project,
@@ -17,7 +27,12 @@ from src.models.entities import (
     TeamMembership,
     User,
 )
-from src.models.policies import ResourcePolicyDocument, UserPolicyDocument
+from src.models.policies import (
+    ResourcePolicyDocument,
+    StoredPolicyDocument,
+    UserPolicyDocument,
+)
+from src.models.urn import build_resource_urn, parse_urn
 
 
 class EvaluationResult:
@@ -32,22 +47,47 @@ class EvaluationResult:
 
 
 class Evaluator:
-    """Evaluates permissions based on policies and context."""
+    """Evaluates permissions based on policies and context.
+
+    An evaluator holds no per-request state, so one instance is shared by
+    all requests (see get_evaluator()). Policy documents are accepted parsed
+    or as stored in the database. The compiled form of a parsed document is
+    kept on the document; that of a stored document is kept in the policy
+    cache under the document's key, so a cached document is never parsed.
+    The evaluator counts how often compiled forms are reused.
+    """
+
+    def __init__(
+        self,
+        filter_engine: FilterEngine | None = None,
+        policy_cache: LRUCache | None = None,
+    ):
+        """Initialize evaluator.
 
-    def __init__(self):
-        self.filter_engine = FilterEngine()
+        Args:
+            filter_engine: Filter engine to use (default: shared engine)
+            policy_cache: Optional cache of compiled stored policy documents
+                (default: none, stored documents are compiled on every use)
+        """
+        self.filter_engine = filter_engine or get_filter_engine()
+        self.policy_cache = policy_cache
+        self._lock = threading.Lock()
+        self.evaluations = 0
+        self.compiled_hits = 0
+        self.compiled_misses = 0
 
     def evaluate_permission(
         self,
         user: User,
         document: Document,
         permission: Permission,
-        resource_policy: ResourcePolicyDocument | None = None,
-        user_policy: UserPolicyDocument | None = None,
+        resource_policy: ResourcePolicyDocument | StoredPolicyDocument | None = None,
+        user_policy: UserPolicyDocument | StoredPolicyDocument | None = None,
         team: Team | None = None,
         project: Project | None = None,
         team_membership: TeamMembership | None = None,
         project_membership: ProjectMembership | None = None,
+        explain: bool = False,
     ) -> EvaluationResult:
         """Evaluate if a user has a specific permission on a document.
 
@@ -56,6 +96,12 @@ class Evaluator:
         2. Explicit ALLOW policies (from resource or user policies)
         3. Default DENY (if no matching policies found)
 
+        Deny policies of both documents are evaluated first and evaluation
+        stops at the first match, since a single DENY is final; allow policies
+        are then evaluated up to the first match. In explain mode every
+        matching policy of the deciding effect is evaluated and reported in
+        ``matched_policies``.
+
         Args:
             user: The user requesting permission
             document: The document being accessed
@@ -66,6 +112,8 @@ class Evaluator:
             project: Optional project that owns the document
             team_membership: Optional user's team membership
             project_membership: Optional user's project membership
+            explain: Collect all matching policies instead of stopping at the
+                first decisive one
 
         Returns:
             EvaluationResult: The evaluation result with allow/deny decision
@@ -86,59 +134,33 @@ class Evaluator:
             project_membership=project_membership,
         )
 
-        # Collect all policies
-        all_deny_policies = []
-        all_allow_policies = []
-
-        # Process resource policies
-        if resource_policy:
-            for idx, policy in enumerate(resource_policy.policies):
-                # Check if this policy applies to the requested permission
-                if permission not in policy.permissions:
-                    continue
-
-                # Evaluate filter conditions
-                if policy.filter:
-                    if not self.filter_engine.evaluate_filters(policy.filter, context):
-                        continue
-
-                # Policy matches - categorize by effect
-                policy_name = policy.description or f"resource_policy_{idx}"
-                if policy.effect == Effect.DENY:
-                    all_deny_policies.append(policy_name)
-                else:
-                    all_allow_policies.append(policy_name)
-
-        # Process user policies
-        if user_policy:
-            for idx, policy in enumerate(user_policy.policies):
-                # Check if this policy applies to the requested permission
-                if permission not in policy.permissions:
-                    continue
+        # Only the compiled policies covering the requested permission are
+        # relevant
+        deny_candidates = []
+        allow_candidates = []
+        for compiled in self._compile_documents(resource_policy, user_policy):
+            deny_policies, allow_policies = compiled.for_permission(permission)
+            deny_candidates.append(deny_policies)
+            allow_candidates.append(allow_policies)
 
-                # Evaluate filter conditions
-                if policy.filter:
-                    if not self.filter_engine.evaluate_filters(policy.filter, context):
-                        continue
-
-                # Policy matches - categorize by effect
-                policy_name = policy.description or f"user_policy_{idx}"
-                if policy.effect == Effect.DENY:
-                    all_deny_policies.append(policy_name)
-                else:
-                    all_allow_policies.append(policy_name)
+        # Filter term results of this evaluation, shared by all policies
+        results: dict[Any, bool] = {}
 
         # Apply precedence rules:
         # 1. If any DENY policy matched, deny access
-        if all_deny_policies:
+        matched_deny = self._match_policies(deny_candidates, context, results, explain)
+        if matched_deny:
             return EvaluationResult(
-                allowed=False, message="Deny", matched_policies=all_deny_policies
+                allowed=False, message="Deny", matched_policies=matched_deny
             )
 
         # 2. If any ALLOW policy matched, allow access
-        if all_allow_policies:
+        matched_allow = self._match_policies(
+            allow_candidates, context, results, explain
+        )
+        if matched_allow:
             return EvaluationResult(
-                allowed=True, message="Allow", matched_policies=all_allow_policies
+                allowed=True, message="Allow", matched_policies=matched_allow
             )
 
         # 3. Default deny (no matching policies)
@@ -146,6 +168,280 @@ class Evaluator:
             allowed=False, message="Deny: No matching policy found", matched_policies=[]
         )
 
+    def evaluate_permission_mask(
+        self,
+        user: User,
+        document: Document,
+        resource_policy: ResourcePolicyDocument | StoredPolicyDocument | None = None,
+        user_policy: UserPolicyDocument | StoredPolicyDocument | None = None,
+        team: Team | None = None,
+        project: Project | None = None,
+        team_membership: TeamMembership | None = None,
+        project_membership: ProjectMembership | None = None,
+        requested_mask: int = ALL_PERMISSIONS_MASK,
+    ) -> int:
+        """Evaluate several permissions at once and return the allowed ones.
+
+        Applies the same precedence as evaluate_permission() to every
+        requested permission in a single pass over the compiled policies:
+        a policy is only evaluated while it still covers an undecided
+        permission. Filter terms are interned, so each distinct
+        (prop, op, value) condition is evaluated at most once even when
+        several policies (or both documents) repeat it.
+
+        Args:
+            user: The user requesting permission
+            document: The document being accessed
+            resource_policy: Optional resource-specific policy document
+            user_policy: Optional user-specific policy document
+            team: Optional team that owns the project
+            project: Optional project that owns the document
+            team_membership: Optional user's team membership
+            project_membership: Optional user's project membership
+            requested_mask: Permissions to evaluate (default: all)
+
+        Returns:
+            Bitmask of the allowed permissions (see models.common.PERMISSION_BITS)
+        """
+        if document.is_deleted:
+            return 0
+
+        context = self._build_context(
+            user=user,
+            document=document,
+            team=team,
+            project=project,
+            team_membership=team_membership,
+            project_membership=project_membership,
+        )
+
+        compiled_docs = self._compile_documents(resource_policy, user_policy)
+
+        # Filter term results of this evaluation, shared by all policies
+        results: dict[Any, bool] = {}
+
+        # 1. Permissions with a matching DENY policy are denied
+        undecided = requested_mask
+        for compiled in compiled_docs:
+            for policy in compiled.deny_policies:
+                if policy.mask & undecided and policy.matches(context, results):
+                    undecided &= ~policy.mask
+
+        # 2. Remaining permissions with a matching ALLOW policy are allowed
+        allowed = 0
+        for compiled in compiled_docs:
+            for policy in compiled.allow_policies:
+                if policy.mask & undecided and policy.matches(context, results):
+                    allowed |= policy.mask & undecided
+                    undecided &= ~policy.mask
+
+        # 3. Everything else is denied by default
+        return allowed
+
+    def evaluate_all_permissions(
+        self,
+        user: User,
+        document: Document,
+        resource_policy: ResourcePolicyDocument | StoredPolicyDocument | None = None,
+        user_policy: UserPolicyDocument | StoredPolicyDocument | None = None,
+        team: Team | None = None,
+        project: Project | None = None,
+        team_membership: TeamMembership | None = None,
+        project_membership: ProjectMembership | None = None,
+    ) -> list[Permission]:
+        """Get every permission the user has on a document in one evaluation.
+
+        Args:
+            user: The user requesting permission
+            document: The document being accessed
+            resource_policy: Optional resource-specific policy document
+            user_policy: Optional user-specific policy document
+            team: Optional team that owns the project
+            project: Optional project that owns the document
+            team_membership: Optional user's team membership
+            project_membership: Optional user's project membership
+
+        Returns:
+            Allowed permissions, in Permission declaration order
+        """
+        mask = self.evaluate_permission_mask(
+            user=user,
+            document=document,
+            resource_policy=resource_policy,
+            user_policy=user_policy,
+            team=team,
+            project=project,
+            team_membership=team_membership,
+            project_membership=project_membership,
+        )
+        return permissions_from_mask(mask)
+
+    def stats(self) -> dict[str, Any]:
+        """Get evaluation and compile cache counters.
+
+        Returns:
+            Dictionary with the number of evaluations, compiled policy
+            document hits/misses and the filter engine's cache counters
+        """
+        with self._lock:
+            stats: dict[str, Any] = {
+                "evaluations": self.evaluations,
+                "compiled_hits": self.compiled_hits,
+                "compiled_misses": self.compiled_misses,
+            }
+        stats["filter_engine"] = self.filter_engine.stats()
+        return stats
+
+    def decision_stamp(
+        self,
+        user: User,
+        document: Document,
+        resource_policy: StoredPolicyDocument | None = None,
+        user_policy: StoredPolicyDocument | None = None,
+        team: Team | None = None,
+        project: Project | None = None,
+        team_membership: TeamMembership | None = None,
+        project_membership: ProjectMembership | None = None,
+    ) -> tuple[Any, ...]:
+        """Build a stamp that changes whenever the decision of a check could.
+
+        A decision depends on the policy documents, on whether the document
+        is deleted and on the context values their filters read, nothing
+        else. The stamp holds the documents' keys (version and content
+        digest) and those values only, so it costs a lookup per filtered
+        property instead of a copy of every entity field. Compiled forms are
+        taken from (or added to) the policy cache.
+
+        Args:
+            user: The user requesting permission
+            document: The document being accessed
+            resource_policy: Optional stored resource policy document
+            user_policy: Optional stored user policy document
+            team: Optional team that owns the project
+            project: Optional project that owns the document
+            team_membership: Optional user's team membership
+            project_membership: Optional user's project membership
+
+        Returns:
+            Hashable tuple suitable for keying cached decisions
+        """
+        context = self._build_context(
+            user=user,
+            document=document,
+            team=team,
+            project=project,
+            team_membership=team_membership,
+            project_membership=project_membership,
+        )
+        stamp: list[Any] = [document.is_deleted]
+        for policy_doc, prefix in (
+            (resource_policy, "resource_policy"),
+            (user_policy, "user_policy"),
+        ):
+            if policy_doc is None:
+                stamp.append(None)
+                continue
+            compiled, _ = self._compiled_form(policy_doc, prefix)
+            stamp.append((policy_doc.key, compiled.read_inputs(context)))
+        return tuple(stamp)
+
+    def _compile_documents(
+        self,
+        resource_policy: ResourcePolicyDocument | StoredPolicyDocument | None,
+        user_policy: UserPolicyDocument | StoredPolicyDocument | None,
+    ) -> list[CompiledPolicySet]:
+        """Get the compiled policies of an evaluation's documents.
+
+        Args:
+            resource_policy: Optional resource-specific policy document
+            user_policy: Optional user-specific policy document
+
+        Returns:
+            Compiled policy sets of the given documents, resource policy first
+        """
+        compiled_docs = []
+        hits = 0
+        for policy_doc, prefix in (
+            (resource_policy, "resource_policy"),
+            (user_policy, "user_policy"),
+        ):
+            if policy_doc is not None:
+                compiled, hit = self._compiled_form(policy_doc, prefix)
+                compiled_docs.append(compiled)
+                hits += hit
+
+        with self._lock:
+            self.evaluations += 1
+            self.compiled_hits += hits
+            self.compiled_misses += len(compiled_docs) - hits
+
+        return compiled_docs
+
+    def _compiled_form(
+        self,
+        policy_doc: ResourcePolicyDocument | UserPolicyDocument | StoredPolicyDocument,
+        prefix: str,
+    ) -> tuple[CompiledPolicySet, bool]:
+        """Get the compiled form of one policy document.
+
+        Args:
+            policy_doc: Parsed or stored policy document
+            prefix: Name prefix for policies without a description
+
+        Returns:
+            Tuple of (compiled policies, whether they were already compiled)
+        """
+        if not isinstance(policy_doc, StoredPolicyDocument):
+            stored = policy_doc._compiled
+            compiled = compile_policy_document(policy_doc, prefix, self.filter_engine)
+            return compiled, policy_doc._compiled is stored
+
+        # Only the compiled form is cached; the parsed document is dropped
+        # once compiled
+        if self.policy_cache is not None:
+            compiled = self.policy_cache.get(policy_doc.key)
+            if compiled is not None:
+                return compiled, True
+
+        compiled = compile_policy_document(
+            policy_doc.parse(), prefix, self.filter_engine
+        )
+        if self.policy_cache is not None:
+            self.policy_cache.set(policy_doc.key, compiled)
+        return compiled, False
+
+    def _match_policies(
+        self,
+        candidates: list[tuple[CompiledPolicy, ...]],
+        context: dict[str, Any],
+        results: dict[Any, bool],
+        explain: bool,
+    ) -> list[str]:
+        """Evaluate candidate policies and collect the names of matching ones.
+
+        Args:
+            candidates: Compiled policies of each document, in precedence order
+            context: Evaluation context
+            results: Filter term results of this evaluation (memo)
+            explain: Collect all matches instead of stopping at the first one
+
+        Returns:
+            Names of the matching policies
+        """
+        matched = []
+
+        for policies in candidates:
+            for policy in policies:
+                # Evaluate compiled filter conditions
+                if not policy.matches(context, results):
+                    continue
+
+                matched.append(policy.name)
+                if not explain:
+                    return matched
+
+        return matched
+
     def _build_context(
         self,
         user: User,
@@ -157,6 +453,11 @@ class Evaluator:
     ) -> dict[str, Any]:
         """Build evaluation context from entities.
 
+        Entities are exposed through their field dictionaries (``vars()`` of
+        a Pydantic model) instead of ``model_dump()`` copies, so building the
+        context costs nothing and filters only read the fields they touch.
+        The dictionaries are the live model state and must not be mutated.
+
         Args:
             user: User entity
             document: Document entity
@@ -169,21 +470,21 @@ class Evaluator:
             Dictionary containing all context data for filter evaluation
         """
         context = {
-            "user": user.model_dump(),
-            "document": document.model_dump(),
+            "user": vars(user),
+            "document": vars(document),
         }
 
         if team:
-            context["team"] = team.model_dump()
+            context["team"] = vars(team)
 
         if project:
-            context["project"] = project.model_dump()
+            context["project"] = vars(project)
 
         if team_membership:
-            context["teamMembership"] = team_membership.model_dump()
+            context["teamMembership"] = vars(team_membership)
 
         if project_membership:
-            context["projectMembership"] = project_membership.model_dump()
+            context["projectMembership"] = vars(project_membership)
 
         return context
 
@@ -205,13 +506,11 @@ class Evaluator:
             >>> extract_urn_components("urn:resource:team1:proj1:doc1")
             ("team1", "proj1", "doc1")
         """
-        pattern = r"^urn:resource:([a-zA-Z0-9]+):([a-zA-Z0-9]+):([a-zA-Z0-9]+)$"
-        match = re.match(pattern, resource_urn)
-
-        if not match:
+        urn = parse_urn(resource_urn)
+        if urn is None:
             return None, None, None
 
-        return match.group(1), match.group(2), match.group(3)
+        return urn
 
     @staticmethod
     def build_resource_urn(team_id: str, project_id: str, doc_id: str) -> str:
@@ -229,4 +528,25 @@ class Evaluator:
             >>> build_resource_urn("team1", "proj1", "doc1")
             "urn:resource:team1:proj1:doc1"
         """
-        return f"urn:resource:{team_id}:{project_id}:{doc_id}"
+        return build_resource_urn(team_id, project_id, doc_id)
+
+
+# Global evaluator instance
+_evaluator: Evaluator | None = None
+
+
+def get_evaluator() -> Evaluator:
+    """Get the process-wide evaluator.
+
+    The evaluator caches compiled policy documents in the process-wide
+    policy cache (see src.cache.get_policy_cache()).
+
+    Returns:
+        Evaluator: The shared evaluator
+    """
+    global _evaluator
+
+    if _evaluator is None:
+        _evaluator = Evaluator(policy_cache=get_policy_cache())
+
+    return _evaluator
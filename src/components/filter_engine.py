@@ -2,16 +2,172 @@
 
 This module provides the core filter evaluation logic that supports all operators
 defined in the permissions DSL.
+
+Complexity of the membership operators in compiled predicates (n = size of
+the collection operand, m = length of the string operand):
+
+- ``in`` / ``not in`` with a literal list: O(1) on average. The literal is
+  converted to a frozenset at compile time; if any element is unhashable the
+  list is kept and the check is O(n).
+- ``in`` / ``not in`` with a reference (e.g. ``"user.groups"``): O(n) for
+  lists and tuples, O(1) for sets, since the operand is only known at run time.
+- ``has`` / ``has not``: O(n) when the property is a list or tuple, O(1) when
+  it is a set, and O(n * m) worst case substring search when both are strings.
 """
 
+from collections.abc import Callable
+from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from src.models.common import Filter, FilterOperator
 
+# A compiled filter: takes an evaluation context and returns the match result
+Predicate = Callable[[dict[str, Any]], bool]
+
+# Reads the inputs of a set of filters from an evaluation context
+InputReader = Callable[[dict[str, Any]], tuple[Any, ...]]
+
+# Maximum number of distinct filter lists kept in the compile cache
+COMPILE_CACHE_SIZE = 4096
+
 
 class FilterEngine:
     """Engine for evaluating filter conditions against context objects."""
 
+    def __init__(self, cache_size: int = COMPILE_CACHE_SIZE):
+        """Initialize the engine and its compile caches.
+
+        Args:
+            cache_size: Maximum number of distinct filter lists and of
+                distinct terms kept compiled (default: COMPILE_CACHE_SIZE)
+        """
+        self._compile_terms = lru_cache(maxsize=cache_size)(self._build_terms)
+        self._intern_term = lru_cache(maxsize=cache_size)(self._build_term)
+
+    def compile(self, filters: list[Filter] | None) -> Predicate:
+        """Compile a list of filter conditions (AND logic) into a predicate.
+
+        Property paths are split, operators are bound to their implementation
+        and reference-vs-literal values are decided once, so the returned
+        callable only does the work that depends on the context. Compiled
+        predicates are memoized by filter content, so identical filter lists
+        (e.g. the same policy loaded again) are compiled only once.
+
+        Args:
+            filters: List of filter conditions (None or empty means no restrictions)
+
+        Returns:
+            Predicate: Callable taking a context dict and returning a bool
+
+        Example:
+            predicate = engine.compile(policy.filter)
+            if predicate(context):
+                ...
+        """
+        if not filters:
+            return _always_true
+
+        return self._compile_terms(tuple(_filter_key(f) for f in filters))
+
+    def compile_terms(self, filters: list[Filter] | None) -> tuple[Predicate, ...]:
+        """Compile filter conditions into their individual term predicates.
+
+        Terms are interned: every identical (prop, op, value) condition, in
+        any filter list or policy document compiled by this engine, compiles
+        to the same predicate object, and duplicates within ``filters`` are dropped. Callers can
+        therefore memoize term results by predicate for one evaluation
+        (common-subexpression elimination across policies).
+
+        Args:
+            filters: List of filter conditions (None or empty means no restrictions)
+
+        Returns:
+            Distinct term predicates; the filter matches when all return True
+        """
+        if not filters:
+            return ()
+
+        return tuple(dict.fromkeys(self._intern_term(*_filter_key(f)) for f in filters))
+
+    def compile_reader(self, filters: list[Filter] | None) -> InputReader:
+        """Compile a function reading every context value the filters depend on.
+
+        The reader returns, for each property path the filters read (the
+        ``prop`` of every condition and every value that may be a reference),
+        whether the path's root is in the context and the (hashable) value
+        found there. Two contexts giving equal readings produce the same
+        result for every one of the filters.
+
+        Args:
+            filters: Filter conditions (None or empty reads nothing)
+
+        Returns:
+            InputReader: Callable taking a context dict and returning a tuple
+        """
+        paths = set()
+        for filter_condition in filters or ():
+            paths.add(filter_condition.prop)
+            if (
+                isinstance(filter_condition.value, str)
+                and "." in filter_condition.value
+            ):
+                paths.add(filter_condition.value)
+
+        readers = tuple(
+            (path.split(".", 1)[0], _compile_path(path)) for path in sorted(paths)
+        )
+
+        def read(context: dict[str, Any]) -> tuple[Any, ...]:
+            return tuple(
+                (root in context, _freeze(resolve(context)))
+                for root, resolve in readers
+            )
+
+        return read
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Get counters of the compile caches.
+
+        Each engine has caches of its own.
+
+        Returns:
+            Dictionary with hits, misses, size and max_size of the filter
+            list cache ("filters") and the term cache ("terms")
+        """
+        return {
+            name: {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "max_size": info.maxsize,
+            }
+            for name, info in (
+                ("filters", self._compile_terms.cache_info()),
+                ("terms", self._intern_term.cache_info()),
+            )
+        }
+
+    def _build_terms(self, terms: tuple[tuple[str, str, Any], ...]) -> Predicate:
+        """Compile (prop, op, value) terms into a single AND predicate."""
+        predicates = tuple(
+            self._intern_term(prop, op, value) for prop, op, value in terms
+        )
+
+        if len(predicates) == 1:
+            return predicates[0]
+
+        def all_of(context: dict[str, Any]) -> bool:
+            return all(predicate(context) for predicate in predicates)
+
+        return all_of
+
+    def _build_term(
+        self, prop: str, op: FilterOperator, frozen_value: Any
+    ) -> Predicate:
+        """Get the shared predicate of a (prop, op, frozen value) term."""
+        return _compile_term(prop, op, _thaw(frozen_value))
+
     def evaluate_filter(
         self, filter_condition: Filter, context: dict[str, Any]
     ) -> bool:
@@ -116,72 +272,400 @@ class FilterEngine:
         Returns:
             bool: Result of the comparison
         """
-        # Handle null checks first
-        if operator == FilterOperator.NE_NULL:  # "<>" means not null
-            return left is not None
+        # Operators are looked up in a dispatch table; each implementation
+        # handles a None left operand itself
+        return _OPERATORS.get(operator, _op_unknown)(left, right)
 
-        # If left is None for other operators, return False
-        if left is None:
-            return False
 
-        # Apply operator
-        if operator == FilterOperator.EQ:  # "=="
-            return left == right
+# Global filter engine instance
+_filter_engine: FilterEngine | None = None
 
-        elif operator == FilterOperator.NE:  # "!="
-            return left != right
 
-        elif operator == FilterOperator.GT:  # ">"
-            try:
-                return left > right
-            except TypeError:
-                return False
+def get_filter_engine() -> FilterEngine:
+    """Get the process-wide filter engine.
 
-        elif operator == FilterOperator.GTE:  # ">="
-            try:
-                return left >= right
-            except TypeError:
-                return False
+    Returns:
+        FilterEngine: The shared engine
+    """
+    global _filter_engine
 
-        elif operator == FilterOperator.LT:  # "<"
-            try:
-                return left < right
-            except TypeError:
-                return False
+    if _filter_engine is None:
+        _filter_engine = FilterEngine()
 
-        elif operator == FilterOperator.LTE:  # "<="
-            try:
-                return left <= right
-            except TypeError:
-                return False
+    return _filter_engine
 
-        elif operator == FilterOperator.IN:  # "in"
-            if not isinstance(right, (list, tuple, set)):
-                return False
-            return left in right
 
-        elif operator == FilterOperator.NOT_IN:  # "not in"
-            if not isinstance(right, (list, tuple, set)):
+# -------------------------------------------------------------------------
+# Compilation helpers
+# -------------------------------------------------------------------------
+
+
+def _always_true(_context: dict[str, Any]) -> bool:
+    """Predicate for an empty filter list."""
+    return True
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a filter value into a hashable cache key component.
+
+    Containers are tagged with their type so that e.g. a list literal and a
+    tuple literal never share a compiled predicate.
+    """
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze."""
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], type):
+        kind, items = value
+        if kind is dict:
+            return {k: _thaw(v) for k, v in items}
+        return kind(_thaw(v) for v in items)
+    return value
+
+
+def _filter_key(filter_condition: Filter) -> tuple[str, str, Any]:
+    """Build the hashable (prop, op, value) key of a filter condition."""
+    return (
+        filter_condition.prop,
+        FilterOperator(filter_condition.op),
+        _freeze(filter_condition.value),
+    )
+
+
+def _compile_term(prop: str, op: FilterOperator, value: Any) -> Predicate:
+    """Compile a single filter condition into a predicate."""
+    resolve_left = _compile_path(prop)
+    apply = _OPERATORS.get(op, _op_unknown)
+
+    # Literal allow/deny lists become hash sets for O(1) membership tests
+    if op in (FilterOperator.IN, FilterOperator.NOT_IN) and isinstance(
+        value, (list, tuple, set, frozenset)
+    ):
+        members = _to_frozenset(value)
+        if members is not None:
+            return _compile_membership(
+                resolve_left, members, negate=op == FilterOperator.NOT_IN
+            )
+
+    # Only strings containing a dot can be references; whether the root is
+    # present in the context is still checked at evaluation time.
+    if isinstance(value, str) and "." in value:
+        root = value.split(".", 1)[0]
+        resolve_reference = _compile_path(value)
+
+        def predicate(context: dict[str, Any]) -> bool:
+            right = resolve_reference(context) if root in context else value
+            return apply(resolve_left(context), right)
+
+        return predicate
+
+    # Literals of a known scalar type get an operator specialized for it
+    specialize = _SPECIALIZED_OPERATORS.get(op)
+    if specialize is not None and type(value) in _SPECIALIZED_LITERAL_TYPES:
+        return specialize(resolve_left, value)
+
+    def literal_predicate(context: dict[str, Any]) -> bool:
+        return apply(resolve_left(context), value)
+
+    return literal_predicate
+
+
+def _to_frozenset(values: Any) -> frozenset | None:
+    """Convert a literal collection to a frozenset, or None if unhashable."""
+    try:
+        return frozenset(values)
+    except TypeError:
+        return None
+
+
+def _compile_membership(
+    resolve_left: Callable[[dict[str, Any]], Any], members: frozenset, negate: bool
+) -> Predicate:
+    """Compile an ``in`` / ``not in`` test against a literal hash set.
+
+    Equivalent to testing membership in the original list: hashable values
+    compare by hash and equality, and an unhashable property value cannot be
+    equal to any (hashable) member.
+    """
+    if negate:
+
+        def not_in_predicate(context: dict[str, Any]) -> bool:
+            left = resolve_left(context)
+            if left is None:
+                return False
+            try:
+                return left not in members
+            except TypeError:
                 return True
-            return left not in right
 
-        elif operator == FilterOperator.HAS:  # "has" - substring/contains check
-            if (
-                isinstance(left, str)
-                and isinstance(right, str)
-                or isinstance(left, (list, tuple, set))
-            ):
-                return right in left
+        return not_in_predicate
+
+    def in_predicate(context: dict[str, Any]) -> bool:
+        left = resolve_left(context)
+        if left is None:
+            return False
+        try:
+            return left in members
+        except TypeError:
             return False
 
-        elif operator == FilterOperator.HAS_NOT:  # "has not"
-            if (
-                isinstance(left, str)
-                and isinstance(right, str)
-                or isinstance(left, (list, tuple, set))
-            ):
-                return right not in left
-            return True
+    return in_predicate
+
+
+def _compile_path(prop_path: str) -> Callable[[dict[str, Any]], Any]:
+    """Compile a dot-separated property path into a resolver function."""
+    parts = tuple(prop_path.split("."))
+
+    if len(parts) == 2:
+        root, attr = parts
+
+        def resolve_pair(context: dict[str, Any]) -> Any:
+            current = context.get(root)
+            if current is None:
+                return None
+            if isinstance(current, dict):
+                return current.get(attr)
+            return getattr(current, attr, None)
+
+        return resolve_pair
+
+    def resolve(context: dict[str, Any]) -> Any:
+        current: Any = context
+        for part in parts:
+            if isinstance(current, dict):
+                current = current.get(part)
+                if current is None:
+                    return None
+            else:
+                current = getattr(current, part, None)
+                if current is None:
+                    return None
+        return current
+
+    return resolve
+
+
+# -------------------------------------------------------------------------
+# Operator implementations used by compiled predicates
+# -------------------------------------------------------------------------
+
+
+def _op_eq(left: Any, right: Any) -> bool:
+    return left is not None and left == right
+
 
-        # Unknown operator
+def _op_ne(left: Any, right: Any) -> bool:
+    return left is not None and left != right
+
+
+def _op_gt(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    try:
+        return left > right
+    except TypeError:
+        return False
+
+
+def _op_gte(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    try:
+        return left >= right
+    except TypeError:
         return False
+
+
+def _op_lt(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    try:
+        return left < right
+    except TypeError:
+        return False
+
+
+def _op_lte(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    try:
+        return left <= right
+    except TypeError:
+        return False
+
+
+def _op_ne_null(left: Any, _right: Any) -> bool:
+    return left is not None
+
+
+def _op_in(left: Any, right: Any) -> bool:
+    if left is None or not isinstance(right, (list, tuple, set, frozenset)):
+        return False
+    return left in right
+
+
+def _op_not_in(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    if not isinstance(right, (list, tuple, set, frozenset)):
+        return True
+    return left not in right
+
+
+def _op_has(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    if (
+        isinstance(left, str)
+        and isinstance(right, str)
+        or isinstance(left, (list, tuple, set, frozenset))
+    ):
+        return right in left
+    return False
+
+
+def _op_has_not(left: Any, right: Any) -> bool:
+    if left is None:
+        return False
+    if (
+        isinstance(left, str)
+        and isinstance(right, str)
+        or isinstance(left, (list, tuple, set, frozenset))
+    ):
+        return right not in left
+    return True
+
+
+def _op_unknown(_left: Any, _right: Any) -> bool:
+    return False
+
+
+_OPERATORS: dict[FilterOperator, Callable[[Any, Any], bool]] = {
+    FilterOperator.EQ: _op_eq,
+    FilterOperator.NE: _op_ne,
+    FilterOperator.GT: _op_gt,
+    FilterOperator.GTE: _op_gte,
+    FilterOperator.LT: _op_lt,
+    FilterOperator.LTE: _op_lte,
+    FilterOperator.NE_NULL: _op_ne_null,
+    FilterOperator.IN: _op_in,
+    FilterOperator.NOT_IN: _op_not_in,
+    FilterOperator.HAS: _op_has,
+    FilterOperator.HAS_NOT: _op_has_not,
+}
+
+
+# -------------------------------------------------------------------------
+# Operators specialized for scalar literals
+# -------------------------------------------------------------------------
+# Each factory takes the property resolver and the literal right operand and
+# returns a predicate with the same result as the generic operator, with the
+# operator inlined and without the checks the literal's type makes unnecessary.
+
+_SPECIALIZED_LITERAL_TYPES = frozenset({str, int, float, bool, datetime})
+
+Resolver = Callable[[dict[str, Any]], Any]
+
+_COLLECTIONS = (list, tuple, set, frozenset)
+_STR_OR_COLLECTIONS = (str, list, tuple, set, frozenset)
+
+
+def _eq_literal(resolve: Resolver, value: Any) -> Predicate:
+    # None never equals a non-None scalar, so no None check is needed
+    def eq(context: dict[str, Any]) -> bool:
+        return resolve(context) == value
+
+    return eq
+
+
+def _ne_literal(resolve: Resolver, value: Any) -> Predicate:
+    def ne(context: dict[str, Any]) -> bool:
+        left = resolve(context)
+        return left is not None and left != value
+
+    return ne
+
+
+# For ordered comparisons, comparing None or a mismatched type raises
+# TypeError, which also covers the generic operator's None check
+
+
+def _gt_literal(resolve: Resolver, value: Any) -> Predicate:
+    def gt(context: dict[str, Any]) -> bool:
+        try:
+            return resolve(context) > value
+        except TypeError:
+            return False
+
+    return gt
+
+
+def _gte_literal(resolve: Resolver, value: Any) -> Predicate:
+    def gte(context: dict[str, Any]) -> bool:
+        try:
+            return resolve(context) >= value
+        except TypeError:
+            return False
+
+    return gte
+
+
+def _lt_literal(resolve: Resolver, value: Any) -> Predicate:
+    def lt(context: dict[str, Any]) -> bool:
+        try:
+            return resolve(context) < value
+        except TypeError:
+            return False
+
+    return lt
+
+
+def _lte_literal(resolve: Resolver, value: Any) -> Predicate:
+    def lte(context: dict[str, Any]) -> bool:
+        try:
+            return resolve(context) <= value
+        except TypeError:
+            return False
+
+    return lte
+
+
+def _has_literal(resolve: Resolver, value: Any) -> Predicate:
+    # A string literal can be searched in strings too, other scalars only
+    # in collections
+    containers = _STR_OR_COLLECTIONS if isinstance(value, str) else _COLLECTIONS
+
+    def has(context: dict[str, Any]) -> bool:
+        left = resolve(context)
+        return isinstance(left, containers) and value in left
+
+    return has
+
+
+def _has_not_literal(resolve: Resolver, value: Any) -> Predicate:
+    containers = _STR_OR_COLLECTIONS if isinstance(value, str) else _COLLECTIONS
+
+    def has_not(context: dict[str, Any]) -> bool:
+        left = resolve(context)
+        if left is None:
+            return False
+        return not isinstance(left, containers) or value not in left
+
+    return has_not
+
+
+_SPECIALIZED_OPERATORS: dict[FilterOperator, Callable[[Resolver, Any], Predicate]] = {
+    FilterOperator.EQ: _eq_literal,
+    FilterOperator.NE: _ne_literal,
+    FilterOperator.GT: _gt_literal,
+    FilterOperator.GTE: _gte_literal,
+    FilterOperator.LT: _lt_literal,
+    FilterOperator.LTE: _lte_literal,
+    FilterOperator.HAS: _has_literal,
+    FilterOperator.HAS_NOT: _has_not_literal,
+}
@@ -1,7 +1,8 @@
 """Database layer for data access."""
 
+from .async_repository import AsyncRepository
 from .connection import DatabaseConfig, DatabaseConnection, close_database, get_database
-from .repository import Repository
+from .repository import EvaluationContext, Repository
 
 __all__ = [
     "DatabaseConnection",
@@ -9,4 +10,6 @@ __all__ = [
     "get_database",
     "close_database",
     "Repository",
+    "EvaluationContext",
+    "AsyncRepository",
 ]
@@ -0,0 +1,269 @@
+"""Awaitable data access layer.
+
+This module wraps the synchronous Repository so async route handlers can
+await queries without blocking the event loop. Queries run on a dedicated
+thread pool sized to the connection pool. Each call checks a connection out
+for its duration and returns it, so worker threads hold no connection between
+calls and a slow query only occupies one of them.
+"""
+
+import asyncio
+import functools
+import itertools
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, TypeVar
+
+from src.database.connection import DatabaseConnection
+from src.database.repository import (
+    EvaluationContext,
+    PolicyExportRow,
+    PolicyGrant,
+    Repository,
+)
+from src.models.common import Permission
+from src.models.entities import (
+    Document,
+    Project,
+    ProjectMembership,
+    Team,
+    TeamMembership,
+    User,
+)
+from src.models.policies import ResourcePolicyDocument, UserPolicyDocument
+
+T = TypeVar("T")
+
+
+# Global executor running repository calls
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor(db: DatabaseConnection) -> ThreadPoolExecutor:
+    """Get the thread pool used to run repository calls.
+
+    The pool has one thread per pooled connection. Each call checks a
+    connection out for its own duration, so with every thread busy each one
+    still gets a connection. In-memory SQLite uses a single shared
+    connection, so its calls are serialized on one thread.
+
+    Args:
+        db: Database whose pool size bounds the number of threads
+
+    Returns:
+        ThreadPoolExecutor: The shared executor
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=db.max_connections, thread_name_prefix="repository"
+        )
+
+    return _executor
+
+
+def shutdown_executor():
+    """Shut down the repository executor, waiting for running calls."""
+    global _executor
+
+    if _executor:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _next_batch(iterator: Iterator[Any], size: int) -> list[Any]:
+    """Take up to size items from an iterator."""
+    return list(itertools.islice(iterator, size))
+
+
+class AsyncRepository:
+    """Async facade over Repository.
+
+    Every method mirrors the Repository method of the same name and runs it
+    on the repository executor.
+    """
+
+    def __init__(
+        self, repository: Repository, executor: ThreadPoolExecutor | None = None
+    ):
+        """Initialize async repository.
+
+        Args:
+            repository: Synchronous repository to delegate to
+            executor: Thread pool to run calls on (default: shared executor)
+        """
+        self.repository = repository
+        self.executor = executor or get_executor(repository.db)
+
+    async def _run(self, method: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(method, *args)
+        )
+
+    # -------------------------------------------------------------------------
+    # Entities
+    # -------------------------------------------------------------------------
+
+    async def get_user(self, user_id: str) -> User | None:
+        """Get user by ID."""
+        return await self._run(self.repository.get_user, user_id)
+
+    async def get_team(self, team_id: str) -> Team | None:
+        """Get team by ID."""
+        return await self._run(self.repository.get_team, team_id)
+
+    async def get_project(self, project_id: str) -> Project | None:
+        """Get project by ID."""
+        return await self._run(self.repository.get_project, project_id)
+
+    async def get_document(self, document_id: str) -> Document | None:
+        """Get document by ID."""
+        return await self._run(self.repository.get_document, document_id)
+
+    async def get_team_membership(
+        self, user_id: str, team_id: str
+    ) -> TeamMembership | None:
+        """Get team membership for user."""
+        return await self._run(self.repository.get_team_membership, user_id, team_id)
+
+    async def get_project_membership(
+        self, user_id: str, project_id: str
+    ) -> ProjectMembership | None:
+        """Get project membership for user."""
+        return await self._run(
+            self.repository.get_project_membership, user_id, project_id
+        )
+
+    async def get_users(self, user_ids: list[str]) -> dict[str, User]:
+        """Get many users by ID."""
+        return await self._run(self.repository.get_users, user_ids)
+
+    async def get_teams(self, team_ids: list[str]) -> dict[str, Team]:
+        """Get many teams by ID."""
+        return await self._run(self.repository.get_teams, team_ids)
+
+    async def get_projects(self, project_ids: list[str]) -> dict[str, Project]:
+        """Get many projects by ID."""
+        return await self._run(self.repository.get_projects, project_ids)
+
+    async def get_documents(self, document_ids: list[str]) -> dict[str, Document]:
+        """Get many documents by ID."""
+        return await self._run(self.repository.get_documents, document_ids)
+
+    async def get_team_memberships(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], TeamMembership]:
+        """Get team memberships for many (user_id, team_id) pairs."""
+        return await self._run(self.repository.get_team_memberships, pairs)
+
+    async def get_project_memberships(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], ProjectMembership]:
+        """Get project memberships for many (user_id, project_id) pairs."""
+        return await self._run(self.repository.get_project_memberships, pairs)
+
+    # -------------------------------------------------------------------------
+    # Evaluation context
+    # -------------------------------------------------------------------------
+
+    async def load_evaluation_context(
+        self, user_id: str, resource_urn: str
+    ) -> EvaluationContext:
+        """Load everything needed to evaluate one permission check."""
+        return await self._run(
+            self.repository.load_evaluation_context, user_id, resource_urn
+        )
+
+    async def load_evaluation_contexts(
+        self, checks: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], EvaluationContext]:
+        """Load evaluation contexts for many (user_id, resource_urn) pairs."""
+        return await self._run(self.repository.load_evaluation_contexts, checks)
+
+    # -------------------------------------------------------------------------
+    # Policies
+    # -------------------------------------------------------------------------
+
+    async def get_resource_policy(
+        self, resource_id: str
+    ) -> ResourcePolicyDocument | None:
+        """Get resource policy document."""
+        return await self._run(self.repository.get_resource_policy, resource_id)
+
+    async def save_resource_policy(self, policy_doc: ResourcePolicyDocument) -> int:
+        """Save or update resource policy document."""
+        return await self._run(self.repository.save_resource_policy, policy_doc)
+
+    async def save_resource_policies_bulk(
+        self, policy_docs: list[ResourcePolicyDocument]
+    ) -> dict[str, int]:
+        """Save or update many resource policy documents in one transaction."""
+        return await self._run(self.repository.save_resource_policies_bulk, policy_docs)
+
+    async def get_resource_policies(
+        self, resource_ids: list[str]
+    ) -> dict[str, ResourcePolicyDocument]:
+        """Get resource policy documents for many resources."""
+        return await self._run(self.repository.get_resource_policies, resource_ids)
+
+    async def iter_resource_policies(
+        self,
+        resource_prefix: str | None = None,
+        updated_since: datetime | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[PolicyExportRow]:
+        """Stream stored resource policy documents.
+
+        Each batch is fetched on the executor as a separate query, so no
+        connection is held between batches.
+        """
+        rows = self.repository.iter_resource_policies(
+            resource_prefix, updated_since, batch_size
+        )
+        try:
+            while batch := await self._run(_next_batch, rows, batch_size):
+                for row in batch:
+                    yield row
+        finally:
+            await self._run(rows.close)
+
+    async def find_resources_granting(
+        self, user_id: str, permission: Permission | str
+    ) -> list[str]:
+        """Find resources whose policy directly grants a permission to a user."""
+        return await self._run(
+            self.repository.find_resources_granting, user_id, permission
+        )
+
+    async def get_principal_grants(
+        self,
+        principal_id: str,
+        principal_kind: str = "user",
+        permission: Permission | str | None = None,
+    ) -> list[PolicyGrant]:
+        """Get the resources whose policies name a principal."""
+        return await self._run(
+            self.repository.get_principal_grants,
+            principal_id,
+            principal_kind,
+            permission,
+        )
+
+    async def get_user_policies(
+        self, user_ids: list[str]
+    ) -> dict[str, UserPolicyDocument]:
+        """Get user policy documents for many users."""
+        return await self._run(self.repository.get_user_policies, user_ids)
+
+    async def get_user_policy(self, user_id: str) -> UserPolicyDocument | None:
+        """Get user policy document."""
+        return await self._run(self.repository.get_user_policy, user_id)
+
+    async def save_user_policy(
+        self, user_id: str, policy_doc: UserPolicyDocument
+    ) -> int:
+        """Save or update user policy document."""
+        return await self._run(self.repository.save_user_policy, user_id, policy_doc)
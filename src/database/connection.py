@@ -1,11 +1,27 @@
 """Database connection management.
 
 This module handles database connections for both SQLite (local) and PostgreSQL (production).
+Queries are written once with SQLite's "?" placeholders; PostgreSQL cursors
+translate them to psycopg2's "%s" style.
+Connections are drawn from a bounded pool and checked out per task: a
+connection() block holds one connection, bound to the current thread so that
+nested calls share it, and returns it to the pool when the block exits.
 """
 
 import os
 import sqlite3
-from contextlib import contextmanager
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from contextlib import contextmanager, suppress
+from functools import lru_cache
+from typing import Any
+
+# Allowed values for the SQLite PRAGMAs applied at connect time
+SQLITE_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SQLITE_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+SQLITE_TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
 
 
 class DatabaseConfig:
@@ -20,6 +36,17 @@ class DatabaseConfig:
         postgres_user: str | None = None,
         postgres_password: str | None = None,
         postgres_database: str | None = None,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+        pool_timeout: float = 30.0,
+        pool_health_check: bool = True,
+        sqlite_journal_mode: str = "WAL",
+        sqlite_synchronous: str = "NORMAL",
+        sqlite_cache_size: int = -8000,
+        sqlite_mmap_size: int = 268435456,
+        sqlite_temp_store: str = "MEMORY",
+        sqlite_busy_timeout_ms: int = 5000,
+        sqlite_cached_statements: int = 256,
     ):
         self.db_type = db_type
         self.sqlite_path = sqlite_path
@@ -28,6 +55,24 @@ class DatabaseConfig:
         self.postgres_user = postgres_user
         self.postgres_password = postgres_password
         self.postgres_database = postgres_database
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_timeout = pool_timeout
+        self.pool_health_check = pool_health_check
+        self.sqlite_journal_mode = sqlite_journal_mode.upper()
+        self.sqlite_synchronous = sqlite_synchronous.upper()
+        self.sqlite_cache_size = sqlite_cache_size
+        self.sqlite_mmap_size = sqlite_mmap_size
+        self.sqlite_temp_store = sqlite_temp_store.upper()
+        self.sqlite_busy_timeout_ms = sqlite_busy_timeout_ms
+        self.sqlite_cached_statements = sqlite_cached_statements
+
+        if self.sqlite_journal_mode not in SQLITE_JOURNAL_MODES:
+            raise ValueError(f"Invalid SQLite journal mode: {sqlite_journal_mode}")
+        if self.sqlite_synchronous not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid SQLite synchronous mode: {sqlite_synchronous}")
+        if self.sqlite_temp_store not in SQLITE_TEMP_STORES:
+            raise ValueError(f"Invalid SQLite temp store: {sqlite_temp_store}")
 
     @classmethod
     def from_env(cls) -> "DatabaseConfig":
@@ -41,13 +86,43 @@ class DatabaseConfig:
             POSTGRES_USER: PostgreSQL username
             POSTGRES_PASSWORD: PostgreSQL password
             POSTGRES_DATABASE: PostgreSQL database name
+            DB_POOL_MIN_SIZE: Connections opened up front (default: 1)
+            DB_POOL_MAX_SIZE: Maximum open connections (default: 10)
+            DB_POOL_TIMEOUT: Seconds to wait for a free connection (default: 30)
+            DB_POOL_HEALTH_CHECK: Ping connections on checkout (default: true)
+            SQLITE_JOURNAL_MODE: journal_mode PRAGMA (default: WAL)
+            SQLITE_SYNCHRONOUS: synchronous PRAGMA (default: NORMAL)
+            SQLITE_CACHE_SIZE: cache_size PRAGMA per pooled connection, negative
+                means KiB (default: -8000)
+            SQLITE_MMAP_SIZE: mmap_size PRAGMA in bytes (default: 268435456)
+            SQLITE_TEMP_STORE: temp_store PRAGMA (default: MEMORY)
+            SQLITE_BUSY_TIMEOUT_MS: Wait for locks this long (default: 5000)
+            SQLITE_CACHED_STATEMENTS: Prepared statements cached per connection
+                (default: 256)
         """
         db_type = os.getenv("DB_TYPE", "sqlite")
+        pool_settings = {
+            "pool_min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            "pool_max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            "pool_health_check": os.getenv("DB_POOL_HEALTH_CHECK", "true").lower()
+            in ("1", "true", "yes"),
+        }
 
         if db_type == "sqlite":
             return cls(
                 db_type="sqlite",
                 sqlite_path=os.getenv("SQLITE_PATH", "data/permissions.db"),
+                sqlite_journal_mode=os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+                sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+                sqlite_cache_size=int(os.getenv("SQLITE_CACHE_SIZE", "-8000")),
+                sqlite_mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", "268435456")),
+                sqlite_temp_store=os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+                sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+                sqlite_cached_statements=int(
+                    os.getenv("SQLITE_CACHED_STATEMENTS", "256")
+                ),
+                **pool_settings,
             )
         else:
             return cls(
@@ -57,22 +132,273 @@ class DatabaseConfig:
                 postgres_user=os.getenv("POSTGRES_USER"),
                 postgres_password=os.getenv("POSTGRES_PASSWORD"),
                 postgres_database=os.getenv("POSTGRES_DATABASE"),
+                **pool_settings,
             )
 
 
+@lru_cache(maxsize=1024)
+def translate_placeholders(query: str) -> str:
+    """Translate "?" placeholders to psycopg2's "%s" style.
+
+    Every "?" outside string literals and quoted identifiers becomes "%s".
+    Literal "%" characters are doubled, since psycopg2 treats "%" as a format
+    character anywhere in a query that has parameters. PostgreSQL's JSONB
+    "?" operator therefore cannot be used in repository queries.
+
+    Args:
+        query: SQL with "?" placeholders
+
+    Returns:
+        The same SQL with "%s" placeholders
+    """
+    parts = []
+    quote = None
+    for char in query:
+        if char == "%":
+            parts.append("%%")
+            continue
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "?":
+            parts.append("%s")
+            continue
+        parts.append(char)
+    return "".join(parts)
+
+
+_qmark_cursor_class: type | None = None
+
+
+def _postgresql_cursor_class() -> type:
+    """Get the psycopg2 cursor class accepting "?" placeholders.
+
+    Rows are returned as dicts (RealDictCursor), so they are addressed by
+    column name like sqlite3.Row.
+    """
+    global _qmark_cursor_class
+
+    if _qmark_cursor_class is None:
+        from psycopg2.extras import RealDictCursor
+
+        class QmarkCursor(RealDictCursor):
+            def execute(self, query, vars=None):
+                if vars is not None:
+                    query = translate_placeholders(query)
+                return super().execute(query, vars)
+
+            def executemany(self, query, vars_list):
+                return super().executemany(translate_placeholders(query), vars_list)
+
+        _qmark_cursor_class = QmarkCursor
+
+    return _qmark_cursor_class
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Bounded pool of database connections.
+
+    Connections are created lazily up to max_size and optionally pinged on
+    checkout; broken connections are discarded and replaced.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        health_check: bool = True,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size >= 1")
+
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self._idle: list[Any] = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        for _ in range(min_size):
+            self._idle.append(factory())
+            self._size += 1
+
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle and checked out)."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of connections waiting in the pool."""
+        return len(self._idle)
+
+    def acquire(self) -> Any:
+        """Check out a connection, waiting up to the pool timeout.
+
+        Returns:
+            An open, healthy connection
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+            RuntimeError: If the pool is closed
+        """
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            create = False
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No database connection available within {self.timeout}s"
+                        )
+                    self._condition.wait(remaining)
+
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    return self._factory()
+                except Exception:
+                    self._discard()
+                    raise
+
+            if not self.health_check or self._is_healthy(conn):
+                return conn
+
+            self._close_quietly(conn)
+            self._discard()
+
+    def release(self, conn: Any) -> None:
+        """Return a connection to the pool.
+
+        Any open transaction is rolled back so the next user starts clean.
+
+        Args:
+            conn: Connection previously returned by acquire()
+        """
+        try:
+            conn.rollback()
+        except Exception:
+            self._close_quietly(conn)
+            self._discard()
+            return
+
+        with self._condition:
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed on release."""
+        with self._condition:
+            self._closed = True
+            for conn in self._idle:
+                self._close_quietly(conn)
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    def _discard(self) -> None:
+        """Forget a connection slot so a new connection can be created."""
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _is_healthy(conn: Any) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        with suppress(Exception):
+            conn.close()
+
+
 class DatabaseConnection:
-    """Database connection manager."""
+    """Database connection manager.
+
+    Connections are checked out of the pool per task with connection() and
+    returned when the task is done. In-memory SQLite databases exist only
+    within a single connection, so they use one shared connection instead of
+    a pool.
+    """
 
     def __init__(self, config: DatabaseConfig):
         self.config = config
-        self._connection = None
+        self._connection = None  # Shared connection (in-memory SQLite only)
+        self._pool: ConnectionPool | None = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """The connection pool, or None when using a shared connection."""
+        return self._pool
+
+    def _is_memory_database(self) -> bool:
+        return self.config.db_type == "sqlite" and self.config.sqlite_path == ":memory:"
+
+    @property
+    def max_connections(self) -> int:
+        """Number of connections that can be in use at once.
+
+        Derived from the configuration, so it is known before connect().
+        """
+        return 1 if self._is_memory_database() else self.config.pool_max_size
 
     def connect(self):
         """Establish database connection."""
-        if self.config.db_type == "sqlite":
-            self._connect_sqlite()
-        else:
-            self._connect_postgresql()
+        with self._lock:
+            if self._is_memory_database():
+                self._connection = self._connect_sqlite()
+                return
+
+            if self._pool is not None:
+                self._pool.close()
+
+            factory = (
+                self._connect_sqlite
+                if self.config.db_type == "sqlite"
+                else self._connect_postgresql
+            )
+            self._pool = ConnectionPool(
+                factory,
+                min_size=self.config.pool_min_size,
+                max_size=self.config.pool_max_size,
+                timeout=self.config.pool_timeout,
+                health_check=self.config.pool_health_check,
+            )
 
     def _connect_sqlite(self):
         """Connect to SQLite database."""
@@ -81,32 +407,48 @@ class DatabaseConnection:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir, exist_ok=True)
 
-        # For in-memory databases (testing), allow cross-thread usage
-        check_same_thread = self.config.sqlite_path != ":memory:"
-
-        self._connection = sqlite3.connect(
-            self.config.sqlite_path, check_same_thread=check_same_thread
+        # Pooled connections move between threads (one at a time), and the
+        # shared in-memory connection is used by all threads
+        config = self.config
+        connection = sqlite3.connect(
+            config.sqlite_path,
+            check_same_thread=False,
+            timeout=config.sqlite_busy_timeout_ms / 1000,
+            cached_statements=config.sqlite_cached_statements,
         )
-        self._connection.row_factory = sqlite3.Row  # Enable column access by name
+        connection.row_factory = sqlite3.Row  # Enable column access by name
+
+        # Performance profile: WAL lets readers proceed while a policy save
+        # is writing; synchronous=NORMAL is durable across crashes in WAL mode
+        # (only the last commits can be lost on power failure). Values are
+        # validated by DatabaseConfig, so they are safe to interpolate.
+        connection.execute(f"PRAGMA journal_mode = {config.sqlite_journal_mode}")
+        connection.execute(f"PRAGMA synchronous = {config.sqlite_synchronous}")
+        connection.execute(f"PRAGMA cache_size = {int(config.sqlite_cache_size)}")
+        connection.execute(f"PRAGMA mmap_size = {int(config.sqlite_mmap_size)}")
+        connection.execute(f"PRAGMA temp_store = {config.sqlite_temp_store}")
+        connection.execute(
+            f"PRAGMA busy_timeout = {int(config.sqlite_busy_timeout_ms)}"
+        )
+        return connection
 
     def _connect_postgresql(self):
         """Connect to PostgreSQL database."""
         try:
             import psycopg2
-            from psycopg2.extras import RealDictCursor
         except ImportError:
             raise ImportError(
                 "psycopg2 is required for PostgreSQL connections. "
                 "Install it with: pip install psycopg2-binary"
             )
 
-        self._connection = psycopg2.connect(
+        return psycopg2.connect(
             host=self.config.postgres_host,
             port=self.config.postgres_port,
             user=self.config.postgres_user,
             password=self.config.postgres_password,
             database=self.config.postgres_database,
-            cursor_factory=RealDictCursor,
+            cursor_factory=_postgresql_cursor_class(),
         )
 
     def close(self):
@@ -115,21 +457,116 @@ class DatabaseConnection:
             self._connection.close()
             self._connection = None
 
+        if self._pool is not None:
+            self.release()
+            self._pool.close()
+            self._pool = None
+
     def get_connection(self):
-        """Get the database connection."""
-        if self._connection is None:
+        """Get the connection in use by the current thread.
+
+        Inside a connection() or transaction() block this is the connection
+        the block checked out. Outside of one, a connection is checked out and
+        kept by the thread until release() or the thread exits; this is meant
+        for scripts and tests, so the connection is health checked on every
+        call and replaced if it broke.
+        """
+        if self._connection is None and self._pool is None:
             self.connect()
-        return self._connection
+
+        if self._connection is not None:
+            return self._connection
+
+        pool = self._pool
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            if getattr(self._local, "scoped", False) or not pool.health_check:
+                return conn
+            if pool._is_healthy(conn):
+                return conn
+            self.release()
+
+        conn = pool.acquire()
+        self._local.connection = conn
+        self._local.scoped = False
+        # Return the connection to the pool when the thread goes away
+        self._local.finalizer = weakref.finalize(
+            threading.current_thread(), pool.release, conn
+        )
+        return conn
+
+    def release(self):
+        """Return the connection kept by the current thread to the pool.
+
+        Connections checked out by an open connection() block are left alone;
+        the block returns them when it exits.
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is None or getattr(self._local, "scoped", False):
+            return
+
+        self._local.connection = None
+        self._local.finalizer.detach()
+        if self._pool is not None:
+            self._pool.release(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a task.
+
+        The connection is bound to the current thread until the block exits,
+        so get_connection() and nested connection() or transaction() blocks
+        on the thread reuse it instead of checking out another one. Every
+        checkout goes through the pool's health check, and the connection is
+        returned (rolled back) when the outermost block exits. Do not hold a
+        block open across awaits or generator yields: the thread may run
+        other tasks in the meantime.
+
+        Usage:
+            with db.connection() as conn:
+                cursor = conn.cursor()
+                ...
+        """
+        if self._connection is None and self._pool is None:
+            self.connect()
+
+        if self._connection is not None:
+            yield self._connection
+            return
+
+        if getattr(self._local, "connection", None) is not None:
+            # Nested block, or a connection kept by get_connection()
+            yield self.get_connection()
+            return
+
+        pool = self._pool
+        conn = pool.acquire()
+        self._local.connection = conn
+        self._local.scoped = True
+        try:
+            yield conn
+        finally:
+            self._local.connection = None
+            self._local.scoped = False
+            pool.release(conn)
 
     def commit(self):
         """Commit current transaction."""
-        if self._connection:
-            self._connection.commit()
+        conn = self._current_connection()
+        if conn:
+            conn.commit()
 
     def rollback(self):
         """Rollback current transaction."""
-        if self._connection:
-            self._connection.rollback()
+        conn = self._current_connection()
+        if conn:
+            conn.rollback()
+
+    def _current_connection(self):
+        """Get the connection in use by this thread without checking one out."""
+        if self._connection is not None:
+            return self._connection
+        return getattr(self._local, "connection", None)
 
     @contextmanager
     def transaction(self):
@@ -141,12 +578,13 @@ class DatabaseConnection:
                 ...
             # Auto-commits on success, rolls back on exception
         """
-        try:
-            yield self.get_connection()
-            self.commit()
-        except Exception:
-            self.rollback()
-            raise
+        with self.connection() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
     def is_connected(self) -> bool:
         """Check if database is connected.
@@ -155,10 +593,10 @@ class DatabaseConnection:
             bool: True if connected and operational, False otherwise
         """
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
             return True
         except Exception:
             return False
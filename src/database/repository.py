@@ -1,12 +1,22 @@
 """Data repository for accessing database entities.
 
 This module provides data access methods for all entities in the system.
+
+Queries use "?" placeholders on both backends (PostgreSQL cursors translate
+them, see src.database.connection). Rows are addressed by column name, which
+both sqlite3.Row and psycopg2's RealDictRow support. Entities are built with their regular constructors:
+for these flat models pydantic-core validation is as fast as skipping it
+(``model_construct()`` is slower), see scripts/benchmark_entity_construction.py.
 """
 
+import hashlib
 import json
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
 
 from src.database.connection import DatabaseConnection
+from src.models.common import Effect, FilterOperator, Permission, permission_mask
 from src.models.entities import (
     Document,
     Project,
@@ -15,13 +25,285 @@ from src.models.entities import (
     TeamMembership,
     User,
 )
-from src.models.policies import ResourcePolicyDocument, UserPolicyDocument
+from src.models.policies import (
+    ResourcePolicyDocument,
+    StoredPolicyDocument,
+    UserPolicyDocument,
+)
+from src.models.urn import parse_urn
+
+
+class EvaluationContext:
+    """Everything needed to evaluate a permission check, loaded in one query."""
+
+    def __init__(
+        self,
+        user: User | None,
+        document: Document | None,
+        resource_policy: StoredPolicyDocument | None = None,
+        user_policy: StoredPolicyDocument | None = None,
+        team: Team | None = None,
+        project: Project | None = None,
+        team_membership: TeamMembership | None = None,
+        project_membership: ProjectMembership | None = None,
+        resource_policy_version: int | None = None,
+        user_policy_version: int | None = None,
+    ):
+        self.user = user
+        self.document = document
+        self.resource_policy = resource_policy
+        self.user_policy = user_policy
+        self.team = team
+        self.project = project
+        self.team_membership = team_membership
+        self.project_membership = project_membership
+        self.resource_policy_version = resource_policy_version
+        self.user_policy_version = user_policy_version
+
+
+# Every input of a permission check, anchored on a single row of lookup keys
+# so that missing entities come back as NULL columns instead of missing rows.
+_EVALUATION_CONTEXT_QUERY = """
+    SELECT
+        u.id AS user_id, u.email AS user_email, u.name AS user_name,
+        d.id AS document_id, d.title AS document_title,
+        d.project_id AS document_project_id, d.creator_id AS document_creator_id,
+        d.deleted_at AS document_deleted_at,
+        d.public_link_enabled AS document_public_link_enabled,
+        t.id AS team_id, t.name AS team_name, t.plan AS team_plan,
+        p.id AS project_id, p.name AS project_name, p.team_id AS project_team_id,
+        p.visibility AS project_visibility,
+        tm.role AS team_role,
+        pm.role AS project_role,
+        rp.policy_document AS resource_policy_document,
+        rp.version AS resource_policy_version,
+        up.policy_document AS user_policy_document,
+        up.version AS user_policy_version
+    FROM (
+        SELECT
+            CAST(? AS VARCHAR(255)) AS user_id,
+            CAST(? AS VARCHAR(255)) AS document_id,
+            CAST(? AS VARCHAR(255)) AS team_id,
+            CAST(? AS VARCHAR(255)) AS project_id,
+            CAST(? AS VARCHAR(500)) AS resource_id
+    ) AS k
+    LEFT JOIN users u ON u.id = k.user_id
+    LEFT JOIN documents d ON d.id = k.document_id
+    LEFT JOIN teams t ON t.id = k.team_id
+    LEFT JOIN projects p ON p.id = k.project_id
+    LEFT JOIN team_memberships tm ON tm.user_id = k.user_id AND tm.team_id = t.id
+    LEFT JOIN project_memberships pm
+        ON pm.user_id = k.user_id AND pm.project_id = p.id
+    LEFT JOIN resource_policies rp ON rp.resource_id = k.resource_id
+    LEFT JOIN user_policies up ON up.user_id = k.user_id
+"""
+
+
+class PolicyExportRow(NamedTuple):
+    """A stored resource policy document as streamed by export."""
+
+    resource_id: str
+    policy_document: str  # JSON text
+    version: int
+    updated_at: datetime | None
+
+
+class PolicyGrant(NamedTuple):
+    """Permissions a resource policy document grants or denies a principal."""
+
+    resource_id: str
+    principal_kind: str  # "user", "team" or "project"
+    principal_id: str
+    permission_mask: int  # See models.common.PERMISSION_BITS
+    effect: str  # "allow" or "deny"
+
+
+# Insert a policy document or replace the stored one, bumping its version, in
+# a single statement (SQLite >= 3.35 and PostgreSQL). The target table is
+# named explicitly in SET so "version" refers to the stored row.
+_UPSERT_RESOURCE_POLICY_ROW = """
+    INSERT INTO resource_policies (resource_id, policy_document, created_at, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT (resource_id) DO UPDATE
+    SET policy_document = excluded.policy_document,
+        version = resource_policies.version + 1,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_UPSERT_RESOURCE_POLICY = _UPSERT_RESOURCE_POLICY_ROW + "    RETURNING version\n"
+
+_UPSERT_USER_POLICY = """
+    INSERT INTO user_policies (user_id, policy_document, created_at, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id) DO UPDATE
+    SET policy_document = excluded.policy_document,
+        version = user_policies.version + 1,
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING version
+"""
+
+
+# Resources with an allow policy for a permission whose filter names a user
+# (user.id == <id>), the shape Builder writes for a direct grant. PostgreSQL
+# answers it with JSONB containment, served by the GIN index on
+# policy_document; SQLite unnests the documents with json_each.
+_RESOURCES_GRANTING_QUERY_POSTGRESQL = """
+    SELECT resource_id FROM resource_policies
+    WHERE policy_document @> CAST(? AS JSONB)
+    ORDER BY resource_id
+"""
+
+_RESOURCES_GRANTING_QUERY_SQLITE = """
+    SELECT DISTINCT rp.resource_id
+    FROM resource_policies rp,
+        json_each(rp.policy_document, '$.policies') AS policy,
+        json_each(policy.value, '$.permissions') AS permission,
+        json_each(policy.value, '$.filter') AS condition
+    WHERE json_extract(policy.value, '$.effect') = 'allow'
+        AND permission.value = ?
+        AND json_extract(condition.value, '$.prop') = 'user.id'
+        AND json_extract(condition.value, '$.op') = '=='
+        AND json_extract(condition.value, '$.value') = ?
+    ORDER BY rp.resource_id
+"""
+
+
+# -------------------------------------------------------------------------
+# Policy grants (reverse index from principals to resources)
+# -------------------------------------------------------------------------
+
+_INSERT_POLICY_GRANT = """
+    INSERT INTO policy_grants
+        (resource_id, principal_kind, principal_id, permission_mask, effect)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Documents parsed per round trip while rebuilding policy_grants
+_REBUILD_BATCH_SIZE = 500
+
+# Filter properties that identify a principal, by principal kind
+_PRINCIPAL_PROPS = {"user.id": "user", "team.id": "team", "project.id": "project"}
+
+# Roots of evaluation context paths; a string value starting with one of them
+# is a property reference (e.g. "document.creatorId"), not a principal ID
+_CONTEXT_ROOTS = frozenset(
+    {"user", "document", "team", "project", "teamMembership", "projectMembership"}
+)
+
+
+def _extract_grants(
+    resource_id: str, policy_doc: ResourcePolicyDocument
+) -> list[PolicyGrant]:
+    """Collect the principals named by a resource policy document.
+
+    A policy names a principal through a ``user.id``, ``team.id`` or
+    ``project.id`` condition comparing it with a literal (``==``) or a literal
+    list (``in``). Permissions of every policy naming the same principal with
+    the same effect are combined into one mask. Other conditions of the policy
+    are not taken into account, so a grant marks a resource as relevant to the
+    principal rather than deciding access.
+    """
+    masks: dict[tuple[str, str, str], int] = {}
+
+    for policy in policy_doc.policies:
+        mask = permission_mask(policy.permissions)
+        effect = Effect(policy.effect).value
+        for condition in policy.filter or ():
+            kind = _PRINCIPAL_PROPS.get(condition.prop)
+            if kind is None:
+                continue
+
+            op = FilterOperator(condition.op)
+            if op == FilterOperator.EQ:
+                principal_ids = [condition.value]
+            elif op == FilterOperator.IN and isinstance(condition.value, list):
+                principal_ids = condition.value
+            else:
+                continue
+
+            for principal_id in principal_ids:
+                if not isinstance(principal_id, str) or (
+                    "." in principal_id
+                    and principal_id.split(".", 1)[0] in _CONTEXT_ROOTS
+                ):
+                    continue
+                key = (kind, principal_id, effect)
+                masks[key] = masks.get(key, 0) | mask
+
+    return [
+        PolicyGrant(resource_id, kind, principal_id, mask, effect)
+        for (kind, principal_id, effect), mask in masks.items()
+    ]
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    """Parse a TIMESTAMP column (TEXT in SQLite, datetime in PostgreSQL)."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _parse_policy_data(value: Any) -> dict[str, Any]:
+    """Parse a policy document column (JSON TEXT or JSONB)."""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _policy_digest(value: Any) -> bytes:
+    """Digest the content of a policy document column (JSON TEXT or JSONB).
+
+    JSONB comes back from psycopg2 as a dict whose keys are in JSONB's own
+    canonical order, so equal documents serialize to equal text.
+    """
+    if not isinstance(value, str):
+        value = json.dumps(value, separators=(",", ":"))
+    return hashlib.blake2b(value.encode(), digest_size=16).digest()
+
+
+def _stored_policy(
+    model: type[ResourcePolicyDocument] | type[UserPolicyDocument],
+    table: str,
+    key: str,
+    document: Any,
+    version: int,
+) -> StoredPolicyDocument:
+    """Wrap a policy document column for evaluation without parsing it.
+
+    The version alone does not identify a document: one that is deleted and
+    saved again (or restored from a dump) restarts at version 1, so the key
+    also holds a digest of the content.
+    """
+    return StoredPolicyDocument(
+        model, (table, key, version, _policy_digest(document)), document
+    )
+
+
+# Maximum number of keys bound into one IN (...) clause
+_IN_CHUNK_SIZE = 500
+
+
+def _chunks(keys: list[Any]) -> list[list[Any]]:
+    """Deduplicate keys and split them into IN (...) sized chunks."""
+    unique = list(dict.fromkeys(keys))
+    return [
+        unique[start : start + _IN_CHUNK_SIZE]
+        for start in range(0, len(unique), _IN_CHUNK_SIZE)
+    ]
+
+
+def _placeholders(count: int) -> str:
+    """Build the parameter list of an IN (...) clause."""
+    return ", ".join("?" * count)
 
 
 class Repository:
     """Repository for data access operations."""
 
     def __init__(self, db: DatabaseConnection):
+        """Create a repository.
+
+        Args:
+            db: Database connection
+        """
         self.db = db
 
     # -------------------------------------------------------------------------
@@ -37,19 +319,18 @@ class Repository:
         Returns:
             User object or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT id, email, name FROM users WHERE id = ?", (user_id,))
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, email, name FROM users WHERE id = ?", (user_id,))
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         return User(
-            id=row["id"] if isinstance(row, dict) else row[0],
-            email=row["email"] if isinstance(row, dict) else row[1],
-            name=row["name"] if isinstance(row, dict) else row[2],
+            id=row["id"],
+            email=row["email"],
+            name=row["name"],
         )
 
     # -------------------------------------------------------------------------
@@ -65,19 +346,18 @@ class Repository:
         Returns:
             Team object or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT id, name, plan FROM teams WHERE id = ?", (team_id,))
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name, plan FROM teams WHERE id = ?", (team_id,))
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         return Team(
-            id=row["id"] if isinstance(row, dict) else row[0],
-            name=row["name"] if isinstance(row, dict) else row[1],
-            plan=row["plan"] if isinstance(row, dict) else row[2],
+            id=row["id"],
+            name=row["name"],
+            plan=row["plan"],
         )
 
     # -------------------------------------------------------------------------
@@ -93,23 +373,22 @@ class Repository:
         Returns:
             Project object or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT id, name, team_id, visibility FROM projects WHERE id = ?",
-            (project_id,),
-        )
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, name, team_id, visibility FROM projects WHERE id = ?",
+                (project_id,),
+            )
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         return Project(
-            id=row["id"] if isinstance(row, dict) else row[0],
-            name=row["name"] if isinstance(row, dict) else row[1],
-            teamId=row["team_id"] if isinstance(row, dict) else row[2],
-            visibility=row["visibility"] if isinstance(row, dict) else row[3],
+            id=row["id"],
+            name=row["name"],
+            teamId=row["team_id"],
+            visibility=row["visibility"],
         )
 
     # -------------------------------------------------------------------------
@@ -125,40 +404,30 @@ class Repository:
         Returns:
             Document object or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT id, title, project_id, creator_id, deleted_at, public_link_enabled
-            FROM documents
-            WHERE id = ?
-            """,
-            (document_id,),
-        )
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT id, title, project_id, creator_id, deleted_at, public_link_enabled
+                FROM documents
+                WHERE id = ?
+                """,
+                (document_id,),
+            )
+            row = cursor.fetchone()
 
         if not row:
             return None
 
-        deleted_at = None
-        deleted_at_raw = row["deleted_at"] if isinstance(row, dict) else row[4]
-        if deleted_at_raw:
-            deleted_at = (
-                datetime.fromisoformat(deleted_at_raw)
-                if isinstance(deleted_at_raw, str)
-                else deleted_at_raw
-            )
+        deleted_at = _parse_datetime(row["deleted_at"])
 
         return Document(
-            id=row["id"] if isinstance(row, dict) else row[0],
-            title=row["title"] if isinstance(row, dict) else row[1],
-            projectId=row["project_id"] if isinstance(row, dict) else row[2],
-            creatorId=row["creator_id"] if isinstance(row, dict) else row[3],
+            id=row["id"],
+            title=row["title"],
+            projectId=row["project_id"],
+            creatorId=row["creator_id"],
             deletedAt=deleted_at,
-            publicLinkEnabled=bool(
-                row["public_link_enabled"] if isinstance(row, dict) else row[5]
-            ),
+            publicLinkEnabled=bool(row["public_link_enabled"]),
         )
 
     # -------------------------------------------------------------------------
@@ -175,22 +444,21 @@ class Repository:
         Returns:
             TeamMembership object or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT user_id, team_id, role FROM team_memberships WHERE user_id = ? AND team_id = ?",
-            (user_id, team_id),
-        )
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT user_id, team_id, role FROM team_memberships WHERE user_id = ? AND team_id = ?",
+                (user_id, team_id),
+            )
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         return TeamMembership(
-            userId=row["user_id"] if isinstance(row, dict) else row[0],
-            teamId=row["team_id"] if isinstance(row, dict) else row[1],
-            role=row["role"] if isinstance(row, dict) else row[2],
+            userId=row["user_id"],
+            teamId=row["team_id"],
+            role=row["role"],
         )
 
     def get_project_membership(
@@ -205,23 +473,462 @@ class Repository:
         Returns:
             ProjectMembership object or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT user_id, project_id, role FROM project_memberships WHERE user_id = ? AND project_id = ?",
-            (user_id, project_id),
-        )
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT user_id, project_id, role FROM project_memberships WHERE user_id = ? AND project_id = ?",
+                (user_id, project_id),
+            )
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         return ProjectMembership(
-            userId=row["user_id"] if isinstance(row, dict) else row[0],
-            projectId=row["project_id"] if isinstance(row, dict) else row[1],
-            role=row["role"] if isinstance(row, dict) else row[2],
+            userId=row["user_id"],
+            projectId=row["project_id"],
+            role=row["role"],
+        )
+
+    # -------------------------------------------------------------------------
+    # Evaluation context
+    # -------------------------------------------------------------------------
+
+    def load_evaluation_context(
+        self, user_id: str, resource_urn: str
+    ) -> EvaluationContext:
+        """Load every input of a permission check in a single round trip.
+
+        Fetches the user, document, team, project, both memberships and both
+        policy documents with one joined query instead of one query each.
+        Entities that do not exist are returned as None; memberships are only
+        looked up for an existing team/project. Policy documents are returned
+        unparsed (StoredPolicyDocument); the evaluator compiles them or reuses
+        their cached compiled form.
+
+        Args:
+            user_id: User ID
+            resource_urn: Resource URN (urn:resource:{teamId}:{projectId}:{docId})
+
+        Returns:
+            EvaluationContext with the loaded entities and policy documents
+
+        Raises:
+            ValueError: If the resource URN is malformed
+        """
+        urn = parse_urn(resource_urn)
+        if urn is None:
+            raise ValueError(f"Invalid resource URN: {resource_urn}")
+        team_id, project_id, doc_id = urn
+
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                _EVALUATION_CONTEXT_QUERY,
+                (user_id, doc_id, team_id, project_id, resource_urn),
+            )
+            row = cursor.fetchone()
+
+        # Rows are addressed by column name (sqlite3.Row / RealDictRow)
+        user = (
+            User(id=row["user_id"], email=row["user_email"], name=row["user_name"])
+            if row["user_id"] is not None
+            else None
+        )
+        document = (
+            Document(
+                id=row["document_id"],
+                title=row["document_title"],
+                projectId=row["document_project_id"],
+                creatorId=row["document_creator_id"],
+                deletedAt=_parse_datetime(row["document_deleted_at"]),
+                publicLinkEnabled=bool(row["document_public_link_enabled"]),
+            )
+            if row["document_id"] is not None
+            else None
+        )
+        team = (
+            Team(id=row["team_id"], name=row["team_name"], plan=row["team_plan"])
+            if row["team_id"] is not None
+            else None
+        )
+        project = (
+            Project(
+                id=row["project_id"],
+                name=row["project_name"],
+                teamId=row["project_team_id"],
+                visibility=row["project_visibility"],
+            )
+            if row["project_id"] is not None
+            else None
+        )
+        team_membership = (
+            TeamMembership(userId=user_id, teamId=team_id, role=row["team_role"])
+            if row["team_role"] is not None
+            else None
+        )
+        project_membership = (
+            ProjectMembership(
+                userId=user_id, projectId=project_id, role=row["project_role"]
+            )
+            if row["project_role"] is not None
+            else None
+        )
+        resource_policy = (
+            _stored_policy(
+                ResourcePolicyDocument,
+                "resource_policies",
+                resource_urn,
+                row["resource_policy_document"],
+                row["resource_policy_version"],
+            )
+            if row["resource_policy_document"] is not None
+            else None
+        )
+        user_policy = (
+            _stored_policy(
+                UserPolicyDocument,
+                "user_policies",
+                user_id,
+                row["user_policy_document"],
+                row["user_policy_version"],
+            )
+            if row["user_policy_document"] is not None
+            else None
+        )
+
+        return EvaluationContext(
+            user=user,
+            document=document,
+            resource_policy=resource_policy,
+            user_policy=user_policy,
+            team=team,
+            project=project,
+            team_membership=team_membership,
+            project_membership=project_membership,
+            resource_policy_version=row["resource_policy_version"],
+            user_policy_version=row["user_policy_version"],
+        )
+
+    # -------------------------------------------------------------------------
+    # Batch operations
+    # -------------------------------------------------------------------------
+
+    def _fetch_in(self, query: str, keys: list[Any], *extra: list[Any]) -> list[Any]:
+        """Run a query with IN (...) clauses over deduplicated, chunked keys.
+
+        Args:
+            query: SQL with a {keys} placeholder for the chunked key list and
+                {extra0}, {extra1}, ... placeholders for additional key lists
+            keys: Keys bound into the {keys} clause, chunked
+            *extra: Additional key lists, bound in full with every chunk
+
+        Returns:
+            All fetched rows
+        """
+        extra_lists = [list(dict.fromkeys(values)) for values in extra]
+        if not keys or any(not values for values in extra_lists):
+            return []
+
+        extra_clauses = {
+            f"extra{i}": _placeholders(len(values))
+            for i, values in enumerate(extra_lists)
+        }
+        rows = []
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(keys):
+                params = list(chunk)
+                for values in extra_lists:
+                    params.extend(values)
+                cursor.execute(
+                    query.format(keys=_placeholders(len(chunk)), **extra_clauses),
+                    params,
+                )
+                rows.extend(cursor.fetchall())
+        return rows
+
+    def get_users(self, user_ids: list[str]) -> dict[str, User]:
+        """Get users by ID with set-based queries.
+
+        Args:
+            user_ids: User IDs (duplicates are fetched once)
+
+        Returns:
+            Mapping of user ID to User for the users that exist
+        """
+        rows = self._fetch_in(
+            "SELECT id, email, name FROM users WHERE id IN ({keys})", user_ids
+        )
+        return {
+            row["id"]: User(id=row["id"], email=row["email"], name=row["name"])
+            for row in rows
+        }
+
+    def get_teams(self, team_ids: list[str]) -> dict[str, Team]:
+        """Get teams by ID with set-based queries.
+
+        Args:
+            team_ids: Team IDs (duplicates are fetched once)
+
+        Returns:
+            Mapping of team ID to Team for the teams that exist
+        """
+        rows = self._fetch_in(
+            "SELECT id, name, plan FROM teams WHERE id IN ({keys})", team_ids
+        )
+        return {
+            row["id"]: Team(id=row["id"], name=row["name"], plan=row["plan"])
+            for row in rows
+        }
+
+    def get_projects(self, project_ids: list[str]) -> dict[str, Project]:
+        """Get projects by ID with set-based queries.
+
+        Args:
+            project_ids: Project IDs (duplicates are fetched once)
+
+        Returns:
+            Mapping of project ID to Project for the projects that exist
+        """
+        rows = self._fetch_in(
+            "SELECT id, name, team_id, visibility FROM projects WHERE id IN ({keys})",
+            project_ids,
+        )
+        return {
+            row["id"]: Project(
+                id=row["id"],
+                name=row["name"],
+                teamId=row["team_id"],
+                visibility=row["visibility"],
+            )
+            for row in rows
+        }
+
+    def get_documents(self, document_ids: list[str]) -> dict[str, Document]:
+        """Get documents by ID with set-based queries.
+
+        Args:
+            document_ids: Document IDs (duplicates are fetched once)
+
+        Returns:
+            Mapping of document ID to Document for the documents that exist
+        """
+        rows = self._fetch_in(
+            """
+            SELECT id, title, project_id, creator_id, deleted_at, public_link_enabled
+            FROM documents
+            WHERE id IN ({keys})
+            """,
+            document_ids,
+        )
+        return {
+            row["id"]: Document(
+                id=row["id"],
+                title=row["title"],
+                projectId=row["project_id"],
+                creatorId=row["creator_id"],
+                deletedAt=_parse_datetime(row["deleted_at"]),
+                publicLinkEnabled=bool(row["public_link_enabled"]),
+            )
+            for row in rows
+        }
+
+    def get_team_memberships(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], TeamMembership]:
+        """Get team memberships for (user ID, team ID) pairs.
+
+        Args:
+            pairs: (user ID, team ID) pairs
+
+        Returns:
+            Mapping of requested pair to TeamMembership for existing memberships
+        """
+        wanted = set(pairs)
+        rows = self._fetch_in(
+            """
+            SELECT user_id, team_id, role FROM team_memberships
+            WHERE user_id IN ({keys}) AND team_id IN ({extra0})
+            """,
+            [user_id for user_id, _ in pairs],
+            [team_id for _, team_id in pairs],
+        )
+        return {
+            (row["user_id"], row["team_id"]): TeamMembership(
+                userId=row["user_id"], teamId=row["team_id"], role=row["role"]
+            )
+            for row in rows
+            if (row["user_id"], row["team_id"]) in wanted
+        }
+
+    def get_project_memberships(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], ProjectMembership]:
+        """Get project memberships for (user ID, project ID) pairs.
+
+        Args:
+            pairs: (user ID, project ID) pairs
+
+        Returns:
+            Mapping of requested pair to ProjectMembership for existing memberships
+        """
+        wanted = set(pairs)
+        rows = self._fetch_in(
+            """
+            SELECT user_id, project_id, role FROM project_memberships
+            WHERE user_id IN ({keys}) AND project_id IN ({extra0})
+            """,
+            [user_id for user_id, _ in pairs],
+            [project_id for _, project_id in pairs],
+        )
+        return {
+            (row["user_id"], row["project_id"]): ProjectMembership(
+                userId=row["user_id"], projectId=row["project_id"], role=row["role"]
+            )
+            for row in rows
+            if (row["user_id"], row["project_id"]) in wanted
+        }
+
+    def _get_policy_rows(
+        self, table: str, key_column: str, keys: list[str]
+    ) -> dict[str, tuple[Any, int]]:
+        """Fetch raw policy documents and versions keyed by their owner."""
+        rows = self._fetch_in(
+            f"SELECT {key_column}, policy_document, version FROM {table} "
+            f"WHERE {key_column} IN ({{keys}})",
+            keys,
         )
+        return {
+            row[key_column]: (row["policy_document"], row["version"]) for row in rows
+        }
+
+    def get_resource_policies(
+        self, resource_ids: list[str]
+    ) -> dict[str, ResourcePolicyDocument]:
+        """Get resource policy documents for many resources.
+
+        Args:
+            resource_ids: Resource URNs (duplicates are fetched once)
+
+        Returns:
+            Mapping of resource URN to ResourcePolicyDocument for existing policies
+        """
+        rows = self._get_policy_rows("resource_policies", "resource_id", resource_ids)
+        return {
+            resource_id: ResourcePolicyDocument(**_parse_policy_data(document))
+            for resource_id, (document, _) in rows.items()
+        }
+
+    def get_user_policies(self, user_ids: list[str]) -> dict[str, UserPolicyDocument]:
+        """Get user policy documents for many users.
+
+        Args:
+            user_ids: User IDs (duplicates are fetched once)
+
+        Returns:
+            Mapping of user ID to UserPolicyDocument for existing policies
+        """
+        rows = self._get_policy_rows("user_policies", "user_id", user_ids)
+        return {
+            user_id: UserPolicyDocument(**_parse_policy_data(document))
+            for user_id, (document, _) in rows.items()
+        }
+
+    def load_evaluation_contexts(
+        self, checks: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], EvaluationContext]:
+        """Load the evaluation context of many permission checks at once.
+
+        Each entity type is fetched with set-based IN (...) queries over the
+        deduplicated keys of the whole batch, so the number of round trips
+        does not grow with the number of checks.
+
+        Args:
+            checks: (user ID, resource URN) pairs
+
+        Returns:
+            Mapping of each pair to its EvaluationContext
+
+        Raises:
+            ValueError: If a resource URN is malformed
+        """
+        components = {}
+        for _, resource_urn in checks:
+            if resource_urn in components:
+                continue
+            urn = parse_urn(resource_urn)
+            if urn is None:
+                raise ValueError(f"Invalid resource URN: {resource_urn}")
+            components[resource_urn] = urn
+
+        user_ids = [user_id for user_id, _ in checks]
+        urns = list(components)
+        team_ids = [team_id for team_id, _, _ in components.values()]
+        project_ids = [project_id for _, project_id, _ in components.values()]
+
+        # One checkout shared by every query of the batch
+        with self.db.connection():
+            users = self.get_users(user_ids)
+            documents = self.get_documents(
+                [doc_id for _, _, doc_id in components.values()]
+            )
+            teams = self.get_teams(team_ids)
+            projects = self.get_projects(project_ids)
+            resource_policies = self._get_policy_rows(
+                "resource_policies", "resource_id", urns
+            )
+            user_policies = self._get_policy_rows("user_policies", "user_id", user_ids)
+            team_memberships = self.get_team_memberships(
+                [(user_id, components[urn][0]) for user_id, urn in checks]
+            )
+            project_memberships = self.get_project_memberships(
+                [(user_id, components[urn][1]) for user_id, urn in checks]
+            )
+
+        # Checks sharing a policy document share its stored form
+        stored_resource_policies = {
+            urn: _stored_policy(
+                ResourcePolicyDocument, "resource_policies", urn, document, version
+            )
+            for urn, (document, version) in resource_policies.items()
+        }
+        stored_user_policies = {
+            user_id: _stored_policy(
+                UserPolicyDocument, "user_policies", user_id, document, version
+            )
+            for user_id, (document, version) in user_policies.items()
+        }
+
+        contexts = {}
+        for user_id, urn in checks:
+            team_id, project_id, doc_id = components[urn]
+            resource_policy = stored_resource_policies.get(urn)
+            user_policy = stored_user_policies.get(user_id)
+            team = teams.get(team_id)
+            project = projects.get(project_id)
+            contexts[(user_id, urn)] = EvaluationContext(
+                user=users.get(user_id),
+                document=documents.get(doc_id),
+                resource_policy=resource_policy,
+                user_policy=user_policy,
+                team=team,
+                project=project,
+                team_membership=(
+                    team_memberships.get((user_id, team_id)) if team else None
+                ),
+                project_membership=(
+                    project_memberships.get((user_id, project_id)) if project else None
+                ),
+                resource_policy_version=(
+                    resource_policies[urn][1] if resource_policy else None
+                ),
+                user_policy_version=(
+                    user_policies[user_id][1] if user_policy else None
+                ),
+            )
+
+        return contexts
 
     # -------------------------------------------------------------------------
     # Policy operations
@@ -236,72 +943,321 @@ class Repository:
         Returns:
             ResourcePolicyDocument or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT resource_id, policy_document FROM resource_policies WHERE resource_id = ?",
-            (resource_id,),
-        )
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT resource_id, policy_document, version FROM resource_policies WHERE resource_id = ?",
+                (resource_id,),
+            )
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         # Parse policy document (stored as JSON TEXT or JSONB)
-        policy_json = row["policy_document"] if isinstance(row, dict) else row[1]
-
-        if isinstance(policy_json, str):
-            policy_data = json.loads(policy_json)
-        else:
-            policy_data = policy_json
-
-        return ResourcePolicyDocument(**policy_data)
+        return ResourcePolicyDocument(**_parse_policy_data(row["policy_document"]))
 
-    def save_resource_policy(self, policy_doc: ResourcePolicyDocument) -> bool:
+    def save_resource_policy(self, policy_doc: ResourcePolicyDocument) -> int:
         """Save or update resource policy document.
 
+        The document is inserted or replaced with a single UPSERT statement,
+        which also bumps the stored version on update. Its policy grants are
+        replaced in the same transaction.
+
         Args:
             policy_doc: ResourcePolicyDocument to save
 
         Returns:
-            bool: True if successful
+            int: Version of the stored document (1 for a new document)
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        # Serialize policy document to JSON
+        # Serialize policy document to JSON and discard its compiled form
+        # in case the caller modified the policies list in place
+        resource_id = policy_doc.resource.resourceId
         policy_json = policy_doc.model_dump_json()
+        policy_doc.invalidate_compiled()
 
-        # Check if policy exists
-        cursor.execute(
-            "SELECT resource_id FROM resource_policies WHERE resource_id = ?",
-            (policy_doc.resource.resourceId,),
-        )
-        exists = cursor.fetchone() is not None
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_UPSERT_RESOURCE_POLICY, (resource_id, policy_json))
+            version = cursor.fetchone()["version"]
+            self._replace_grants(cursor, {resource_id: policy_doc})
 
-        if exists:
-            # Update existing policy
-            cursor.execute(
-                """
-                UPDATE resource_policies
-                SET policy_document = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE resource_id = ?
-                """,
-                (policy_json, policy_doc.resource.resourceId),
+        return version
+
+    def save_resource_policies_bulk(
+        self, policy_docs: list[ResourcePolicyDocument]
+    ) -> dict[str, int]:
+        """Save or update many resource policy documents in one transaction.
+
+        All documents are written with a single executemany() of the UPSERT
+        statement and committed together with their policy grants; if any
+        write fails, none are kept.
+        A resource listed more than once is saved once per occurrence, so the
+        last document wins.
+
+        Args:
+            policy_docs: ResourcePolicyDocuments to save
+
+        Returns:
+            Mapping of resource URN to the version of its stored document
+        """
+        if not policy_docs:
+            return {}
+
+        # Serialize policy documents to JSON and discard their compiled form
+        # in case the caller modified the policies lists in place
+        params = []
+        for policy_doc in policy_docs:
+            params.append(
+                (policy_doc.resource.resourceId, policy_doc.model_dump_json())
+            )
+            policy_doc.invalidate_compiled()
+
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            # RETURNING is not available with executemany(), so the new
+            # versions are read back within the same transaction
+            cursor.executemany(_UPSERT_RESOURCE_POLICY_ROW, params)
+            self._replace_grants(
+                cursor, {doc.resource.resourceId: doc for doc in policy_docs}
             )
+            rows = self._fetch_in(
+                "SELECT resource_id, version FROM resource_policies "
+                "WHERE resource_id IN ({keys})",
+                [resource_id for resource_id, _ in params],
+            )
+
+        return {row["resource_id"]: row["version"] for row in rows}
+
+    def iter_resource_policies(
+        self,
+        resource_prefix: str | None = None,
+        updated_since: datetime | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[PolicyExportRow]:
+        """Stream stored resource policy documents.
+
+        Rows are read batch_size at a time with keyset pagination over
+        (updated_at, resource_id), served by the index on those columns. Each
+        batch is a separate query with its own connection checkout, so no
+        connection or cursor is held between batches and memory stays bounded
+        regardless of the number of policies. A document saved while the
+        export runs moves to the end of the order and is returned again with
+        its new version.
+
+        Args:
+            resource_prefix: Only include resource URNs starting with this
+                prefix (e.g. "urn:resource:team1:")
+            updated_since: Only include documents updated at or after this
+                time (naive datetimes are taken as UTC)
+            batch_size: Rows fetched per query
+
+        Yields:
+            PolicyExportRow, ordered by updated_at then resource URN, with the
+            document re-serialized as compact single-line JSON
+        """
+        conditions = []
+        params: list[Any] = []
+        if resource_prefix:
+            conditions.append("substr(resource_id, 1, ?) = ?")
+            params.extend([len(resource_prefix), resource_prefix])
+        if updated_since is not None:
+            if updated_since.tzinfo is not None:
+                updated_since = updated_since.astimezone(UTC).replace(tzinfo=None)
+            # CURRENT_TIMESTAMP is stored as "YYYY-MM-DD HH:MM:SS" (UTC)
+            conditions.append("updated_at >= ?")
+            params.append(updated_since.isoformat(sep=" "))
+
+        after: tuple[Any, str] | None = None
+        while True:
+            page_conditions = list(conditions)
+            page_params = list(params)
+            if after is not None:
+                page_conditions.append("(updated_at, resource_id) > (?, ?)")
+                page_params.extend(after)
+            where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+            page_params.append(batch_size)
+
+            # The block is closed before yielding: a connection must not be
+            # held across the caller's awaits
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT resource_id, policy_document, version, updated_at "
+                    f"FROM resource_policies {where} "
+                    "ORDER BY updated_at, resource_id LIMIT ?",
+                    page_params,
+                )
+                rows = cursor.fetchall()
+            if not rows:
+                return
+
+            for row in rows:
+                yield PolicyExportRow(
+                    resource_id=row["resource_id"],
+                    policy_document=json.dumps(
+                        _parse_policy_data(row["policy_document"]),
+                        separators=(",", ":"),
+                    ),
+                    version=row["version"],
+                    updated_at=_parse_datetime(row["updated_at"]),
+                )
+
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1]["updated_at"], rows[-1]["resource_id"])
+
+    def find_resources_granting(
+        self, user_id: str, permission: Permission | str
+    ) -> list[str]:
+        """Find resources whose policy directly grants a permission to a user.
+
+        Matches resource policy documents containing an allow policy that
+        covers the permission and has a ``user.id == <user_id>`` filter
+        condition, the form Builder produces for a grant. Other conditions
+        of that policy and deny policies are not evaluated, so the result is
+        the set of candidate resources, not a permission decision.
+
+        Args:
+            user_id: User ID named in the grant
+            permission: Permission granted
+
+        Returns:
+            Resource URNs, sorted
+        """
+        permission = Permission(permission).value
+
+        if self.db.config.db_type == "postgresql":
+            pattern = {
+                "policies": [
+                    {
+                        "effect": Effect.ALLOW.value,
+                        "permissions": [permission],
+                        "filter": [{"prop": "user.id", "op": "==", "value": user_id}],
+                    }
+                ]
+            }
+            query = _RESOURCES_GRANTING_QUERY_POSTGRESQL
+            params: tuple[Any, ...] = (json.dumps(pattern),)
         else:
-            # Insert new policy
-            cursor.execute(
-                """
-                INSERT INTO resource_policies (resource_id, policy_document, created_at, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                """,
-                (policy_doc.resource.resourceId, policy_json),
+            query = _RESOURCES_GRANTING_QUERY_SQLITE
+            params = (permission, user_id)
+
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [row["resource_id"] for row in cursor.fetchall()]
+
+    # -------------------------------------------------------------------------
+    # Policy grants
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _replace_grants(
+        cursor: Any, policy_docs: dict[str, ResourcePolicyDocument]
+    ) -> None:
+        """Replace the policy grants of resources with those of their documents.
+
+        Args:
+            cursor: Cursor of the transaction saving the documents
+            policy_docs: Saved document of each resource URN
+        """
+        cursor.executemany(
+            "DELETE FROM policy_grants WHERE resource_id = ?",
+            [(resource_id,) for resource_id in policy_docs],
+        )
+        grants = [
+            grant
+            for resource_id, policy_doc in policy_docs.items()
+            for grant in _extract_grants(resource_id, policy_doc)
+        ]
+        if grants:
+            cursor.executemany(_INSERT_POLICY_GRANT, grants)
+
+    def get_principal_grants(
+        self,
+        principal_id: str,
+        principal_kind: str = "user",
+        permission: Permission | str | None = None,
+    ) -> list[PolicyGrant]:
+        """Get the resources whose policies name a principal.
+
+        Served by the policy_grants index on (principal_kind, principal_id),
+        without reading policy documents.
+
+        Args:
+            principal_id: User, team or project ID
+            principal_kind: "user", "team" or "project"
+            permission: Only return grants covering this permission
+
+        Returns:
+            PolicyGrants ordered by resource URN, allow before deny
+        """
+        query = (
+            "SELECT resource_id, principal_kind, principal_id, permission_mask, effect "
+            "FROM policy_grants WHERE principal_kind = ? AND principal_id = ?"
+        )
+        params: list[Any] = [principal_kind, principal_id]
+        if permission is not None:
+            query += " AND (permission_mask & ?) != 0"
+            params.append(permission_mask([permission]))
+        query += " ORDER BY resource_id, effect"
+
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        return [
+            PolicyGrant(
+                resource_id=row["resource_id"],
+                principal_kind=row["principal_kind"],
+                principal_id=row["principal_id"],
+                permission_mask=row["permission_mask"],
+                effect=row["effect"],
             )
+            for row in rows
+        ]
 
-        self.db.commit()
-        return True
+    def rebuild_policy_grants(self) -> int:
+        """Rebuild the policy_grants table from every stored document.
+
+        Needed once for documents saved before the table existed. Documents
+        are read batch by batch through a second cursor of the rebuilding
+        transaction, so no other connection is checked out.
+
+        Returns:
+            Number of grants written
+        """
+        count = 0
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM policy_grants")
+
+            if self.db.config.db_type == "postgresql":
+                documents = conn.cursor(name="policy_grants_rebuild")
+            else:
+                documents = conn.cursor()
+            try:
+                documents.execute(
+                    "SELECT resource_id, policy_document FROM resource_policies"
+                )
+                while rows := documents.fetchmany(_REBUILD_BATCH_SIZE):
+                    grants = [
+                        grant
+                        for row in rows
+                        for grant in _extract_grants(
+                            row["resource_id"],
+                            ResourcePolicyDocument(
+                                **_parse_policy_data(row["policy_document"])
+                            ),
+                        )
+                    ]
+                    if grants:
+                        cursor.executemany(_INSERT_POLICY_GRANT, grants)
+                        count += len(grants)
+            finally:
+                documents.close()
+        return count
 
     def get_user_policy(self, user_id: str) -> UserPolicyDocument | None:
         """Get user policy document by user ID.
@@ -312,69 +1268,41 @@ class Repository:
         Returns:
             UserPolicyDocument or None if not found
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT user_id, policy_document FROM user_policies WHERE user_id = ?",
-            (user_id,),
-        )
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT user_id, policy_document, version FROM user_policies WHERE user_id = ?",
+                (user_id,),
+            )
+            row = cursor.fetchone()
 
         if not row:
             return None
 
         # Parse policy document (stored as JSON TEXT or JSONB)
-        policy_json = row["policy_document"] if isinstance(row, dict) else row[1]
+        return UserPolicyDocument(**_parse_policy_data(row["policy_document"]))
 
-        if isinstance(policy_json, str):
-            policy_data = json.loads(policy_json)
-        else:
-            policy_data = policy_json
-
-        return UserPolicyDocument(**policy_data)
-
-    def save_user_policy(self, user_id: str, policy_doc: UserPolicyDocument) -> bool:
+    def save_user_policy(self, user_id: str, policy_doc: UserPolicyDocument) -> int:
         """Save or update user policy document.
 
+        The document is inserted or replaced with a single UPSERT statement,
+        which also bumps the stored version on update.
+
         Args:
             user_id: User ID
             policy_doc: UserPolicyDocument to save
 
         Returns:
-            bool: True if successful
+            int: Version of the stored document (1 for a new document)
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        # Serialize policy document to JSON
+        # Serialize policy document to JSON and discard its compiled form
+        # in case the caller modified the policies list in place
         policy_json = policy_doc.model_dump_json()
+        policy_doc.invalidate_compiled()
 
-        # Check if policy exists
-        cursor.execute(
-            "SELECT user_id FROM user_policies WHERE user_id = ?", (user_id,)
-        )
-        exists = cursor.fetchone() is not None
-
-        if exists:
-            # Update existing policy
-            cursor.execute(
-                """
-                UPDATE user_policies
-                SET policy_document = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-                """,
-                (policy_json, user_id),
-            )
-        else:
-            # Insert new policy
-            cursor.execute(
-                """
-                INSERT INTO user_policies (user_id, policy_document, created_at, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                """,
-                (user_id, policy_json),
-            )
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_UPSERT_USER_POLICY, (user_id, policy_json))
+            version = cursor.fetchone()["version"]
 
-        self.db.commit()
-        return True
+        return version
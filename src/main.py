@@ -11,6 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.api.routes import router
+from src.database.async_repository import shutdown_executor
 from src.database.connection import close_database, get_database
 
 # Configure logging
@@ -47,6 +48,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Permission Control Service...")
+    shutdown_executor()
     close_database()
     logger.info("Database connection closed")
 
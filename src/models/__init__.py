@@ -1,6 +1,15 @@
 """Data models for the permissions system."""
 
-from .common import Effect, Filter, FilterOperator, Permission
+from .common import (
+    ALL_PERMISSIONS_MASK,
+    PERMISSION_BITS,
+    Effect,
+    Filter,
+    FilterOperator,
+    Permission,
+    permission_mask,
+    permissions_from_mask,
+)
 from .entities import (
     Document,
     PlanType,
@@ -19,6 +28,7 @@ from .policies import (
     UserPolicy,
     UserPolicyDocument,
 )
+from .urn import ResourceUrn, build_resource_urn, parse_urn
 
 __all__ = [
     # Common types
@@ -26,6 +36,11 @@ __all__ = [
     "Effect",
     "FilterOperator",
     "Filter",
+    # Permission bitmasks
+    "PERMISSION_BITS",
+    "ALL_PERMISSIONS_MASK",
+    "permission_mask",
+    "permissions_from_mask",
     # Entity enums
     "Role",
     "PlanType",
@@ -43,4 +58,8 @@ __all__ = [
     "ResourceInfo",
     "ResourcePolicy",
     "ResourcePolicyDocument",
+    # Resource URNs
+    "ResourceUrn",
+    "parse_urn",
+    "build_resource_urn",
 ]
@@ -1,5 +1,6 @@
 """Common types and enums for the permissions system."""
 
+from collections.abc import Iterable
 from enum import Enum
 from typing import Any
 
@@ -15,6 +16,50 @@ class Permission(str, Enum):
     CAN_SHARE = "can_share"
 
 
+# -------------------------------------------------------------------------
+# Permission bitmask encoding
+# -------------------------------------------------------------------------
+# Each permission owns one bit, assigned in declaration order. New permissions
+# must be appended to the Permission enum so existing bits keep their meaning.
+
+PERMISSION_BITS: dict[Permission, int] = {
+    permission: 1 << position for position, permission in enumerate(Permission)
+}
+
+# Mask with every permission set
+ALL_PERMISSIONS_MASK = sum(PERMISSION_BITS.values())
+
+
+def permission_mask(permissions: Iterable[Permission | str]) -> int:
+    """Encode permissions as a bitmask.
+
+    Args:
+        permissions: Permissions (enum members or their string values)
+
+    Returns:
+        Bitwise OR of the permissions' bits
+
+    Raises:
+        ValueError: If a permission is unknown
+    """
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[Permission(permission)]
+    return mask
+
+
+def permissions_from_mask(mask: int) -> list[Permission]:
+    """Decode a bitmask into permissions, in declaration order.
+
+    Args:
+        mask: Permission bitmask
+
+    Returns:
+        Permissions whose bit is set
+    """
+    return [permission for permission, bit in PERMISSION_BITS.items() if mask & bit]
+
+
 class Effect(str, Enum):
     """Policy effect - allow or deny."""
 
@@ -1,6 +1,9 @@
 """Policy models for the permissions system."""
 
-from pydantic import BaseModel, Field
+import json
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .common import Effect, Filter, Permission
 
@@ -25,7 +28,24 @@ class UserPolicy(BaseModel):
         use_enum_values = True
 
 
-class UserPolicyDocument(BaseModel):
+class CompiledPolicyDocument(BaseModel):
+    """Base for policy documents evaluated through a compiled form.
+
+    The compiled form (see src.components.compiled_policy) indexes the
+    policies by permission. It is built on first evaluation and kept on the
+    document, so a document evaluated repeatedly is only compiled once.
+    Stored documents are not kept parsed for evaluation; see
+    StoredPolicyDocument.
+    """
+
+    _compiled: Any = PrivateAttr(default=None)
+
+    def invalidate_compiled(self) -> None:
+        """Discard the compiled form after the policies list was modified."""
+        self._compiled = None
+
+
+class UserPolicyDocument(CompiledPolicyDocument):
     """Complete user policy document containing all policies for a user."""
 
     policies: list[UserPolicy] = Field(..., description="List of user policies")
@@ -67,7 +87,7 @@ class ResourcePolicy(BaseModel):
         use_enum_values = True
 
 
-class ResourcePolicyDocument(BaseModel):
+class ResourcePolicyDocument(CompiledPolicyDocument):
     """Complete resource policy document containing resource info and policies."""
 
     resource: ResourceInfo = Field(..., description="Resource information")
@@ -75,3 +95,26 @@ class ResourcePolicyDocument(BaseModel):
 
     class Config:
         use_enum_values = True
+
+
+class StoredPolicyDocument(NamedTuple):
+    """A policy document as read from the database, not yet parsed.
+
+    Permission checks hand stored documents to the evaluator, which caches
+    their compiled form under ``key`` and only parses a document whose
+    compiled form is not cached.
+    """
+
+    model: type[CompiledPolicyDocument]
+    # (table, owner id, version, content digest); identifies the content
+    key: tuple[Any, ...]
+    data: Any  # JSON text or JSONB
+
+    def parse(self) -> CompiledPolicyDocument:
+        """Validate the stored document.
+
+        Returns:
+            The parsed policy document
+        """
+        data = json.loads(self.data) if isinstance(self.data, str) else self.data
+        return self.model(**data)
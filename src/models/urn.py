@@ -0,0 +1,117 @@
+"""Resource URN parsing.
+
+Resource URNs have the form ``urn:resource:{teamId}:{projectId}:{docId}``.
+Every request parses at least one, so the pattern is compiled once and parsed
+URNs are memoized in a bounded cache.
+
+Patterns may end in wildcards to address every project of a team or every
+document of a project (``urn:resource:team1:*:*``, ``urn:resource:team1:proj1:*``).
+Wildcards are only accepted when asked for, since lookups need a concrete
+resource.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+URN_PREFIX = "urn:resource:"
+
+WILDCARD = "*"
+
+# Maximum number of distinct URN strings kept parsed
+URN_CACHE_SIZE = 4096
+
+_URN_PATTERN = re.compile(
+    r"^urn:resource:([a-zA-Z0-9]+):([a-zA-Z0-9]+|\*):([a-zA-Z0-9]+|\*)$"
+)
+
+
+class ResourceUrn(NamedTuple):
+    """Parsed resource URN.
+
+    Unpacks like the ``(team_id, project_id, doc_id)`` tuple it replaces.
+    """
+
+    team_id: str
+    project_id: str
+    doc_id: str
+
+    @property
+    def is_wildcard(self) -> bool:
+        """Whether the URN is a pattern rather than a single resource."""
+        return self.doc_id == WILDCARD
+
+    @property
+    def prefix(self) -> str:
+        """URN text shared by every resource the URN matches.
+
+        For a concrete URN this is the URN itself.
+        """
+        if self.project_id == WILDCARD:
+            return f"{URN_PREFIX}{self.team_id}:"
+        if self.doc_id == WILDCARD:
+            return f"{URN_PREFIX}{self.team_id}:{self.project_id}:"
+        return str(self)
+
+    def matches(self, urn: "ResourceUrn") -> bool:
+        """Check whether a resource falls under this URN.
+
+        Args:
+            urn: Concrete resource URN
+
+        Returns:
+            True if every non-wildcard component is equal
+        """
+        return (
+            self.team_id == urn.team_id
+            and self.project_id in (WILDCARD, urn.project_id)
+            and self.doc_id in (WILDCARD, urn.doc_id)
+        )
+
+    def __str__(self) -> str:
+        return f"{URN_PREFIX}{self.team_id}:{self.project_id}:{self.doc_id}"
+
+
+@lru_cache(maxsize=URN_CACHE_SIZE)
+def parse_urn(resource_urn: str, allow_wildcard: bool = False) -> ResourceUrn | None:
+    """Parse a resource URN.
+
+    Args:
+        resource_urn: The resource URN string
+        allow_wildcard: Accept trailing ``*`` components
+
+    Returns:
+        ResourceUrn, or None if the URN is malformed (or a wildcard pattern
+        when wildcards are not allowed)
+
+    Example:
+        >>> parse_urn("urn:resource:team1:proj1:doc1")
+        ResourceUrn(team_id='team1', project_id='proj1', doc_id='doc1')
+    """
+    match = _URN_PATTERN.match(resource_urn)
+    if not match:
+        return None
+
+    urn = ResourceUrn(*match.groups())
+    if urn.is_wildcard:
+        if not allow_wildcard:
+            return None
+    elif urn.project_id == WILDCARD:
+        # A wildcard project only makes sense with a wildcard document
+        return None
+
+    return urn
+
+
+def build_resource_urn(team_id: str, project_id: str, doc_id: str) -> str:
+    """Build a resource URN from component IDs.
+
+    Args:
+        team_id: Team ID
+        project_id: Project ID (or ``*``)
+        doc_id: Document ID (or ``*``)
+
+    Returns:
+        Resource URN string
+    """
+    return str(ResourceUrn(team_id, project_id, doc_id))
@@ -33,6 +33,9 @@ def test_db():
     with open("migrations/002_add_indexes.sql") as f:
         db.get_connection().executescript(f.read())
 
+    with open("migrations/004_policy_grants.sql") as f:
+        db.get_connection().executescript(f.read())
+
     db.commit()
 
     yield db
@@ -77,6 +80,8 @@ def test_client(monkeypatch):
         test_db.get_connection().executescript(f.read())
     with open("migrations/002_add_indexes.sql") as f:
         test_db.get_connection().executescript(f.read())
+    with open("migrations/004_policy_grants.sql") as f:
+        test_db.get_connection().executescript(f.read())
     test_db.commit()
 
     # Patch the global database singleton
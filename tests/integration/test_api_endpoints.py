@@ -61,6 +61,20 @@ class TestPolicyEndpoints:
         response = test_client.post("/api/v1/resource/policy", json=policy_doc)
         assert response.status_code == 201
 
+    def test_create_policy_returns_stored_version(self, test_client):
+        """Test saving a policy again reports the bumped version."""
+        options = {
+            "resourceId": "urn:resource:team1:proj1:doc3",
+            "action": "can_view",
+            "target": "user123",
+        }
+
+        first = test_client.post("/api/v1/resource/policy", json=options)
+        second = test_client.post("/api/v1/resource/policy", json=options)
+
+        assert first.json()["version"] == 1
+        assert second.json()["version"] == 2
+
     def test_get_policy_success(self, test_client):
         """Test getting existing policy."""
         # First create a policy
@@ -103,6 +117,212 @@ class TestPolicyEndpoints:
         assert response.status_code == 422
 
 
+class TestBulkPolicyImportEndpoint:
+    """Test bulk policy import from NDJSON."""
+
+    def test_import_reports_per_line_results(self, test_client):
+        """Test valid lines are saved and invalid lines reported."""
+        lines = [
+            json.dumps(
+                {
+                    "resourceId": "urn:resource:team1:proj1:doc1",
+                    "action": "can_edit",
+                    "target": "user123",
+                }
+            ),
+            "",
+            "{not json",
+            json.dumps(
+                {
+                    "resource": {
+                        "resourceId": "urn:resource:team1:proj1:doc2",
+                        "creatorId": "user1",
+                    },
+                    "policies": [
+                        {
+                            "permissions": ["can_view"],
+                            "effect": "allow",
+                            "filter": [],
+                        }
+                    ],
+                }
+            ),
+            json.dumps(
+                {
+                    "resourceId": "urn:resource:team1:proj1:doc1",
+                    "action": "can_view",
+                    "target": "user123",
+                }
+            ),
+        ]
+
+        response = test_client.post(
+            "/api/v1/resource/policy/bulk",
+            content="\n".join(lines) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["saved"] == 3
+        assert data["failed"] == 1
+        results = data["results"]
+        assert [result["line"] for result in results] == [1, 3, 4, 5]
+        assert results[1]["error"]
+        assert results[1]["version"] is None
+        assert results[2]["resourceId"] == "urn:resource:team1:proj1:doc2"
+        assert results[2]["version"] == 1
+        # doc1 is saved twice in the same batch
+        assert results[0]["version"] == results[3]["version"] == 2
+
+        get_response = test_client.get(
+            "/api/v1/resource/policy",
+            params={"resourceId": "urn:resource:team1:proj1:doc2"},
+        )
+        assert get_response.status_code == 200
+
+    def test_import_reports_failing_line_of_batch(self, test_client):
+        """Test a document rejected by the database fails only its own line."""
+        test_client.test_db.get_connection().execute("""
+            CREATE TRIGGER reject_policy BEFORE INSERT ON resource_policies
+            WHEN NEW.resource_id = 'urn:resource:team1:proj1:doc2'
+            BEGIN SELECT RAISE(ABORT, 'rejected by trigger'); END
+        """)
+        lines = [
+            json.dumps(
+                {
+                    "resourceId": f"urn:resource:team1:proj1:doc{doc}",
+                    "action": "can_view",
+                    "target": "user123",
+                }
+            )
+            for doc in range(1, 4)
+        ]
+
+        response = test_client.post(
+            "/api/v1/resource/policy/bulk",
+            content="\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        data = response.json()
+        assert data["saved"] == 2
+        assert data["failed"] == 1
+        results = data["results"]
+        assert [result["version"] for result in results] == [1, None, 1]
+        assert "rejected by trigger" in results[1]["error"]
+
+    def test_import_line_split_across_chunks(self, test_client):
+        """Test lines are reassembled however the body is chunked."""
+        line = json.dumps(
+            {
+                "resourceId": "urn:resource:team1:proj1:doc1",
+                "action": "can_view",
+                "target": "user123",
+            }
+        ).encode()
+        body = line + b"\n\n" + line + b"\n" + line
+
+        def chunks():
+            for start in range(0, len(body), 7):
+                yield body[start : start + 7]
+
+        response = test_client.post(
+            "/api/v1/resource/policy/bulk",
+            content=chunks(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        data = response.json()
+        assert [result["line"] for result in data["results"]] == [1, 3, 4]
+        assert data["failed"] == 0
+
+    def test_import_empty_body(self, test_client):
+        """Test an empty body is rejected."""
+        response = test_client.post(
+            "/api/v1/resource/policy/bulk",
+            content="\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 400
+
+
+class TestPolicyExportEndpoint:
+    """Test streaming policy export."""
+
+    def test_export_all_and_by_pattern(self, test_client):
+        """Test every policy is exported and patterns narrow the export."""
+        for resource_id in (
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team1:proj2:doc1",
+            "urn:resource:team2:proj1:doc1",
+        ):
+            test_client.post(
+                "/api/v1/resource/policy",
+                json={"resourceId": resource_id, "action": "can_view", "target": "u1"},
+            )
+
+        response = test_client.get("/api/v1/resource/policies/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3
+        assert {line["resourceId"] for line in lines} == {
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team1:proj2:doc1",
+            "urn:resource:team2:proj1:doc1",
+        }
+        assert all(line["version"] == 1 for line in lines)
+        assert all(
+            line["policy"]["resource"]["resourceId"] == line["resourceId"]
+            for line in lines
+        )
+
+        response = test_client.get(
+            "/api/v1/resource/policies/export",
+            params={"resourcePattern": "urn:resource:team1:*:*"},
+        )
+        assert len(response.text.splitlines()) == 2
+
+        response = test_client.get(
+            "/api/v1/resource/policies/export",
+            params={"updatedSince": "2999-01-01T00:00:00Z"},
+        )
+        assert response.text == ""
+
+    def test_export_multiline_documents(self, test_client):
+        """Test pretty-printed stored documents export as one line each."""
+        with open("migrations/003_sample_data.sql") as f:
+            test_client.test_db.get_connection().executescript(f.read())
+        test_client.test_db.commit()
+
+        response = test_client.get("/api/v1/resource/policies/export")
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["resourceId"] for line in lines] == [
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team1:proj1:doc2",
+        ]
+
+        # The exported documents can be imported again
+        response = test_client.post(
+            "/api/v1/resource/policy/bulk",
+            content="".join(json.dumps(line["policy"]) + "\n" for line in lines),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.json()["saved"] == 2
+
+    def test_export_invalid_pattern(self, test_client):
+        """Test a concrete or malformed pattern is rejected."""
+        for pattern in ("urn:resource:team1:proj1:doc1", "team1"):
+            response = test_client.get(
+                "/api/v1/resource/policies/export",
+                params={"resourcePattern": pattern},
+            )
+            assert response.status_code == 400
+
+
 class TestPermissionCheckEndpoint:
     """Test /permission-check endpoint."""
 
@@ -235,3 +455,158 @@ class TestPermissionCheckEndpoint:
         )
 
         assert response.status_code == 422  # Validation error
+
+
+class TestBatchPermissionCheckEndpoint:
+    """Test /permission-check/batch endpoint."""
+
+    def test_batch_permission_check(self, test_client):
+        """Test batch results are returned per check in request order."""
+        TestPermissionCheckEndpoint().setup_test_data(test_client)
+        cursor = test_client.test_db.get_connection().cursor()
+        cursor.execute(
+            "INSERT INTO users (id, email, name) VALUES (?, ?, ?)",
+            ("user2", "other@example.com", "Other User"),
+        )
+        test_client.test_db.commit()
+
+        response = test_client.post(
+            "/api/v1/permission-check/batch",
+            json={
+                "checks": [
+                    {
+                        "resourceId": "urn:resource:team1:proj1:doc1",
+                        "userId": "user1",
+                        "action": "can_edit",
+                    },
+                    {
+                        "resourceId": "urn:resource:team1:proj1:doc1",
+                        "userId": "user2",
+                        "action": "can_view",
+                    },
+                    {
+                        "resourceId": "urn:resource:team1:proj1:doc1",
+                        "userId": "nonexistent",
+                        "action": "can_view",
+                    },
+                    {
+                        "resourceId": "invalid-urn",
+                        "userId": "user1",
+                        "action": "can_view",
+                    },
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["allowed"] for r in results] == [True, False, False, False]
+        assert results[0]["error"] is None
+        assert results[1]["error"] is None
+        assert results[2]["error"].startswith("NOT_FOUND")
+        assert results[3]["error"].startswith("VALIDATION_ERROR")
+
+    def test_batch_permission_check_empty(self, test_client):
+        """Test an empty batch is rejected."""
+        response = test_client.post(
+            "/api/v1/permission-check/batch", json={"checks": []}
+        )
+
+        assert response.status_code == 422
+
+
+class TestPermissionsEndpoint:
+    """Test /permissions endpoint."""
+
+    def test_all_permissions_for_creator(self, test_client):
+        """Test the creator gets every permission in one call."""
+        TestPermissionCheckEndpoint().setup_test_data(test_client)
+
+        response = test_client.get(
+            "/api/v1/permissions",
+            params={"resourceId": "urn:resource:team1:proj1:doc1", "userId": "user1"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["permissions"] == [
+            "can_view",
+            "can_edit",
+            "can_delete",
+            "can_share",
+        ]
+
+    def test_no_permissions_for_other_user(self, test_client):
+        """Test users without matching policies get an empty list."""
+        TestPermissionCheckEndpoint().setup_test_data(test_client)
+        cursor = test_client.test_db.get_connection().cursor()
+        cursor.execute(
+            "INSERT INTO users (id, email, name) VALUES (?, ?, ?)",
+            ("user2", "other@example.com", "Other User"),
+        )
+        test_client.test_db.commit()
+
+        response = test_client.get(
+            "/api/v1/permissions",
+            params={"resourceId": "urn:resource:team1:proj1:doc1", "userId": "user2"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["permissions"] == []
+
+    def test_permissions_user_not_found(self, test_client):
+        """Test unknown users are reported as 404."""
+        TestPermissionCheckEndpoint().setup_test_data(test_client)
+
+        response = test_client.get(
+            "/api/v1/permissions",
+            params={
+                "resourceId": "urn:resource:team1:proj1:doc1",
+                "userId": "nonexistent",
+            },
+        )
+
+        assert response.status_code == 404
+
+
+class TestDecisionCache:
+    """Test the optional decision cache on /permission-check."""
+
+    def test_decision_cache_hit_and_version_invalidation(self, test_client):
+        """Test repeated checks hit the cache until a policy save bumps its version."""
+        from src.components.decision_cache import DecisionCache, get_decision_cache
+        from src.main import app
+
+        TestPermissionCheckEndpoint().setup_test_data(test_client)
+        cache = DecisionCache(max_size=16)
+        app.dependency_overrides[get_decision_cache] = lambda: cache
+        params = {
+            "resourceId": "urn:resource:team1:proj1:doc1",
+            "userId": "user1",
+            "action": "can_view",
+        }
+
+        try:
+            assert test_client.get("/api/v1/permission-check", params=params).json()[
+                "allowed"
+            ]
+            assert test_client.get("/api/v1/permission-check", params=params).json()[
+                "allowed"
+            ]
+            assert cache.stats()["hits"] == 1
+
+            # Replace the policy with one that denies the creator
+            test_client.post(
+                "/api/v1/resource/policy",
+                json={
+                    "resourceId": "urn:resource:team1:proj1:doc1",
+                    "action": "can_view",
+                    "target": "user1",
+                    "effect": "deny",
+                },
+            )
+            response = test_client.get("/api/v1/permission-check", params=params)
+            assert response.json()["allowed"] is False
+            assert cache.stats()["hits"] == 1
+        finally:
+            app.dependency_overrides.pop(get_decision_cache, None)
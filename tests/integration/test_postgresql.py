@@ -0,0 +1,147 @@
+"""Integration tests against a real PostgreSQL server.
+
+Skipped unless TEST_POSTGRES_DSN points at a database the tests may create
+schemas in, e.g. "host=localhost user=postgres password=postgres dbname=test".
+Each test runs the migrations/postgresql scripts in a schema of its own.
+"""
+
+import glob
+import os
+import uuid
+
+import pytest
+
+from src.database.connection import DatabaseConfig, DatabaseConnection
+from src.database.repository import Repository
+from src.models.common import Effect, Filter, Permission
+from src.models.policies import ResourceInfo, ResourcePolicy, ResourcePolicyDocument
+
+DSN = os.getenv("TEST_POSTGRES_DSN")
+
+pytestmark = pytest.mark.skipif(not DSN, reason="TEST_POSTGRES_DSN is not set")
+
+
+@pytest.fixture
+def pg_db():
+    """Create a PostgreSQL database with the migrations applied.
+
+    A single pooled connection is used so the schema on its search_path is
+    the one every query sees.
+    """
+    psycopg2_extensions = pytest.importorskip("psycopg2.extensions")
+    params = psycopg2_extensions.parse_dsn(DSN)
+    db = DatabaseConnection(
+        DatabaseConfig(
+            db_type="postgresql",
+            postgres_host=params.get("host"),
+            postgres_port=int(params.get("port", 5432)),
+            postgres_user=params.get("user"),
+            postgres_password=params.get("password"),
+            postgres_database=params.get("dbname"),
+            pool_min_size=1,
+            pool_max_size=1,
+        )
+    )
+    schema = f"test_{uuid.uuid4().hex}"
+
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        cursor.execute(f"SET search_path TO {schema}")
+        for path in sorted(glob.glob("migrations/postgresql/*.sql")):
+            with open(path) as f:
+                cursor.execute(f.read())
+        conn.commit()
+
+    yield db
+
+    with db.connection() as conn:
+        conn.cursor().execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.commit()
+    db.close()
+
+
+def _policy_doc(resource_id: str, *policies: ResourcePolicy) -> ResourcePolicyDocument:
+    return ResourcePolicyDocument(
+        resource=ResourceInfo(resourceId=resource_id, creatorId="user1"),
+        policies=list(policies),
+    )
+
+
+def _grant(user_id: str, permission: Permission) -> ResourcePolicy:
+    return ResourcePolicy(
+        permissions=[permission],
+        effect=Effect.ALLOW,
+        filter=[Filter(prop="user.id", op="==", value=user_id)],
+    )
+
+
+class TestRepository:
+    """Test the repository end to end on the JSONB schema."""
+
+    def test_save_and_read_policies(self, pg_db):
+        """Test saves, reads, export and grants through the repository."""
+        repository = Repository(pg_db)
+        resource_id = "urn:resource:team1:proj1:doc1"
+
+        assert (
+            repository.save_resource_policy(
+                _policy_doc(resource_id, _grant("user123", Permission.CAN_EDIT))
+            )
+            == 1
+        )
+        assert (
+            repository.save_resource_policy(
+                _policy_doc(resource_id, _grant("user123", Permission.CAN_VIEW))
+            )
+            == 2
+        )
+        assert repository.save_resource_policies_bulk(
+            [_policy_doc("urn:resource:team2:proj1:doc1")]
+        ) == {"urn:resource:team2:proj1:doc1": 1}
+
+        stored = repository.get_resource_policy(resource_id)
+        assert stored.policies[0].permissions == ["can_view"]
+
+        exported = list(repository.iter_resource_policies("urn:resource:team1:"))
+        assert [row.resource_id for row in exported] == [resource_id]
+        assert exported[0].version == 2
+
+        assert repository.rebuild_policy_grants() == 1
+        assert [
+            grant.resource_id for grant in repository.get_principal_grants("user123")
+        ] == [resource_id]
+
+
+class TestResourcesGranting:
+    """Test the JSONB containment query."""
+
+    def test_find_resources_granting(self, pg_db):
+        """Test containment matches direct grants only."""
+        repository = Repository(pg_db)
+        repository.save_resource_policies_bulk(
+            [
+                _policy_doc(
+                    "urn:resource:team1:proj1:doc1",
+                    _grant("user123", Permission.CAN_EDIT),
+                ),
+                _policy_doc(
+                    "urn:resource:team1:proj1:doc2",
+                    _grant("user123", Permission.CAN_VIEW),
+                ),
+                _policy_doc(
+                    "urn:resource:team2:proj1:doc1",
+                    _grant("user456", Permission.CAN_VIEW),
+                    _grant("user123", Permission.CAN_EDIT),
+                ),
+            ]
+        )
+
+        assert repository.find_resources_granting("user123", "can_edit") == [
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team2:proj1:doc1",
+        ]
+        assert repository.find_resources_granting("user123", "can_view") == [
+            "urn:resource:team1:proj1:doc2"
+        ]
+        assert repository.find_resources_granting("user789", "can_edit") == []
@@ -0,0 +1,63 @@
+"""Unit tests for the in-process LRU cache."""
+
+import pytest
+
+from src.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test bounded LRU cache behaviour."""
+
+    def test_get_and_set(self):
+        """Test cached values are returned and counted as hits."""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after their time-to-live."""
+        now = [100.0]
+        monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(max_size=2, ttl_seconds=5)
+        cache.set("a", 1)
+
+        now[0] = 104.0
+        assert cache.get("a") == 1
+
+        now[0] = 105.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_and_clear(self):
+        """Test entries can be removed individually or all at once."""
+        cache = LRUCache(max_size=4)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_size(self):
+        """Test a cache must hold at least one entry."""
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
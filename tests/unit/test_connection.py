@@ -0,0 +1,213 @@
+"""Unit tests for pooled database connections."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.database.connection import (
+    ConnectionPool,
+    DatabaseConfig,
+    DatabaseConnection,
+    PoolTimeoutError,
+    translate_placeholders,
+)
+
+
+def _file_database(tmp_path, **pool_settings):
+    config = DatabaseConfig(
+        db_type="sqlite", sqlite_path=str(tmp_path / "test.db"), **pool_settings
+    )
+    db = DatabaseConnection(config)
+    db.connect()
+    return db
+
+
+class TestConnectionPool:
+    """Test checkout, release and health checking."""
+
+    def test_acquire_and_release_reuses_connection(self):
+        """Test a released connection is handed out again."""
+        pool = ConnectionPool(lambda: sqlite3.connect(":memory:"), min_size=1)
+        conn = pool.acquire()
+        pool.release(conn)
+
+        assert pool.acquire() is conn
+        assert pool.size == 1
+
+    def test_checkout_timeout(self):
+        """Test acquire gives up when the pool is exhausted."""
+        pool = ConnectionPool(
+            lambda: sqlite3.connect(":memory:"), min_size=0, max_size=1, timeout=0.05
+        )
+        pool.acquire()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+
+    def test_broken_connection_replaced(self):
+        """Test connections failing the health check are discarded."""
+        pool = ConnectionPool(lambda: sqlite3.connect(":memory:"), min_size=1)
+        broken = pool.acquire()
+        pool.release(broken)
+        broken.close()
+
+        conn = pool.acquire()
+        assert conn is not broken
+        assert pool.size == 1
+
+    def test_invalid_sizes(self):
+        """Test inconsistent pool sizes are rejected."""
+        with pytest.raises(ValueError):
+            ConnectionPool(lambda: None, min_size=5, max_size=2)
+
+
+class TestDatabaseConnectionPooling:
+    """Test per-task connection checkout."""
+
+    def test_connection_kept_per_thread(self, tmp_path):
+        """Test get_connection() outside a task keeps a connection per thread."""
+        db = _file_database(tmp_path)
+        main_conn = db.get_connection()
+        assert db.get_connection() is main_conn
+
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(db.get_connection()))
+        thread.start()
+        thread.join()
+
+        assert seen[0] is not main_conn
+        db.close()
+
+    def test_release_returns_connection_to_pool(self, tmp_path):
+        """Test release() frees the thread's connection for others."""
+        db = _file_database(tmp_path, pool_min_size=0, pool_max_size=1)
+        conn = db.get_connection()
+        assert db.pool.idle == 0
+
+        db.release()
+        assert db.pool.idle == 1
+        assert db.get_connection() is conn
+        db.close()
+
+    def test_task_scoped_checkout(self, tmp_path):
+        """Test connection() binds one connection to the thread for a task."""
+        db = _file_database(tmp_path)
+
+        with db.connection() as conn:
+            assert db.get_connection() is conn
+            with db.connection() as nested, db.transaction() as transaction:
+                assert nested is conn
+                assert transaction is conn
+            assert db.pool.idle == db.pool.size - 1
+
+        assert db.pool.idle == db.pool.size
+        db.close()
+
+    def test_tasks_share_connections_across_threads(self, tmp_path):
+        """Test threads hold no connection between tasks."""
+        db = _file_database(tmp_path, pool_min_size=0, pool_max_size=1)
+
+        def task():
+            with db.connection() as conn:
+                conn.execute("SELECT 1")
+
+        threads = [threading.Thread(target=task) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+
+        assert db.pool.size == 1
+        assert db.pool.idle == 1
+        db.close()
+
+    def test_failed_transaction_rolled_back_and_released(self, tmp_path):
+        """Test transaction() rolls back and returns its connection on error."""
+        db = _file_database(tmp_path)
+        with db.transaction() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER)")
+
+        with pytest.raises(RuntimeError), db.transaction() as conn:
+            conn.execute("INSERT INTO items VALUES (1)")
+            raise RuntimeError("boom")
+
+        assert db.pool.idle == db.pool.size
+        with db.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        db.close()
+
+    def test_broken_connection_replaced_on_checkout(self, tmp_path):
+        """Test a connection that died is not handed out again."""
+        db = _file_database(tmp_path, pool_min_size=0, pool_max_size=1)
+        kept = db.get_connection()
+        kept.close()
+
+        assert db.is_connected()
+        assert db.get_connection() is not kept
+
+        db.release()
+        with db.connection() as conn:
+            broken = conn
+        broken.close()
+
+        with db.connection() as conn:
+            assert conn is not broken
+            conn.execute("SELECT 1")
+        db.close()
+
+    def test_memory_database_shares_connection(self):
+        """Test in-memory databases use one shared connection."""
+        db = DatabaseConnection(
+            DatabaseConfig(db_type="sqlite", sqlite_path=":memory:")
+        )
+        db.connect()
+        conn = db.get_connection()
+
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(db.get_connection()))
+        thread.start()
+        thread.join()
+
+        assert seen[0] is conn
+        assert db.pool is None
+        db.close()
+
+
+class TestSQLiteProfile:
+    """Test the SQLite performance profile applied at connect time."""
+
+    def test_pragmas_applied(self, tmp_path):
+        """Test every pooled connection gets the configured PRAGMAs."""
+        db = _file_database(tmp_path, sqlite_cache_size=-4000)
+        conn = db.get_connection()
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4000
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        db.close()
+
+    def test_invalid_pragma_value_rejected(self):
+        """Test unknown PRAGMA values are rejected before use."""
+        with pytest.raises(ValueError):
+            DatabaseConfig(sqlite_journal_mode="WAL; DROP TABLE users")
+
+
+class TestPlaceholderTranslation:
+    """Test "?" placeholders are translated for psycopg2."""
+
+    def test_placeholders_translated(self):
+        """Test placeholders become %s outside literals."""
+        assert translate_placeholders(
+            "SELECT * FROM t WHERE a = ? AND b IN (?, ?)"
+        ) == ("SELECT * FROM t WHERE a = %s AND b IN (%s, %s)")
+
+    def test_literals_and_percent_preserved(self):
+        """Test quoted "?" are kept and "%" is escaped everywhere."""
+        assert (
+            translate_placeholders(
+                "SELECT '?', \"a?b\" FROM t WHERE c LIKE 'x%' AND d = ?"
+            )
+            == "SELECT '?', \"a?b\" FROM t WHERE c LIKE 'x%%' AND d = %s"
+        )
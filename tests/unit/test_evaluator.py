@@ -5,8 +5,19 @@ Tests permission evaluation logic, policy precedence, and URN handling.
 
 from datetime import datetime
 
-from src.components.evaluator import Evaluator
-from src.models.common import Effect, Filter, FilterOperator, Permission
+from src.components.compiled_policy import compile_policy_document
+from src.components.evaluator import Evaluator, get_evaluator
+from src.components.filter_engine import FilterEngine, get_filter_engine
+from src.models.common import (
+    ALL_PERMISSIONS_MASK,
+    PERMISSION_BITS,
+    Effect,
+    Filter,
+    FilterOperator,
+    Permission,
+    permission_mask,
+    permissions_from_mask,
+)
 from src.models.entities import (
     Document,
     Project,
@@ -15,7 +26,13 @@ from src.models.entities import (
     TeamMembership,
     User,
 )
-from src.models.policies import ResourceInfo, ResourcePolicy, ResourcePolicyDocument
+from src.models.policies import (
+    ResourceInfo,
+    ResourcePolicy,
+    ResourcePolicyDocument,
+    UserPolicy,
+    UserPolicyDocument,
+)
 
 
 class TestURNHandling:
@@ -209,6 +226,28 @@ class TestContextBuilding:
         assert "team" not in context
         assert "project" not in context
 
+    def test_build_context_matches_model_dump(self):
+        """Test the context exposes the same values model_dump() would."""
+        document = Document(
+            id="doc1",
+            title="Test",
+            projectId="proj1",
+            creatorId="user1",
+            deletedAt="2025-01-01T00:00:00",
+            publicLinkEnabled=True,
+        )
+        team = Team(id="team1", name="Team", plan="pro")
+
+        context = self.evaluator._build_context(
+            user=User(id="user1", email="test@example.com", name="Test"),
+            document=document,
+            team=team,
+        )
+
+        assert context["document"] == document.model_dump()
+        assert context["team"] == team.model_dump()
+        assert context["team"]["plan"] == "pro"
+
 
 class TestPermissionEvaluation:
     """Test permission evaluation with various scenarios."""
@@ -420,3 +459,463 @@ class TestPermissionEvaluation:
         )
 
         assert result.allowed is False
+
+
+class TestPolicyPositions:
+    """Test policies are identified by their position in the document."""
+
+    def _policy_doc(self, policies):
+        return ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=policies,
+        )
+
+    def test_unnamed_policies_keep_document_position(self):
+        """Test default policy names use the position in the document."""
+        policy_doc = self._policy_doc(
+            [
+                ResourcePolicy(permissions=[Permission.CAN_VIEW], effect=Effect.ALLOW),
+                ResourcePolicy(permissions=[Permission.CAN_EDIT], effect=Effect.ALLOW),
+            ]
+        )
+
+        result = Evaluator().evaluate_permission(
+            user=User(id="user1", email="test@example.com", name="Test"),
+            document=Document(
+                id="doc1", title="Doc", projectId="proj1", creatorId="user1"
+            ),
+            permission=Permission.CAN_EDIT,
+            resource_policy=policy_doc,
+        )
+
+        assert result.allowed is True
+        assert result.matched_policies == ["resource_policy_1"]
+
+
+class TestShortCircuitEvaluation:
+    """Test deny-first short-circuit evaluation and explain mode."""
+
+    def setup_method(self):
+        """Setup test instances."""
+        self.evaluator = Evaluator()
+        self.user = User(id="user1", email="test@example.com", name="Test User")
+        self.document = Document(
+            id="doc1", title="Doc", projectId="proj1", creatorId="user1"
+        )
+        self.resource_policy = ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=[
+                ResourcePolicy(
+                    description="Allow A",
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                ),
+                ResourcePolicy(
+                    description="Allow B",
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                ),
+                ResourcePolicy(
+                    description="Deny edit",
+                    permissions=[Permission.CAN_EDIT],
+                    effect=Effect.DENY,
+                ),
+            ],
+        )
+        self.user_policy = UserPolicyDocument(
+            policies=[
+                UserPolicy(
+                    description="User deny edit",
+                    permissions=[Permission.CAN_EDIT],
+                    effect=Effect.DENY,
+                ),
+                UserPolicy(
+                    description="User allow edit",
+                    permissions=[Permission.CAN_EDIT],
+                    effect=Effect.ALLOW,
+                ),
+            ]
+        )
+
+    def _evaluate(self, permission, explain):
+        return self.evaluator.evaluate_permission(
+            user=self.user,
+            document=self.document,
+            permission=permission,
+            resource_policy=self.resource_policy,
+            user_policy=self.user_policy,
+            explain=explain,
+        )
+
+    def test_stops_at_first_deny(self):
+        """Test the first matching DENY decides without collecting the rest."""
+        result = self._evaluate(Permission.CAN_EDIT, explain=False)
+        assert result.allowed is False
+        assert result.matched_policies == ["Deny edit"]
+
+    def test_stops_at_first_allow(self):
+        """Test the first matching ALLOW decides when no DENY matches."""
+        result = self._evaluate(Permission.CAN_VIEW, explain=False)
+        assert result.allowed is True
+        assert result.matched_policies == ["Allow A"]
+
+    def test_explain_collects_all_matches(self):
+        """Test explain mode reports every matching policy of the deciding effect."""
+        result = self._evaluate(Permission.CAN_EDIT, explain=True)
+        assert result.allowed is False
+        assert result.matched_policies == ["Deny edit", "User deny edit"]
+
+        result = self._evaluate(Permission.CAN_VIEW, explain=True)
+        assert result.allowed is True
+        assert result.matched_policies == ["Allow A", "Allow B"]
+
+
+class TestCompiledPolicies:
+    """Test the compact runtime form of policy documents."""
+
+    def setup_method(self):
+        """Setup test instance."""
+        self.engine = FilterEngine()
+
+    def _policy_doc(self, policies):
+        return ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=policies,
+        )
+
+    def test_policies_encoded_as_mask_and_flag(self):
+        """Test permissions become a bitmask and the effect a bool."""
+        policy_doc = self._policy_doc(
+            [
+                ResourcePolicy(
+                    permissions=[Permission.CAN_VIEW, Permission.CAN_SHARE],
+                    effect=Effect.ALLOW,
+                ),
+                ResourcePolicy(
+                    description="No edits",
+                    filter=[Filter(prop="user.id", op="==", value="user2")],
+                    permissions=[Permission.CAN_EDIT],
+                    effect=Effect.DENY,
+                ),
+            ]
+        )
+
+        compiled = compile_policy_document(policy_doc, "resource_policy", self.engine)
+        allow_policy, deny_policy = compiled.policies
+
+        assert allow_policy.name == "resource_policy_0"
+        assert allow_policy.mask == (
+            PERMISSION_BITS[Permission.CAN_VIEW] | PERMISSION_BITS[Permission.CAN_SHARE]
+        )
+        assert allow_policy.deny is False
+        assert allow_policy.terms == ()
+        assert deny_policy.name == "No edits"
+        assert deny_policy.deny is True
+        assert deny_policy.matches({"user": {"id": "user2"}}, {}) is True
+        assert deny_policy.matches({"user": {"id": "user1"}}, {}) is False
+        assert compiled.for_permission("can_edit") == ((deny_policy,), ())
+        assert compiled.for_permission(Permission.CAN_DELETE) == ((), ())
+
+    def test_compiled_once_until_invalidated(self):
+        """Test the compiled form is reused until it is invalidated."""
+        policy_doc = self._policy_doc(
+            [ResourcePolicy(permissions=[Permission.CAN_VIEW], effect=Effect.ALLOW)]
+        )
+
+        compiled = compile_policy_document(policy_doc, "resource_policy", self.engine)
+        assert (
+            compile_policy_document(policy_doc, "resource_policy", self.engine)
+            is compiled
+        )
+
+        policy_doc.policies.append(
+            ResourcePolicy(permissions=[Permission.CAN_EDIT], effect=Effect.ALLOW)
+        )
+        policy_doc.invalidate_compiled()
+        recompiled = compile_policy_document(policy_doc, "resource_policy", self.engine)
+        assert recompiled is not compiled
+        assert len(recompiled.policies) == 2
+
+    def test_compiled_per_filter_engine(self):
+        """Test each engine compiles a document with its own interned terms."""
+        policy_doc = self._policy_doc(
+            [
+                ResourcePolicy(
+                    filter=[Filter(prop="user.id", op="==", value="user1")],
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                )
+            ]
+        )
+        other_engine = FilterEngine()
+
+        compiled = compile_policy_document(policy_doc, "resource_policy", self.engine)
+        other = compile_policy_document(policy_doc, "resource_policy", other_engine)
+
+        assert other is not compiled
+        assert other.policies[0].terms != compiled.policies[0].terms
+        assert self.engine.stats()["terms"]["size"] == 1
+        assert other_engine.stats()["terms"]["size"] == 1
+
+    def test_identical_terms_shared_across_documents(self):
+        """Test identical filter conditions compile to one shared term."""
+        is_creator = Filter(prop="document.creatorId", op="==", value="user.id")
+        is_admin = Filter(prop="teamMembership.role", op="==", value="admin")
+        resource_compiled = compile_policy_document(
+            self._policy_doc(
+                [
+                    ResourcePolicy(
+                        filter=[is_creator, is_admin, is_creator],
+                        permissions=[Permission.CAN_VIEW],
+                        effect=Effect.ALLOW,
+                    )
+                ]
+            ),
+            "resource_policy",
+            self.engine,
+        )
+        user_compiled = compile_policy_document(
+            UserPolicyDocument(
+                policies=[
+                    UserPolicy(
+                        filter=[
+                            Filter(prop="teamMembership.role", op="==", value="admin")
+                        ],
+                        permissions=[Permission.CAN_EDIT],
+                        effect=Effect.ALLOW,
+                    )
+                ]
+            ),
+            "user_policy",
+            self.engine,
+        )
+
+        creator_term, admin_term = resource_compiled.policies[0].terms
+        assert user_compiled.policies[0].terms == (admin_term,)
+
+        # Memoized results are reused instead of evaluating the (empty) context
+        results = {creator_term: True, admin_term: True}
+        assert resource_compiled.policies[0].matches({}, results) is True
+        assert user_compiled.policies[0].matches({}, results) is True
+
+    def test_compiled_policy_has_no_instance_dict(self):
+        """Test compiled policies use __slots__ storage."""
+        compiled = compile_policy_document(
+            self._policy_doc(
+                [ResourcePolicy(permissions=[Permission.CAN_VIEW], effect=Effect.ALLOW)]
+            ),
+            "resource_policy",
+            self.engine,
+        )
+        assert not hasattr(compiled.policies[0], "__dict__")
+        assert not hasattr(compiled, "__dict__")
+
+
+class TestPermissionMaskEvaluation:
+    """Test evaluating every permission in one pass."""
+
+    def setup_method(self):
+        """Setup test instances."""
+        self.evaluator = Evaluator()
+        self.user = User(id="user1", email="test@example.com", name="Test")
+        self.document = Document(
+            id="doc1",
+            title="Test",
+            projectId="proj1",
+            creatorId="user1",
+            deletedAt=None,
+            publicLinkEnabled=False,
+        )
+
+    def test_mask_encoding_round_trip(self):
+        """Test permissions encode to distinct bits and decode in order."""
+        mask = permission_mask(["can_share", Permission.CAN_VIEW])
+
+        assert permissions_from_mask(mask) == [
+            Permission.CAN_VIEW,
+            Permission.CAN_SHARE,
+        ]
+        assert permissions_from_mask(ALL_PERMISSIONS_MASK) == list(Permission)
+        assert len(set(PERMISSION_BITS.values())) == len(Permission)
+
+    def test_mask_matches_single_permission_evaluation(self):
+        """Test the mask agrees with evaluate_permission for every permission."""
+        resource_policy = ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=[
+                ResourcePolicy(
+                    filter=[
+                        Filter(prop="document.creatorId", op="==", value="user.id")
+                    ],
+                    permissions=list(Permission),
+                    effect=Effect.ALLOW,
+                ),
+                ResourcePolicy(
+                    filter=[Filter(prop="user.id", op="==", value="user1")],
+                    permissions=[Permission.CAN_DELETE],
+                    effect=Effect.DENY,
+                ),
+            ],
+        )
+        user_policy = UserPolicyDocument(
+            policies=[
+                UserPolicy(permissions=[Permission.CAN_SHARE], effect=Effect.DENY)
+            ]
+        )
+
+        mask = self.evaluator.evaluate_permission_mask(
+            user=self.user,
+            document=self.document,
+            resource_policy=resource_policy,
+            user_policy=user_policy,
+        )
+
+        assert permissions_from_mask(mask) == [
+            Permission.CAN_VIEW,
+            Permission.CAN_EDIT,
+        ]
+        for permission in Permission:
+            result = self.evaluator.evaluate_permission(
+                user=self.user,
+                document=self.document,
+                permission=permission,
+                resource_policy=resource_policy,
+                user_policy=user_policy,
+            )
+            assert result.allowed == bool(mask & PERMISSION_BITS[permission])
+
+    def test_mask_limited_to_requested_permissions(self):
+        """Test only requested permissions can be reported as allowed."""
+        resource_policy = ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=[
+                ResourcePolicy(permissions=list(Permission), effect=Effect.ALLOW)
+            ],
+        )
+
+        mask = self.evaluator.evaluate_permission_mask(
+            user=self.user,
+            document=self.document,
+            resource_policy=resource_policy,
+            requested_mask=PERMISSION_BITS[Permission.CAN_EDIT],
+        )
+
+        assert mask == PERMISSION_BITS[Permission.CAN_EDIT]
+
+    def test_deleted_document_allows_nothing(self):
+        """Test deleted documents yield an empty mask."""
+        self.document.deletedAt = datetime(2025, 1, 1)
+        resource_policy = ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=[
+                ResourcePolicy(permissions=list(Permission), effect=Effect.ALLOW)
+            ],
+        )
+
+        assert (
+            self.evaluator.evaluate_permission_mask(
+                user=self.user, document=self.document, resource_policy=resource_policy
+            )
+            == 0
+        )
+
+    def test_evaluate_all_permissions_evaluates_shared_filter_once(self):
+        """Test a filter repeated across policies is evaluated only once."""
+        lookups = []
+
+        class CountingContext(dict):
+            def get(self, key, default=None):
+                lookups.append(key)
+                return super().get(key, default)
+
+        build_context = self.evaluator._build_context
+        self.evaluator._build_context = lambda **kwargs: CountingContext(
+            build_context(**kwargs)
+        )
+        creator_filter = [Filter(prop="document.creatorId", op="==", value="user.id")]
+        resource_policy = ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=[
+                ResourcePolicy(
+                    filter=creator_filter,
+                    permissions=[permission],
+                    effect=Effect.ALLOW,
+                )
+                for permission in Permission
+            ],
+        )
+
+        permissions = self.evaluator.evaluate_all_permissions(
+            user=self.user, document=self.document, resource_policy=resource_policy
+        )
+
+        assert permissions == list(Permission)
+        assert sorted(lookups) == ["document", "user"]
+
+
+class TestSharedEvaluator:
+    """Test the process-wide evaluator and its counters."""
+
+    def test_get_evaluator_returns_shared_instance(self):
+        """Test the evaluator and its filter engine are singletons."""
+        evaluator = get_evaluator()
+
+        assert get_evaluator() is evaluator
+        assert evaluator.filter_engine is get_filter_engine()
+
+    def test_stats_count_compiled_reuse(self):
+        """Test a document is compiled on first use and reused afterwards."""
+        evaluator = Evaluator()
+        user = User(id="user1", email="test@example.com", name="Test")
+        document = Document(
+            id="doc1",
+            title="Test",
+            projectId="proj1",
+            creatorId="user1",
+            deletedAt=None,
+            publicLinkEnabled=False,
+        )
+        resource_policy = ResourcePolicyDocument(
+            resource=ResourceInfo(
+                resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+            ),
+            policies=[
+                ResourcePolicy(
+                    filter=[Filter(prop="user.id", op="==", value="user1")],
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                )
+            ],
+        )
+
+        for permission in (Permission.CAN_VIEW, Permission.CAN_EDIT):
+            evaluator.evaluate_permission(
+                user=user,
+                document=document,
+                permission=permission,
+                resource_policy=resource_policy,
+            )
+        evaluator.evaluate_all_permissions(
+            user=user, document=document, resource_policy=resource_policy
+        )
+
+        stats = evaluator.stats()
+        assert stats["evaluations"] == 3
+        assert stats["compiled_misses"] == 1
+        assert stats["compiled_hits"] == 2
+        assert set(stats["filter_engine"]) == {"filters", "terms"}
+        assert stats["filter_engine"]["terms"]["size"] >= 1
@@ -3,6 +3,8 @@
 Tests all filter operators and property resolution logic.
 """
 
+from datetime import datetime
+
 from src.components.filter_engine import FilterEngine
 from src.models.common import Filter, FilterOperator
 
@@ -295,3 +297,200 @@ class TestEdgeCases:
         filter_cond = Filter(prop="", op=FilterOperator.EQ, value="test")
         context = {"user": {"id": "user1"}}
         assert self.engine.evaluate_filter(filter_cond, context) is False
+
+
+class TestFilterCompilation:
+    """Test compiled filter predicates."""
+
+    def setup_method(self):
+        """Setup test instance."""
+        self.engine = FilterEngine()
+
+    def test_compile_empty_filters(self):
+        """Test compiling no filters yields an always-true predicate."""
+        assert self.engine.compile([])({"user": {}}) is True
+        assert self.engine.compile(None)({"user": {}}) is True
+
+    def test_compile_reference_value(self):
+        """Test compiled predicate resolves property references."""
+        predicate = self.engine.compile(
+            [Filter(prop="document.creatorId", op=FilterOperator.EQ, value="user.id")]
+        )
+        assert predicate({"user": {"id": "u1"}, "document": {"creatorId": "u1"}})
+        assert not predicate({"user": {"id": "u2"}, "document": {"creatorId": "u1"}})
+
+    def test_compile_reference_root_missing_is_literal(self):
+        """Test dotted value is a literal when its root is not in the context."""
+        predicate = self.engine.compile(
+            [Filter(prop="document.title", op=FilterOperator.EQ, value="team.x")]
+        )
+        assert predicate({"document": {"title": "team.x"}}) is True
+
+    def test_compile_multiple_filters_and_logic(self):
+        """Test compiled predicate applies AND logic."""
+        predicate = self.engine.compile(
+            [
+                Filter(prop="user.role", op=FilterOperator.EQ, value="admin"),
+                Filter(prop="user.age", op=FilterOperator.GTE, value=18),
+            ]
+        )
+        assert predicate({"user": {"role": "admin", "age": 25}}) is True
+        assert predicate({"user": {"role": "admin", "age": 15}}) is False
+
+    def test_compile_is_memoized(self):
+        """Test identical filter lists share one compiled predicate."""
+        first = self.engine.compile(
+            [Filter(prop="user.role", op=FilterOperator.IN, value=["a", "b"])]
+        )
+        second = self.engine.compile(
+            [Filter(prop="user.role", op=FilterOperator.IN, value=["a", "b"])]
+        )
+        assert first is second
+
+    def test_compile_matches_interpreted_evaluation(self):
+        """Test compiled predicates agree with evaluate_filter for all operators."""
+        from src.models.entities import User
+
+        contexts = [
+            {"user": {"id": "u1", "age": 20, "tags": ["x", "y"]}},
+            {"user": {"id": "u2", "age": None, "tags": "xyz"}},
+            {"user": User(id="u1", email="a@example.com", name="A")},
+            {"user": {}},
+        ]
+        values = ["u1", 18, ["u1", "x"], "x", None, "user.id"]
+        for op in FilterOperator:
+            for prop in ("user.id", "user.age", "user.tags", "user.missing.deep"):
+                for value in values:
+                    filter_cond = Filter(prop=prop, op=op, value=value)
+                    predicate = self.engine.compile([filter_cond])
+                    for context in contexts:
+                        assert predicate(context) == self.engine.evaluate_filter(
+                            filter_cond, context
+                        ), (prop, op, value, context)
+
+
+class TestInputReader:
+    """Test reading the context values a filter list depends on."""
+
+    def setup_method(self):
+        """Setup test instance."""
+        self.engine = FilterEngine()
+
+    def test_reads_props_and_references(self):
+        """Test props and reference values are read, literals are not."""
+        read = self.engine.compile_reader(
+            [
+                Filter(prop="document.creatorId", op="==", value="user.id"),
+                Filter(prop="team.plan", op="in", value=["pro", "enterprise"]),
+            ]
+        )
+        context = {
+            "user": {"id": "user1", "name": "Test"},
+            "document": {"creatorId": "user1"},
+        }
+
+        assert read(context) == (
+            (True, "user1"),
+            (False, None),
+            (True, "user1"),
+        )
+        # Fields no filter reads do not affect the reading
+        assert read({**context, "user": {"id": "user1", "name": "Other"}}) == (
+            read(context)
+        )
+        assert read({**context, "team": {"plan": "pro"}}) != read(context)
+
+    def test_no_filters_read_nothing(self):
+        """Test an empty filter list reads nothing."""
+        assert self.engine.compile_reader(None)({"user": {"id": "user1"}}) == ()
+
+
+class TestMembershipCompilation:
+    """Test hash-set compilation of literal in / not in operands."""
+
+    def setup_method(self):
+        """Setup test instance."""
+        self.engine = FilterEngine()
+
+    def test_large_allow_list(self):
+        """Test large literal lists match like the interpreted operator."""
+        allowed = [f"user{i}" for i in range(10000)]
+        in_filter = Filter(prop="user.id", op=FilterOperator.IN, value=allowed)
+        not_in_filter = Filter(prop="user.id", op=FilterOperator.NOT_IN, value=allowed)
+
+        for user_id in ("user9999", "user10000"):
+            context = {"user": {"id": user_id}}
+            assert self.engine.compile([in_filter])(context) == (
+                self.engine.evaluate_filter(in_filter, context)
+            )
+            assert self.engine.compile([not_in_filter])(context) == (
+                self.engine.evaluate_filter(not_in_filter, context)
+            )
+
+    def test_numeric_members_compare_by_equality(self):
+        """Test hash-set lookup keeps list equality semantics for numbers."""
+        predicate = self.engine.compile(
+            [Filter(prop="team.size", op=FilterOperator.IN, value=[1, 2.5])]
+        )
+        assert predicate({"team": {"size": 1.0}}) is True
+        assert predicate({"team": {"size": 3}}) is False
+        assert predicate({"team": {}}) is False
+
+    def test_unhashable_property_value(self):
+        """Test an unhashable property value is never a member."""
+        in_predicate = self.engine.compile(
+            [Filter(prop="user.tags", op=FilterOperator.IN, value=["a", "b"])]
+        )
+        not_in_predicate = self.engine.compile(
+            [Filter(prop="user.tags", op=FilterOperator.NOT_IN, value=["a", "b"])]
+        )
+        context = {"user": {"tags": ["a"]}}
+        assert in_predicate(context) is False
+        assert not_in_predicate(context) is True
+
+    def test_unhashable_members_fall_back_to_list(self):
+        """Test literal lists with unhashable elements still work."""
+        predicate = self.engine.compile(
+            [Filter(prop="user.pair", op=FilterOperator.IN, value=[["a", 1], "b"])]
+        )
+        assert predicate({"user": {"pair": ["a", 1]}}) is True
+        assert predicate({"user": {"pair": "b"}}) is True
+        assert predicate({"user": {"pair": "c"}}) is False
+
+
+def _outcome(evaluate, context):
+    """Result of an evaluation, or the type of the exception it raised."""
+    try:
+        return evaluate(context)
+    except Exception as e:
+        return type(e)
+
+
+class TestOperatorSpecialization:
+    """Test compiled (dispatched and specialized) operators match interpretation."""
+
+    def test_compiled_matches_interpreted(self):
+        """Test every operator/literal/property combination agrees."""
+        engine = FilterEngine()
+        literals = ["abc", "b", 5, 2.5, True, datetime(2025, 1, 1), ["a", 5], None]
+        properties = [
+            "abc",
+            "x",
+            5,
+            7.0,
+            False,
+            datetime(2024, 1, 1),
+            ["abc", 5],
+            {"abc", "b"},
+            None,
+        ]
+
+        for op in FilterOperator:
+            for value in literals:
+                filter_cond = Filter(prop="user.attr", op=op, value=value)
+                predicate = engine.compile([filter_cond])
+                for prop_value in properties:
+                    context = {"user": {"attr": prop_value}}
+                    assert _outcome(predicate, context) == _outcome(
+                        lambda c, f=filter_cond: engine.evaluate_filter(f, c), context
+                    ), (op, value, prop_value)
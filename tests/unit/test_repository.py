@@ -1,7 +1,53 @@
 """Unit tests for Repository (database layer)."""
 
-from src.models.common import Effect, Permission
-from src.models.policies import ResourceInfo, ResourcePolicy, ResourcePolicyDocument
+import asyncio
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from src.cache import LRUCache
+from src.components.builder import Builder, PolicyOptions
+from src.components.compiled_policy import CompiledPolicySet
+from src.components.evaluator import Evaluator
+from src.database.async_repository import (
+    AsyncRepository,
+    get_executor,
+    shutdown_executor,
+)
+from src.database.connection import DatabaseConfig, DatabaseConnection
+from src.database.repository import PolicyGrant, Repository
+from src.models.common import (
+    Effect,
+    Filter,
+    Permission,
+    permission_mask,
+    permissions_from_mask,
+)
+from src.models.entities import Document, Team, TeamMembership, User
+from src.models.policies import (
+    ResourceInfo,
+    ResourcePolicy,
+    ResourcePolicyDocument,
+    UserPolicy,
+    UserPolicyDocument,
+)
+
+
+def _pooled_database(tmp_path, **pool_settings) -> DatabaseConnection:
+    """Create a migrated file database served from a connection pool."""
+    db = DatabaseConnection(
+        DatabaseConfig(
+            db_type="sqlite", sqlite_path=str(tmp_path / "test.db"), **pool_settings
+        )
+    )
+    with db.connection() as conn:
+        for migration in ("001_initial_schema", "002_add_indexes", "004_policy_grants"):
+            with open(f"migrations/{migration}.sql") as f:
+                conn.executescript(f.read())
+    return db
 
 
 class TestUserOperations:
@@ -105,8 +151,8 @@ class TestPolicyOperations:
         )
 
         # Save
-        result = repository.save_resource_policy(policy_doc)
-        assert result is True
+        version = repository.save_resource_policy(policy_doc)
+        assert version == 1
 
         # Retrieve
         retrieved = repository.get_resource_policy("urn:resource:team1:proj1:doc1")
@@ -136,7 +182,7 @@ class TestPolicyOperations:
         )
 
         # Save first version
-        repository.save_resource_policy(policy_doc)
+        assert repository.save_resource_policy(policy_doc) == 1
 
         # Update with new version
         policy_doc.policies.append(
@@ -147,8 +193,664 @@ class TestPolicyOperations:
                 filter=[],
             )
         )
-        repository.save_resource_policy(policy_doc)
+        assert repository.save_resource_policy(policy_doc) == 2
 
         # Retrieve and verify
         retrieved = repository.get_resource_policy("urn:resource:team1:proj1:doc1")
         assert len(retrieved.policies) == 2
+
+        rows = test_db.get_connection().execute(
+            "SELECT version FROM resource_policies WHERE resource_id = ?",
+            ("urn:resource:team1:proj1:doc1",),
+        )
+        assert [row["version"] for row in rows] == [2]
+
+    def test_save_user_policy_bumps_version(self, repository):
+        """Test saving a user policy again bumps its version."""
+        policy_doc = UserPolicyDocument(
+            policies=[
+                UserPolicy(
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                    filter=[],
+                )
+            ]
+        )
+
+        assert repository.save_user_policy("user1", policy_doc) == 1
+        assert repository.save_user_policy("user1", policy_doc) == 2
+        assert repository.get_user_policy("user1") is not None
+
+    def test_failed_user_policy_save_rolls_back(self, repository, test_db):
+        """Test a failing UPSERT does not leave a transaction open."""
+        policy_doc = UserPolicyDocument(policies=[])
+        repository.save_user_policy("user1", policy_doc)
+
+        conn = test_db.get_connection()
+        conn.execute("""
+            CREATE TRIGGER reject_user_policy_update BEFORE UPDATE ON user_policies
+            BEGIN SELECT RAISE(ABORT, 'rejected'); END
+        """)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            repository.save_user_policy("user1", policy_doc)
+
+        assert not conn.in_transaction
+        row = conn.execute(
+            "SELECT version FROM user_policies WHERE user_id = ?", ("user1",)
+        ).fetchone()
+        assert row["version"] == 1
+
+    @staticmethod
+    def _policy_doc(resource_id: str) -> ResourcePolicyDocument:
+        return ResourcePolicyDocument(
+            resource=ResourceInfo(resourceId=resource_id, creatorId="user1"),
+            policies=[
+                ResourcePolicy(
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                    filter=[],
+                )
+            ],
+        )
+
+    def test_save_resource_policies_bulk(self, repository):
+        """Test bulk saves insert new documents and bump existing ones."""
+        repository.save_resource_policy(
+            self._policy_doc("urn:resource:team1:proj1:doc1")
+        )
+
+        versions = repository.save_resource_policies_bulk(
+            [
+                self._policy_doc("urn:resource:team1:proj1:doc1"),
+                self._policy_doc("urn:resource:team1:proj1:doc2"),
+            ]
+        )
+
+        assert versions == {
+            "urn:resource:team1:proj1:doc1": 2,
+            "urn:resource:team1:proj1:doc2": 1,
+        }
+        assert repository.get_resource_policy("urn:resource:team1:proj1:doc2")
+        assert repository.save_resource_policies_bulk([]) == {}
+
+    def test_save_resource_policies_bulk_is_atomic(self, test_db, repository):
+        """Test a failing document rolls back the whole bulk save."""
+        test_db.get_connection().execute("""
+            CREATE TRIGGER reject_bad_policy BEFORE INSERT ON resource_policies
+            WHEN NEW.resource_id = 'urn:resource:team1:proj1:bad'
+            BEGIN SELECT RAISE(ABORT, 'rejected'); END
+            """)
+
+        with pytest.raises(sqlite3.DatabaseError):
+            repository.save_resource_policies_bulk(
+                [
+                    self._policy_doc("urn:resource:team1:proj1:doc1"),
+                    self._policy_doc("urn:resource:team1:proj1:bad"),
+                ]
+            )
+
+        assert repository.get_resource_policy("urn:resource:team1:proj1:doc1") is None
+
+    def test_find_resources_granting(self, repository):
+        """Test finding resources whose policy grants a permission to a user."""
+        builder = Builder()
+        grants = [
+            ("urn:resource:team1:proj1:doc1", Permission.CAN_EDIT, Effect.ALLOW),
+            ("urn:resource:team1:proj1:doc2", Permission.CAN_VIEW, Effect.ALLOW),
+            ("urn:resource:team1:proj1:doc3", Permission.CAN_EDIT, Effect.DENY),
+            ("urn:resource:team2:proj1:doc1", Permission.CAN_EDIT, Effect.ALLOW),
+        ]
+        for resource_id, action, effect in grants:
+            repository.save_resource_policy(
+                builder.build_policy_document(
+                    PolicyOptions(
+                        resourceId=resource_id,
+                        action=action,
+                        target="user123",
+                        effect=effect,
+                    )
+                )
+            )
+        repository.save_resource_policy(
+            builder.build_policy_document(
+                PolicyOptions(
+                    resourceId="urn:resource:team1:proj1:doc4",
+                    action=Permission.CAN_EDIT,
+                    target="user456",
+                )
+            )
+        )
+
+        assert repository.find_resources_granting("user123", "can_edit") == [
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team2:proj1:doc1",
+        ]
+        assert repository.find_resources_granting("user123", Permission.CAN_VIEW) == [
+            "urn:resource:team1:proj1:doc2"
+        ]
+        assert repository.find_resources_granting("user789", "can_edit") == []
+
+    def test_iter_resource_policies_filters(self, test_db, repository):
+        """Test export streaming by URN prefix and updated_at watermark."""
+        repository.save_resource_policies_bulk(
+            [
+                self._policy_doc("urn:resource:team1:proj1:doc1"),
+                self._policy_doc("urn:resource:team1:proj10:doc1"),
+                self._policy_doc("urn:resource:team2:proj1:doc1"),
+            ]
+        )
+        test_db.get_connection().execute(
+            "UPDATE resource_policies SET updated_at = '2024-01-01 00:00:00' "
+            "WHERE resource_id = 'urn:resource:team2:proj1:doc1'"
+        )
+        test_db.commit()
+
+        rows = list(repository.iter_resource_policies(batch_size=2))
+        assert [row.resource_id for row in rows] == [
+            "urn:resource:team2:proj1:doc1",
+            "urn:resource:team1:proj10:doc1",
+            "urn:resource:team1:proj1:doc1",
+        ]
+        assert rows[0].updated_at == datetime(2024, 1, 1)
+        assert json.loads(rows[0].policy_document)["resource"]["resourceId"] == (
+            "urn:resource:team2:proj1:doc1"
+        )
+
+        by_project = repository.iter_resource_policies("urn:resource:team1:proj1:")
+        assert [row.resource_id for row in by_project] == [
+            "urn:resource:team1:proj1:doc1"
+        ]
+
+        recent = repository.iter_resource_policies(
+            updated_since=datetime(2024, 1, 1, 0, 0, 1)
+        )
+        assert {row.resource_id for row in recent} == {
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team1:proj10:doc1",
+        }
+
+
+class TestPolicyGrants:
+    """Test the principal to resource reverse index."""
+
+    @staticmethod
+    def _policy_doc(resource_id: str, *policies: ResourcePolicy):
+        return ResourcePolicyDocument(
+            resource=ResourceInfo(resourceId=resource_id, creatorId="user1"),
+            policies=list(policies),
+        )
+
+    def test_grants_follow_saved_documents(self, repository):
+        """Test grants are extracted on save and replaced on the next save."""
+        resource_id = "urn:resource:team1:proj1:doc1"
+        repository.save_resource_policy(
+            self._policy_doc(
+                resource_id,
+                ResourcePolicy(
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                    filter=[Filter(prop="user.id", op="==", value="user2")],
+                ),
+                ResourcePolicy(
+                    permissions=[Permission.CAN_EDIT],
+                    effect=Effect.ALLOW,
+                    filter=[
+                        Filter(prop="user.id", op="in", value=["user2", "user3"]),
+                        Filter(prop="team.id", op="==", value="team1"),
+                    ],
+                ),
+                ResourcePolicy(
+                    permissions=[Permission.CAN_DELETE],
+                    effect=Effect.DENY,
+                    filter=[Filter(prop="user.id", op="==", value="user3")],
+                ),
+                ResourcePolicy(
+                    permissions=[Permission.CAN_SHARE],
+                    effect=Effect.ALLOW,
+                    filter=[
+                        Filter(prop="user.id", op="==", value="document.creatorId")
+                    ],
+                ),
+            )
+        )
+
+        assert repository.get_principal_grants("user2") == [
+            PolicyGrant(
+                resource_id,
+                "user",
+                "user2",
+                permission_mask([Permission.CAN_VIEW, Permission.CAN_EDIT]),
+                "allow",
+            )
+        ]
+        assert [
+            (grant.effect, permissions_from_mask(grant.permission_mask))
+            for grant in repository.get_principal_grants("user3")
+        ] == [("allow", [Permission.CAN_EDIT]), ("deny", [Permission.CAN_DELETE])]
+        assert repository.get_principal_grants("team1", "team")[0].resource_id == (
+            resource_id
+        )
+        assert repository.get_principal_grants("document.creatorId") == []
+        assert (
+            repository.get_principal_grants("user2", permission=Permission.CAN_DELETE)
+            == []
+        )
+
+        # Saving a new document drops the grants of the old one
+        repository.save_resource_policy(
+            self._policy_doc(
+                resource_id,
+                ResourcePolicy(
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                    filter=[Filter(prop="user.id", op="==", value="user4")],
+                ),
+            )
+        )
+        assert repository.get_principal_grants("user2") == []
+        assert [
+            grant.resource_id for grant in repository.get_principal_grants("user4")
+        ] == [resource_id]
+
+    def test_bulk_save_and_rebuild(self, test_db, repository):
+        """Test bulk saves maintain grants and rebuild restores them."""
+        repository.save_resource_policies_bulk(
+            [
+                self._policy_doc(
+                    f"urn:resource:team1:proj1:doc{index}",
+                    ResourcePolicy(
+                        permissions=[Permission.CAN_VIEW],
+                        effect=Effect.ALLOW,
+                        filter=[Filter(prop="user.id", op="==", value="user2")],
+                    ),
+                )
+                for index in range(3)
+            ]
+        )
+        grants = repository.get_principal_grants("user2", permission="can_view")
+        assert [grant.resource_id for grant in grants] == [
+            "urn:resource:team1:proj1:doc0",
+            "urn:resource:team1:proj1:doc1",
+            "urn:resource:team1:proj1:doc2",
+        ]
+
+        test_db.get_connection().execute("DELETE FROM policy_grants")
+        test_db.commit()
+        assert repository.get_principal_grants("user2") == []
+
+        assert repository.rebuild_policy_grants() == 3
+        assert repository.get_principal_grants("user2") == grants
+
+    def test_rebuild_with_single_connection_pool(self, tmp_path):
+        """Test rebuilding needs no connection besides its transaction's."""
+        db = _pooled_database(tmp_path, pool_max_size=1, pool_timeout=0.1)
+        repository = Repository(db)
+        repository.save_resource_policy(
+            self._policy_doc(
+                "urn:resource:team1:proj1:doc1",
+                ResourcePolicy(
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                    filter=[Filter(prop="team.id", op="in", value=["team1", "team2"])],
+                ),
+            )
+        )
+
+        assert repository.rebuild_policy_grants() == 2
+        assert [
+            grant.resource_id
+            for grant in repository.get_principal_grants("team2", "team")
+        ] == ["urn:resource:team1:proj1:doc1"]
+        db.close()
+
+
+class TestEvaluationContextLoading:
+    """Test single round-trip evaluation context loading."""
+
+    def _insert_entities(self, test_db):
+        cursor = test_db.get_connection().cursor()
+        cursor.execute(
+            "INSERT INTO users (id, email, name) VALUES (?, ?, ?)",
+            ("user1", "test@example.com", "Test"),
+        )
+        cursor.execute(
+            "INSERT INTO teams (id, name, plan) VALUES (?, ?, ?)",
+            ("team1", "Team", "pro"),
+        )
+        cursor.execute(
+            "INSERT INTO projects (id, name, team_id, visibility) VALUES (?, ?, ?, ?)",
+            ("proj1", "Project", "team1", "private"),
+        )
+        cursor.execute(
+            "INSERT INTO documents (id, title, project_id, creator_id, deleted_at, public_link_enabled) VALUES (?, ?, ?, ?, ?, ?)",
+            ("doc1", "Doc", "proj1", "user1", None, True),
+        )
+        cursor.execute(
+            "INSERT INTO team_memberships (user_id, team_id, role) VALUES (?, ?, ?)",
+            ("user1", "team1", "admin"),
+        )
+        cursor.execute(
+            "INSERT INTO project_memberships (user_id, project_id, role) VALUES (?, ?, ?)",
+            ("user1", "proj1", "viewer"),
+        )
+        cursor.execute(
+            "INSERT INTO user_policies (user_id, policy_document) VALUES (?, ?)",
+            ("user1", '{"policies": []}'),
+        )
+        test_db.commit()
+
+    def test_load_full_context(self, test_db, repository):
+        """Test loading every entity and policy in one call."""
+        self._insert_entities(test_db)
+        repository.save_resource_policy(
+            ResourcePolicyDocument(
+                resource=ResourceInfo(
+                    resourceId="urn:resource:team1:proj1:doc1", creatorId="user1"
+                ),
+                policies=[],
+            )
+        )
+
+        context = repository.load_evaluation_context(
+            "user1", "urn:resource:team1:proj1:doc1"
+        )
+
+        assert context.user.email == "test@example.com"
+        assert context.document.publicLinkEnabled is True
+        assert context.document.is_deleted is False
+        assert context.team.plan == "pro"
+        assert context.project.teamId == "team1"
+        assert context.team_membership.role == "admin"
+        assert context.project_membership.role == "viewer"
+        assert context.resource_policy.parse().resource.creatorId == "user1"
+        assert context.user_policy.parse().policies == []
+        assert context.resource_policy.key[:3] == (
+            "resource_policies",
+            "urn:resource:team1:proj1:doc1",
+            1,
+        )
+        assert context.resource_policy_version == 1
+        assert context.user_policy_version == 1
+
+    def test_load_context_missing_entities(self, test_db, repository):
+        """Test missing entities are returned as None."""
+        self._insert_entities(test_db)
+
+        context = repository.load_evaluation_context(
+            "user2", "urn:resource:team2:proj1:doc9"
+        )
+
+        assert context.user is None
+        assert context.document is None
+        assert context.team is None
+        assert context.team_membership is None
+        assert context.project is not None
+        assert context.project_membership is None
+        assert context.resource_policy is None
+        assert context.user_policy is None
+
+    def test_load_contexts_batch(self, test_db, repository):
+        """Test loading many contexts with shared set-based queries."""
+        self._insert_entities(test_db)
+
+        contexts = repository.load_evaluation_contexts(
+            [
+                ("user1", "urn:resource:team1:proj1:doc1"),
+                ("user1", "urn:resource:team1:proj1:doc1"),
+                ("user2", "urn:resource:team1:proj1:doc1"),
+            ]
+        )
+
+        assert len(contexts) == 2
+        own = contexts[("user1", "urn:resource:team1:proj1:doc1")]
+        assert own.user.id == "user1"
+        assert own.team_membership.role == "admin"
+        assert own.project_membership.role == "viewer"
+        assert own.user_policy is not None
+
+        other = contexts[("user2", "urn:resource:team1:proj1:doc1")]
+        assert other.user is None
+        assert other.document.id == "doc1"
+        assert other.team_membership is None
+
+
+class TestCompiledPolicyCache:
+    """Test caching of compiled stored policy documents."""
+
+    urn = "urn:resource:team1:proj1:doc1"
+
+    def _policy_doc(self, description):
+        return ResourcePolicyDocument(
+            resource=ResourceInfo(resourceId=self.urn, creatorId="user1"),
+            policies=[
+                ResourcePolicy(
+                    description=description,
+                    permissions=[Permission.CAN_VIEW],
+                    effect=Effect.ALLOW,
+                    filter=[],
+                )
+            ],
+        )
+
+    def _stamp(self, repository, evaluator):
+        context = repository.load_evaluation_context("user1", self.urn)
+        return evaluator.decision_stamp(
+            user=context.user,
+            document=context.document,
+            resource_policy=context.resource_policy,
+            user_policy=context.user_policy,
+            team=context.team,
+            project=context.project,
+            team_membership=context.team_membership,
+            project_membership=context.project_membership,
+        )
+
+    def _matched(self, repository, evaluator):
+        context = repository.load_evaluation_context("user1", self.urn)
+        result = evaluator.evaluate_permission(
+            user=context.user,
+            document=context.document,
+            permission=Permission.CAN_VIEW,
+            resource_policy=context.resource_policy,
+        )
+        return result.matched_policies
+
+    def test_compiled_form_reused_until_saved(self, test_db, repository):
+        """Test only the compiled form is cached and a save bumps its key."""
+        TestEvaluationContextLoading()._insert_entities(test_db)
+        cache = LRUCache(max_size=16)
+        evaluator = Evaluator(policy_cache=cache)
+        repository.save_resource_policy(self._policy_doc("V1"))
+
+        assert self._matched(repository, evaluator) == ["V1"]
+        assert self._matched(repository, evaluator) == ["V1"]
+        assert cache.stats()["hits"] == 1
+        assert evaluator.stats()["compiled_hits"] == 1
+
+        context = repository.load_evaluation_context("user1", self.urn)
+        assert isinstance(cache.get(context.resource_policy.key), CompiledPolicySet)
+
+        repository.save_resource_policy(self._policy_doc("V2"))
+        assert self._matched(repository, evaluator) == ["V2"]
+        assert len(cache) == 2
+
+    def test_recreated_document_not_served_from_cache(self, test_db, repository):
+        """Test a deleted and re-saved document is not served its old form."""
+        TestEvaluationContextLoading()._insert_entities(test_db)
+        evaluator = Evaluator(policy_cache=LRUCache(max_size=16))
+        assert repository.save_resource_policy(self._policy_doc("V1")) == 1
+        assert self._matched(repository, evaluator) == ["V1"]
+        before = self._stamp(repository, evaluator)
+
+        cursor = test_db.get_connection().cursor()
+        cursor.execute(
+            "DELETE FROM resource_policies WHERE resource_id = ?", (self.urn,)
+        )
+        test_db.commit()
+        assert repository.save_resource_policy(self._policy_doc("Recreated")) == 1
+
+        assert self._matched(repository, evaluator) == ["Recreated"]
+        assert repository.get_resource_policy(self.urn).policies[0].description == (
+            "Recreated"
+        )
+        assert self._stamp(repository, evaluator) != before
+
+    def test_decision_stamp_tracks_filtered_values(self, test_db, repository):
+        """Test the stamp changes with the values filters read, and only those."""
+        TestEvaluationContextLoading()._insert_entities(test_db)
+        evaluator = Evaluator(policy_cache=LRUCache(max_size=16))
+        repository.save_resource_policy(
+            ResourcePolicyDocument(
+                resource=ResourceInfo(resourceId=self.urn, creatorId="user1"),
+                policies=[
+                    ResourcePolicy(
+                        permissions=[Permission.CAN_EDIT],
+                        effect=Effect.ALLOW,
+                        filter=[
+                            Filter(prop="teamMembership.role", op="==", value="admin"),
+                            Filter(prop="document.creatorId", op="==", value="user.id"),
+                        ],
+                    )
+                ],
+            )
+        )
+
+        before = self._stamp(repository, evaluator)
+        assert self._stamp(repository, evaluator) == before
+
+        # A field no filter reads does not change the stamp
+        cursor = test_db.get_connection().cursor()
+        cursor.execute("UPDATE users SET name = ? WHERE id = ?", ("Renamed", "user1"))
+        test_db.commit()
+        assert self._stamp(repository, evaluator) == before
+
+        cursor.execute(
+            "UPDATE team_memberships SET role = ? WHERE user_id = ? AND team_id = ?",
+            ("viewer", "user1", "team1"),
+        )
+        test_db.commit()
+        assert self._stamp(repository, evaluator) != before
+
+
+class TestAsyncRepository:
+    """Test the awaitable repository facade."""
+
+    def test_calls_run_off_the_event_loop(self, test_db, repository):
+        """Test async methods return the same results as the sync ones."""
+        TestEvaluationContextLoading()._insert_entities(test_db)
+        executor = ThreadPoolExecutor(max_workers=1)
+        async_repository = AsyncRepository(repository, executor=executor)
+        urn = "urn:resource:team1:proj1:doc1"
+
+        async def run():
+            user = await async_repository.get_user("user1")
+            context = await async_repository.load_evaluation_context("user1", urn)
+            await async_repository.save_resource_policy(
+                ResourcePolicyDocument(
+                    resource=ResourceInfo(resourceId=urn, creatorId="user1"),
+                    policies=[],
+                )
+            )
+            policy = await async_repository.get_resource_policy(urn)
+            return user, context, policy
+
+        user, context, policy = asyncio.run(run())
+        executor.shutdown()
+
+        assert user.email == "test@example.com"
+        assert context.team_membership.role == "admin"
+        assert policy.resource.resourceId == urn
+
+    def test_executor_sized_before_connect(self, tmp_path):
+        """Test the executor is sized from the configuration, not the pool."""
+        shutdown_executor()
+        db = DatabaseConnection(
+            DatabaseConfig(
+                db_type="sqlite",
+                sqlite_path=str(tmp_path / "test.db"),
+                pool_max_size=4,
+            )
+        )
+        try:
+            assert db.pool is None
+            assert get_executor(db)._max_workers == 4
+        finally:
+            shutdown_executor()
+
+        memory_db = DatabaseConnection(
+            DatabaseConfig(db_type="sqlite", sqlite_path=":memory:", pool_max_size=4)
+        )
+        try:
+            assert get_executor(memory_db)._max_workers == 1
+        finally:
+            shutdown_executor()
+
+    def test_calls_return_connections_to_pool(self, tmp_path):
+        """Test executor threads hold no connection between calls."""
+        db = _pooled_database(tmp_path, pool_max_size=2, pool_timeout=0.1)
+        executor = ThreadPoolExecutor(max_workers=2)
+        async_repository = AsyncRepository(Repository(db), executor=executor)
+
+        async def run():
+            await asyncio.gather(
+                *(async_repository.get_user(f"user{i}") for i in range(10))
+            )
+
+        asyncio.run(run())
+        executor.shutdown()
+
+        assert db.pool.idle == db.pool.size
+        db.close()
+
+    def test_export_with_every_connection_in_use(self, tmp_path):
+        """Test export needs no connection beyond the executor's own."""
+        db = _pooled_database(tmp_path, pool_max_size=1, pool_timeout=0.1)
+        executor = ThreadPoolExecutor(max_workers=1)
+        async_repository = AsyncRepository(Repository(db), executor=executor)
+        urn = "urn:resource:team1:proj1:doc{}"
+
+        async def run():
+            for doc in range(3):
+                await async_repository.save_resource_policy(
+                    ResourcePolicyDocument(
+                        resource=ResourceInfo(
+                            resourceId=urn.format(doc), creatorId="user1"
+                        ),
+                        policies=[],
+                    )
+                )
+            return [
+                row.resource_id
+                async for row in async_repository.iter_resource_policies(batch_size=2)
+            ]
+
+        exported = asyncio.run(run())
+        executor.shutdown()
+        db.close()
+
+        assert sorted(exported) == [urn.format(doc) for doc in range(3)]
+
+
+class TestRowMapping:
+    """Test entities are mapped from rows by column name."""
+
+    def test_entities_match_expected_models(self, test_db, repository):
+        """Test every column lands in the right model field."""
+        TestEvaluationContextLoading()._insert_entities(test_db)
+
+        assert repository.get_user("user1") == User(
+            id="user1", email="test@example.com", name="Test"
+        )
+        assert repository.get_team("team1") == Team(id="team1", name="Team", plan="pro")
+        assert repository.get_document("doc1") == Document(
+            id="doc1",
+            title="Doc",
+            projectId="proj1",
+            creatorId="user1",
+            deletedAt=None,
+            publicLinkEnabled=True,
+        )
+        assert repository.get_team_membership("user1", "team1") == TeamMembership(
+            userId="user1", teamId="team1", role="admin"
+        )
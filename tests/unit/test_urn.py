@@ -0,0 +1,91 @@
+"""Unit tests for resource URN parsing."""
+
+from src.components.evaluator import Evaluator
+from src.models.urn import ResourceUrn, build_resource_urn, parse_urn
+
+
+class TestParseUrn:
+    """Test parsing URNs into ResourceUrn."""
+
+    def test_parse_valid(self):
+        """Test a concrete URN parses into its components."""
+        urn = parse_urn("urn:resource:team1:proj1:doc1")
+
+        assert urn == ResourceUrn("team1", "proj1", "doc1")
+        assert urn.team_id == "team1"
+        assert urn.project_id == "proj1"
+        assert urn.doc_id == "doc1"
+        assert not urn.is_wildcard
+        assert str(urn) == "urn:resource:team1:proj1:doc1"
+
+    def test_parse_invalid(self):
+        """Test malformed URNs are rejected."""
+        for value in [
+            "not-a-urn",
+            "urn:resource:team1:proj1",
+            "urn:resource:team-1:proj1:doc1",
+            "urn:resource:*:proj1:doc1",
+            "urn:resource:team1:proj1:doc1:extra",
+        ]:
+            assert parse_urn(value) is None
+            assert parse_urn(value, allow_wildcard=True) is None
+
+    def test_parse_cached(self):
+        """Test repeated parses return the cached object."""
+        value = "urn:resource:teamCached:proj1:doc1"
+
+        assert parse_urn(value) is parse_urn(value)
+
+    def test_wildcards_only_when_allowed(self):
+        """Test wildcard patterns need allow_wildcard."""
+        assert parse_urn("urn:resource:team1:proj1:*") is None
+        assert parse_urn("urn:resource:team1:*:*") is None
+
+        project_docs = parse_urn("urn:resource:team1:proj1:*", allow_wildcard=True)
+        team_docs = parse_urn("urn:resource:team1:*:*", allow_wildcard=True)
+
+        assert project_docs.is_wildcard
+        assert team_docs == ResourceUrn("team1", "*", "*")
+
+    def test_wildcard_project_requires_wildcard_document(self):
+        """Test a wildcard project with a concrete document is rejected."""
+        assert parse_urn("urn:resource:team1:*:doc1", allow_wildcard=True) is None
+
+    def test_matches(self):
+        """Test wildcard patterns match the resources under them."""
+        doc = parse_urn("urn:resource:team1:proj1:doc1")
+        team_docs = ResourceUrn("team1", "*", "*")
+        project_docs = ResourceUrn("team1", "proj1", "*")
+
+        assert team_docs.matches(doc)
+        assert project_docs.matches(doc)
+        assert doc.matches(doc)
+        assert not ResourceUrn("team2", "*", "*").matches(doc)
+        assert not ResourceUrn("team1", "proj2", "*").matches(doc)
+        assert not ResourceUrn("team1", "proj1", "doc2").matches(doc)
+
+    def test_prefix(self):
+        """Test the prefix shared by the resources a URN matches."""
+        assert ResourceUrn("team1", "*", "*").prefix == "urn:resource:team1:"
+        assert ResourceUrn("team1", "proj1", "*").prefix == "urn:resource:team1:proj1:"
+        assert ResourceUrn("team1", "proj1", "doc1").prefix == (
+            "urn:resource:team1:proj1:doc1"
+        )
+
+    def test_build_resource_urn(self):
+        """Test building round-trips through parsing."""
+        value = build_resource_urn("team1", "proj1", "doc1")
+
+        assert value == "urn:resource:team1:proj1:doc1"
+        assert parse_urn(value) == ("team1", "proj1", "doc1")
+
+    def test_evaluator_delegates(self):
+        """Test Evaluator.extract_urn_components uses the shared parser."""
+        value = "urn:resource:team1:proj1:doc1"
+
+        assert Evaluator.extract_urn_components(value) is parse_urn(value)
+        assert Evaluator.extract_urn_components("urn:resource:team1:proj1:*") == (
+            None,
+            None,
+            None,
+        )